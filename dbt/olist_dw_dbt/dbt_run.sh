@@ -7,8 +7,16 @@ set -e
 # Activate virtual environment
 source ../../.venv/bin/activate
 
+# Land raw CSVs as Parquet (only reconverts files whose fingerprint changed)
+python3 scripts/convert_sources_to_parquet.py
+
+# Materialize intermediates shared by several selected models once for this run.
+# The planner merges any --vars passed here into its payload, which goes last
+# because dbt only keeps the final --vars flag.
+SHARED_VARS=$(python3 scripts/plan_shared_intermediates.py "$@")
+
 # Run dbt with all provided arguments
-dbt run "$@"
+dbt run "$@" --vars "$SHARED_VARS"
 
 # Log the results
 echo ""
@@ -0,0 +1,20 @@
+{% macro cluster_by() %}
+    {#-
+        ORDER BY clause for the model's cluster_by config (a column or list of
+        columns), placed after the final SELECT. Rows are then written sorted,
+        so DuckDB's per-row-group min/max statistics (zone maps) are narrow and
+        range filters on the leading column can skip most row groups.
+
+        Incremental runs sort each inserted batch only; rows re-inserted for
+        older orders are appended at the end of the table. Run
+        monitoring/check_zone_maps.py to see how much pruning is left and
+        --full-refresh the model to re-sort it.
+    -#}
+    {%- set columns = config.get('cluster_by') -%}
+    {%- if columns is string -%}
+        {%- set columns = [columns] -%}
+    {%- endif -%}
+    {%- if columns -%}
+    ORDER BY {{ columns | join(', ') }}
+    {%- endif -%}
+{% endmacro %}
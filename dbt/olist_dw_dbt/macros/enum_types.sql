@@ -0,0 +1,127 @@
+{% macro enum_type(relation, column, target_column=none) %}
+    {#-
+        DuckDB ENUM type holding the distinct non-null values of `column` in
+        `relation` (a staging model), for
+        cast(<expr> AS {{ enum_type(...) }}) AS <target_column>.
+        target_column defaults to `column`. See enum_type_from().
+    -#}
+    {{ return(enum_type_from([(relation, column)], target_column or column)) }}
+{% endmacro %}
+
+
+{% macro state_enum_type(target_column) %}
+    {#- One state ENUM for customers and sellers, so their columns compare directly -#}
+    {{ return(enum_type_from([
+        (ref('stg_customers'), 'customer_state'),
+        (ref('stg_sellers'), 'seller_state')
+    ], target_column)) }}
+{% endmacro %}
+
+
+{% macro enum_type_from(sources, target_column) %}
+    {#-
+        ENUM type over the union of distinct non-null values of each
+        (relation, column) in `sources`, queried when the model is compiled.
+        Values are sorted, so ORDER BY on the ENUM matches VARCHAR ordering.
+        Falls back to VARCHAR at parse time or while a relation does not exist
+        yet.
+
+        On incremental runs the type must match target_column in {{ this }},
+        or the insert fails on values the stored ENUM lacks:
+        - stored ENUM: the type is the union of its values and the staging
+          values; the widen_enum_columns() pre-hook widens the stored column
+          to it before the insert, so new values load without a rebuild
+        - stored VARCHAR (built before the ENUM): stays VARCHAR until the
+          next --full-refresh
+        This macro only reads, so dbt compile and show render the same SQL
+        as run.
+    -#}
+    {%- if not execute -%}
+        {{ return('VARCHAR') }}
+    {%- endif -%}
+
+    {%- set selects = [] -%}
+    {%- for relation, column in sources -%}
+        {%- if adapter.get_relation(
+            database=relation.database,
+            schema=relation.schema,
+            identifier=relation.identifier
+        ) is none -%}
+            {{ return('VARCHAR') }}
+        {%- endif -%}
+        {%- do selects.append(
+            'SELECT ' ~ column ~ '::VARCHAR AS value FROM ' ~ relation
+            ~ ' WHERE ' ~ column ~ ' IS NOT null'
+        ) -%}
+    {%- endfor -%}
+
+    {%- set stored_type = none -%}
+    {%- if is_incremental() -%}
+        {%- set stored_type = enum_stored_column_type(target_column) -%}
+        {%- if stored_type is not none and not stored_type.upper().startswith('ENUM') -%}
+            {{ return('VARCHAR') }}
+        {%- endif -%}
+    {%- endif -%}
+
+    {%- if stored_type is not none -%}
+        {%- do selects.append(
+            'SELECT unnest(enum_range(NULL::' ~ stored_type ~ '))::VARCHAR AS value'
+        ) -%}
+    {%- endif -%}
+
+    {%- set values = run_query(
+        'SELECT DISTINCT value FROM (' ~ selects | join(' UNION ALL ') ~ ') ORDER BY value'
+    ).columns[0].values() | list -%}
+    {%- if values | length == 0 -%}
+        {{ return('VARCHAR') }}
+    {%- endif -%}
+
+    {%- set literals = [] -%}
+    {%- for value in values -%}
+        {%- do literals.append("'" ~ (value | string | replace("'", "''")) ~ "'") -%}
+    {%- endfor -%}
+    {{ return('ENUM(' ~ literals | join(', ') ~ ')') }}
+{% endmacro %}
+
+
+{% macro enum_stored_column_type(column) %}
+    {#- Data type of `column` in {{ this }}, or none if the table or column is missing -#}
+    {%- set rows = run_query(
+        "SELECT data_type FROM information_schema.columns"
+        ~ " WHERE table_schema = '" ~ this.schema ~ "'"
+        ~ " AND table_name = '" ~ this.identifier ~ "'"
+        ~ " AND column_name = '" ~ column ~ "'"
+    ).rows -%}
+    {{ return(rows[0][0] if rows | length > 0 else none) }}
+{% endmacro %}
+
+
+{% macro widen_enum_columns() %}
+    {#-
+        Pre-hook for incremental models with enum_type() columns: ALTER
+        statements widening each stored ENUM column of {{ this }} to the ENUM
+        the model's compiled SQL now produces (read with DESCRIBE), so rows
+        with new values can be inserted. Runs inside the model's transaction,
+        so the widening is rolled back if the model fails. Renders nothing on
+        full builds or when no ENUM changed.
+    -#}
+    {%- if execute and sql and is_incremental() -%}
+        {%- set model_types = {} -%}
+        {%- for row in run_query('DESCRIBE SELECT * FROM (' ~ sql ~ '\n)').rows -%}
+            {%- do model_types.update({row[0]: row[1]}) -%}
+        {%- endfor -%}
+        {%- set stored = run_query(
+            "SELECT column_name, data_type FROM information_schema.columns"
+            ~ " WHERE table_schema = '" ~ this.schema ~ "'"
+            ~ " AND table_name = '" ~ this.identifier ~ "'"
+            ~ " AND data_type LIKE 'ENUM(%'"
+        ).rows -%}
+        {%- for column, stored_type in stored -%}
+            {%- set model_type = model_types.get(column) -%}
+            {%- if model_type and model_type.upper().startswith('ENUM')
+                and model_type != stored_type %}
+        ALTER TABLE {{ this }} ALTER COLUMN {{ column }} SET DATA TYPE {{ model_type }};
+            {%- endif -%}
+        {%- endfor -%}
+    {%- endif -%}
+{% endmacro %}
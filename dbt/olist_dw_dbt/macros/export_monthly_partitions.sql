@@ -0,0 +1,54 @@
+{% macro export_monthly_partitions(partition_column='order_month') %}
+    {#-
+        Post-hook: export {{ this }} as Hive-partitioned Parquet
+        (<fact_partition_export_path>/<model>/<partition_column>=YYYY-MM-DD/).
+        Only the partitions written by this run (latest dbt_updated_at) are
+        rewritten, except when <model>/ holds no Parquet files yet (first
+        export, or the export was just enabled on an already-built table):
+        then every partition is exported. Disabled unless
+        var('export_fact_partitions') is true.
+
+        Each touched partition directory is written by its own COPY with
+        OVERWRITE, which clears the files already in it first: a partition
+        that shrinks from two files to one must not keep a stale data_1.
+    -#}
+    {%- if var('export_fact_partitions', false) and execute -%}
+        {%- set export_path = var("fact_partition_export_path") ~ '/' ~ this.identifier -%}
+        {%- set exported_files = run_query(
+            "SELECT count(*) FROM glob('" ~ export_path ~ "/*/*.parquet')"
+        ).columns[0].values()[0] -%}
+        {%- set partitions = run_query(
+            'SELECT DISTINCT ' ~ partition_column ~ ' FROM ' ~ this
+            ~ (' WHERE dbt_updated_at = (SELECT max(dbt_updated_at) FROM ' ~ this ~ ')'
+               if exported_files > 0 else '')
+            ~ ' ORDER BY 1'
+        ).columns[0].values() -%}
+        {#-
+            Create <export_path> and any missing parents: an empty partitioned
+            COPY creates its target directory (one level) and writes no files
+        -#}
+        {%- set path_parts = export_path.split('/') -%}
+        {%- for i in range(1, path_parts | length + 1) -%}
+            {%- set directory = path_parts[:i] | join('/') -%}
+            {%- if directory not in ('', '.', '..') %}
+        COPY (SELECT * FROM {{ this }} WHERE false) TO '{{ directory }}' (
+            FORMAT parquet,
+            PARTITION_BY ({{ partition_column }}),
+            OVERWRITE_OR_IGNORE true
+        );
+            {%- endif -%}
+        {%- endfor -%}
+        {%- for partition in partitions %}
+        COPY (
+            SELECT * EXCLUDE ({{ partition_column }})
+            FROM {{ this }}
+            WHERE {{ partition_column }} = '{{ partition }}'
+        ) TO '{{ export_path }}/{{ partition_column }}={{ partition }}' (
+            FORMAT parquet,
+            COMPRESSION zstd,
+            PER_THREAD_OUTPUT true,
+            OVERWRITE true
+        );
+        {%- endfor -%}
+    {%- endif -%}
+{% endmacro %}
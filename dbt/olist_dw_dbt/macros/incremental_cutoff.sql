@@ -0,0 +1,17 @@
+{% macro incremental_cutoff(column='order_updated_at') %}
+    {#-
+        Scalar subquery returning the incremental high-water mark of {{ this }}
+        minus var('incremental_lookback_days'), so late status changes are
+        reprocessed. Only valid inside an is_incremental() block.
+
+        A NULL high-water mark (e.g. the column was just added to a table built
+        before it existed by on_schema_change='append_new_columns') falls back
+        to 1900-01-01, so that run reprocesses every row instead of none.
+    -#}
+    (
+        SELECT
+            coalesce(max({{ column }}), '1900-01-01'::TIMESTAMP)
+            - INTERVAL '{{ var("incremental_lookback_days") }} days'
+        FROM {{ this }}
+    )
+{% endmacro %}
@@ -0,0 +1,29 @@
+{% macro intermediate_materialization(model_name) %}
+    {#-
+        Intermediates are ephemeral unless listed in var('shared_intermediates')
+        (set by scripts/plan_shared_intermediates.py). Listed models are built
+        once as tables so their joins are not inlined into every consumer.
+    -#}
+    {{ return('table' if model_name in var('shared_intermediates', []) else 'ephemeral') }}
+{% endmacro %}
+
+
+{% macro drop_shared_intermediates() %}
+    {#- on-run-end: drop the tables built for shared intermediates this invocation -#}
+    {%- if execute -%}
+        {%- set shared = var('shared_intermediates', []) -%}
+        {%- for node in graph.nodes.values() -%}
+            {%- if node.resource_type == 'model' and node.name in shared -%}
+                {%- set relation = adapter.get_relation(
+                    database=node.database,
+                    schema=node.schema,
+                    identifier=node.alias
+                ) -%}
+                {%- if relation is not none -%}
+                    {% do log('Dropping shared intermediate: ' ~ relation, info=True) %}
+                    {% do adapter.drop_relation(relation) %}
+                {%- endif -%}
+            {%- endif -%}
+        {%- endfor -%}
+    {%- endif -%}
+{% endmacro %}
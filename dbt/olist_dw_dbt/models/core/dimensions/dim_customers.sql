@@ -20,6 +20,7 @@ customer_metrics AS (
         count(DISTINCT order_id) AS total_orders,
         min(order_purchase_timestamp) AS first_order_date,
         max(order_purchase_timestamp) AS last_order_date,
+        min(CASE WHEN order_status = 'delivered' THEN order_date END) AS first_delivered_order_date,
         avg(review_score) AS avg_review_score,
         count(DISTINCT CASE WHEN order_status = 'delivered' THEN order_id END) AS delivered_orders,
         count(DISTINCT CASE WHEN order_status = 'canceled' THEN order_id END) AS canceled_orders
@@ -37,13 +38,14 @@ customer_dimension AS (
         -- Location attributes
         c.customer_zip_code_prefix,
         c.customer_city,
-        c.customer_state,
+        cast(c.customer_state AS {{ state_enum_type('customer_state') }}) AS customer_state,
         c.customer_state_clean,
 
         -- Customer metrics
         coalesce(cm.total_orders, 0) AS lifetime_orders,
         cm.first_order_date,
         cm.last_order_date,
+        cast(cm.first_delivered_order_date AS DATE) AS first_delivered_order_date,
         cm.avg_review_score,
         coalesce(cm.delivered_orders, 0) AS delivered_orders,
         coalesce(cm.canceled_orders, 0) AS canceled_orders,
@@ -78,7 +78,7 @@ seller_dimension AS (
         -- Location attributes
         s.seller_zip_code_prefix,
         s.seller_city,
-        s.seller_state,
+        cast(s.seller_state AS {{ state_enum_type('seller_state') }}) AS seller_state,
         s.seller_state_clean,
 
         -- Sales metrics
@@ -1,17 +1,51 @@
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='order_id',
+        incremental_strategy='delete+insert',
+        on_schema_change='append_new_columns',
+        cluster_by=['order_date', 'customer_state'],
         tags=['fact', 'core', 'orders']
     )
 }}
 
 -- Orders fact table combining all order-level information
-WITH orders AS (
-    SELECT * FROM {{ ref('int_orders_enriched') }}
+-- Incremental runs only reprocess orders whose latest lifecycle event is newer than
+-- the stored high-water mark minus var('incremental_lookback_days'), so late status
+-- changes (delivery dates, reviews) are still picked up
+-- Status-only transitions (e.g. to canceled or unavailable) carry no timestamp, so
+-- greatest() below does not move for them: once an order is older than the lookback
+-- window such a change is only picked up by a --full-refresh
+-- The same holds for late payment or item corrections: payments and order items carry
+-- no change timestamp, so a correction to an order older than the lookback window
+-- reaches neither this fact nor fct_payments / fct_order_items until a --full-refresh
+-- Rows are written sorted by cluster_by so order_date range filters skip row groups
+WITH orders_with_updates AS (
+    SELECT
+        *,
+        -- Most recent lifecycle event for the order (greatest() ignores nulls)
+        greatest(
+            order_purchase_timestamp,
+            order_approved_at,
+            order_delivered_carrier_date,
+            order_delivered_customer_date,
+            review_creation_date
+        ) AS order_updated_at
+    FROM {{ ref('int_orders_enriched') }}
+),
+
+orders AS (
+    SELECT * FROM orders_with_updates
+    {% if is_incremental() %}
+        WHERE order_updated_at >= {{ incremental_cutoff() }}
+    {% endif %}
 ),
 
 payments AS (
     SELECT * FROM {{ ref('int_order_payments_aggregated') }}
+    {% if is_incremental() %}
+        WHERE order_id IN (SELECT order_id FROM orders)
+    {% endif %}
 ),
 
 order_items_summary AS (
@@ -23,6 +57,9 @@ order_items_summary AS (
         sum(total_item_value) AS total_order_value,
         avg(price) AS avg_item_price
     FROM {{ ref('stg_order_items') }}
+    {% if is_incremental() %}
+        WHERE order_id IN (SELECT order_id FROM orders)
+    {% endif %}
     GROUP BY order_id
 ),
 
@@ -35,12 +72,13 @@ orders_fact AS (
         o.customer_id,
 
         -- Order attributes
-        o.order_status,
+        cast(o.order_status AS {{ enum_type(ref('stg_orders'), 'order_status') }}) AS order_status,
         o.order_purchase_timestamp,
         o.order_approved_at,
         o.order_delivered_carrier_date,
         o.order_delivered_customer_date,
         o.order_estimated_delivery_date,
+        o.order_updated_at,
 
         -- Date dimensions
         o.order_date,
@@ -50,18 +88,18 @@ orders_fact AS (
         -- Time metrics
         o.hours_to_approval,
         o.days_to_delivery,
-        o.delivery_performance,
+        cast(o.delivery_performance AS {{ enum_type(ref('stg_orders'), 'delivery_performance') }}) AS delivery_performance,
         o.days_vs_estimated,
 
         -- Customer location
         o.customer_city,
-        o.customer_state,
+        cast(o.customer_state AS {{ state_enum_type('customer_state') }}) AS customer_state,
         o.customer_state_clean,
 
         -- Review metrics
         o.review_id,
         o.review_score,
-        o.review_sentiment,
+        cast(o.review_sentiment AS {{ enum_type(ref('stg_reviews'), 'review_sentiment') }}) AS review_sentiment,
         o.has_comment,
 
         -- Order item metrics
@@ -74,7 +112,7 @@ orders_fact AS (
         -- Payment metrics
         coalesce(p.total_payment_value, 0) AS total_payment_value,
         p.payment_method_count,
-        p.primary_payment_method,
+        cast(p.primary_payment_method AS {{ enum_type(ref('stg_payments'), 'payment_type', 'primary_payment_method') }}) AS primary_payment_method,
         p.max_installments,
         p.used_credit_card,
         p.used_boleto,
@@ -98,3 +136,4 @@ orders_fact AS (
 )
 
 SELECT * FROM orders_fact
+{{ cluster_by() }}
@@ -1,23 +1,55 @@
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        unique_key='order_month',
+        incremental_strategy='delete+insert',
+        on_schema_change='append_new_columns',
+        post_hook="{{ export_monthly_partitions('order_month') }}",
+        cluster_by=['order_date_key', 'customer_state'],
         tags=['fact', 'core', 'payments']
     )
 }}
 
 -- Payments fact table (grain: one row per payment)
-WITH payments AS (
-    SELECT * FROM {{ ref('stg_payments') }}
-),
-
-orders AS (
-    SELECT * FROM {{ ref('stg_orders') }}
+-- Partitioned by order_month: incremental runs rebuild every month that contains an order
+-- updated since the stored high-water mark minus var('incremental_lookback_days'), and
+-- delete+insert on order_month replaces those months wholesale
+-- Payments and order items have no change timestamp: a late payment correction on an order
+-- older than the lookback window is only picked up by a --full-refresh
+WITH orders AS (
+    SELECT
+        *,
+        greatest(
+            order_purchase_timestamp,
+            order_approved_at,
+            order_delivered_carrier_date,
+            order_delivered_customer_date
+        ) AS order_updated_at
+    FROM {{ ref('stg_orders') }}
 ),
 
 customers AS (
     SELECT * FROM {{ ref('stg_customers') }}
 ),
 
+{% if is_incremental() %}
+    affected_months AS (
+        SELECT DISTINCT order_month
+        FROM orders
+        WHERE order_updated_at >= {{ incremental_cutoff() }}
+    ),
+{% endif %}
+
+payments AS (
+    SELECT * FROM {{ ref('stg_payments') }}
+    {% if is_incremental() %}
+        WHERE order_id IN (
+            SELECT order_id FROM orders
+            WHERE order_month IN (SELECT order_month FROM affected_months)
+        )
+    {% endif %}
+),
+
 payments_fact AS (
     SELECT
         -- Primary key (composite)
@@ -30,20 +62,24 @@ payments_fact AS (
         -- Date foreign key
         cast(strftime(o.order_purchase_timestamp, '%Y%m%d') AS INTEGER) AS order_date_key,
 
+        -- Partition key
+        cast(o.order_month AS DATE) AS order_month,
+
         -- Payment attributes
-        p.payment_type,
+        cast(p.payment_type AS {{ enum_type(ref('stg_payments'), 'payment_type') }}) AS payment_type,
         p.payment_type_display,
         p.payment_installments,
         p.payment_value,
 
         -- Order context
-        o.order_status,
+        cast(o.order_status AS {{ enum_type(ref('stg_orders'), 'order_status') }}) AS order_status,
         o.order_purchase_timestamp,
+        o.order_updated_at,
 
         -- Customer location (denormalized)
         c.customer_zip_code_prefix,
         c.customer_city,
-        c.customer_state,
+        cast(c.customer_state AS {{ state_enum_type('customer_state') }}) AS customer_state,
 
         -- Payment method flags
         coalesce(p.payment_type = 'credit_card', false) AS is_credit_card,
@@ -95,3 +131,4 @@ payments_fact AS (
 )
 
 SELECT * FROM payments_fact
+{{ cluster_by() }}
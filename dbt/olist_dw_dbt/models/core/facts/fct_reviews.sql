@@ -1,6 +1,7 @@
 {{
     config(
         materialized='table',
+        cluster_by=['order_date_key', 'customer_state'],
         tags=['fact', 'core', 'reviews']
     )
 }}
@@ -46,7 +47,7 @@ reviews_fact AS (
         r.review_comment_message,
         r.review_creation_date,
         r.review_answer_timestamp,
-        r.review_sentiment,
+        cast(r.review_sentiment AS {{ enum_type(ref('stg_reviews'), 'review_sentiment') }}) AS review_sentiment,
 
         -- Review flags
         r.has_comment,
@@ -68,14 +69,14 @@ reviews_fact AS (
         coalesce(r.review_sentiment = 'negative', false) AS is_negative,
 
         -- Order context
-        o.order_status,
+        cast(o.order_status AS {{ enum_type(ref('stg_orders'), 'order_status') }}) AS order_status,
         o.order_purchase_timestamp,
         o.order_delivered_customer_date,
 
         -- Customer location (denormalized)
         c.customer_zip_code_prefix,
         c.customer_city,
-        c.customer_state,
+        cast(c.customer_state AS {{ state_enum_type('customer_state') }}) AS customer_state,
 
         -- Order value context
         coalesce(oi.total_order_value, 0) AS order_value,
@@ -165,3 +166,4 @@ reviews_fact AS (
 )
 
 SELECT * FROM reviews_fact
+{{ cluster_by() }}
@@ -1,6 +1,6 @@
 {{
     config(
-        materialized='ephemeral',
+        materialized=intermediate_materialization('int_order_items_enriched'),
         tags=['intermediate', 'order_items']
     )
 }}
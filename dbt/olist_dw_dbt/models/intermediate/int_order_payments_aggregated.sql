@@ -1,6 +1,6 @@
 {{
     config(
-        materialized='ephemeral',
+        materialized=intermediate_materialization('int_order_payments_aggregated'),
         tags=['intermediate', 'payments']
     )
 }}
@@ -1,6 +1,6 @@
 {{
     config(
-        materialized='ephemeral',
+        materialized=intermediate_materialization('int_orders_enriched'),
         tags=['intermediate', 'orders']
     )
 }}
@@ -0,0 +1,77 @@
+{{
+    config(
+        materialized='table',
+        tags=['mart', 'cube', 'daily']
+    )
+}}
+
+-- Daily order cube: additive partial aggregates of fct_orders at
+-- day x customer state x primary payment method x delivery performance x order status grain.
+-- Every measure is a count, sum or sum of squares, so any date range can be rolled up
+-- with SUM() and averages / variances derived from the totals:
+--   avg    = sum_x / count_x
+--   stddev = sqrt((sum_sq_x - sum_x * sum_x / count_x) / (count_x - 1))
+-- Distinct counts and medians are not additive and still need fct_orders.
+WITH orders AS (
+    SELECT * FROM {{ ref('fct_orders') }}
+),
+
+daily_cube AS (
+    SELECT
+        -- Grain
+        cast(o.order_date AS DATE) AS order_date,
+        o.customer_state,
+        o.primary_payment_method,
+        o.delivery_performance,
+        o.order_status,
+        o.is_delivered,
+
+        -- Order volume and value
+        count(*) AS order_count,
+        sum(o.total_order_value) AS total_order_value,
+        sum(o.total_order_value * o.total_order_value) AS total_order_value_sq,
+        sum(o.total_item_price) AS total_item_price,
+        sum(o.total_freight) AS total_freight,
+        sum(o.total_payment_value) AS total_payment_value,
+        sum(o.item_count) AS item_count,
+
+        -- Installments
+        count(o.max_installments) AS installment_count,
+        sum(o.max_installments) AS max_installments_sum,
+
+        -- Approval and delivery times (count_x = non-null values of x)
+        count(o.hours_to_approval) AS approval_count,
+        sum(o.hours_to_approval) AS hours_to_approval_sum,
+        count(o.days_to_delivery) AS delivery_count,
+        sum(o.days_to_delivery) AS days_to_delivery_sum,
+        sum(o.days_to_delivery * o.days_to_delivery) AS days_to_delivery_sq,
+        count(o.days_vs_estimated) AS days_vs_estimated_count,
+        sum(o.days_vs_estimated) AS days_vs_estimated_sum,
+        sum(o.days_vs_estimated * o.days_vs_estimated) AS days_vs_estimated_sq,
+
+        -- Review score histogram
+        count(o.review_score) AS review_count,
+        sum(o.review_score) AS review_score_sum,
+        sum(o.review_score * o.review_score) AS review_score_sq,
+        count(*) FILTER (WHERE o.review_score = 1) AS review_score_1,
+        count(*) FILTER (WHERE o.review_score = 2) AS review_score_2,
+        count(*) FILTER (WHERE o.review_score = 3) AS review_score_3,
+        count(*) FILTER (WHERE o.review_score = 4) AS review_score_4,
+        count(*) FILTER (WHERE o.review_score = 5) AS review_score_5,
+        count(*) FILTER (WHERE o.is_positive_review) AS positive_review_count,
+
+        -- Metadata
+        current_timestamp AS dbt_updated_at
+
+    FROM orders AS o
+    GROUP BY
+        cast(o.order_date AS DATE),
+        o.customer_state,
+        o.primary_payment_method,
+        o.delivery_performance,
+        o.order_status,
+        o.is_delivered
+)
+
+SELECT * FROM daily_cube
+ORDER BY order_date
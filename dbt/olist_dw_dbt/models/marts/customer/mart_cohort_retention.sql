@@ -0,0 +1,119 @@
+{{
+    config(
+        materialized='incremental',
+        unique_key='cohort_month',
+        incremental_strategy='delete+insert',
+        on_schema_change='append_new_columns',
+        tags=['mart', 'customer', 'cohort']
+    )
+}}
+
+-- Monthly cohort retention matrix: one row per cohort_month x activity_month
+-- Customers belong to the month of their first delivered order
+-- (dim_customers.first_delivered_order_date) and are active in every month with a
+-- delivered order. Incremental runs rebuild whole cohorts (every activity month, so
+-- cohort_size and retention_rate stay consistent across a cohort's rows): each cohort
+-- active in a month holding orders updated since the stored high-water mark minus
+-- var('incremental_lookback_days'), and each cohort whose size changed (a late first
+-- delivery moves a customer into an earlier cohort). A cohort left with no customers
+-- at all keeps its old rows until a --full-refresh
+WITH customers AS (
+    SELECT
+        customer_id,
+        cast(date_trunc('month', first_delivered_order_date) AS DATE) AS cohort_month
+    FROM {{ ref('dim_customers') }}
+    WHERE first_delivered_order_date IS NOT null
+),
+
+cohort_sizes AS (
+    SELECT
+        cohort_month,
+        count(*) AS cohort_size
+    FROM customers
+    GROUP BY cohort_month
+),
+
+orders AS (
+    SELECT
+        customer_id,
+        cast(date_trunc('month', order_date) AS DATE) AS activity_month,
+        total_order_value,
+        order_updated_at
+    FROM {{ ref('fct_orders') }}
+    WHERE is_delivered
+),
+
+{% if is_incremental() %}
+-- Activity months touched by new or updated orders
+affected_months AS (
+    SELECT DISTINCT activity_month
+    FROM orders
+    WHERE order_updated_at >= {{ incremental_cutoff() }}
+),
+
+-- Cohorts active in an affected month, plus cohorts whose size changed
+affected_cohorts AS (
+    SELECT DISTINCT c.cohort_month
+    FROM orders AS o
+    INNER JOIN customers AS c ON o.customer_id = c.customer_id
+    WHERE o.activity_month IN (SELECT activity_month FROM affected_months)
+
+    UNION
+
+    SELECT cs.cohort_month
+    FROM cohort_sizes AS cs
+    LEFT JOIN (
+        SELECT DISTINCT
+            cohort_month,
+            cohort_size
+        FROM {{ this }}
+    ) AS stored ON cs.cohort_month = stored.cohort_month
+    WHERE stored.cohort_size IS DISTINCT FROM cs.cohort_size
+),
+{% endif %}
+
+cohort_activity AS (
+    SELECT
+        c.cohort_month,
+        o.activity_month,
+        date_diff('month', c.cohort_month, o.activity_month) AS months_since_first,
+        count(DISTINCT o.customer_id) AS active_customers,
+        count(*) AS order_count,
+        sum(o.total_order_value) AS revenue,
+        max(o.order_updated_at) AS order_updated_at
+    FROM orders AS o
+    INNER JOIN customers AS c ON o.customer_id = c.customer_id
+    {% if is_incremental() %}
+        WHERE c.cohort_month IN (SELECT cohort_month FROM affected_cohorts)
+    {% endif %}
+    GROUP BY c.cohort_month, o.activity_month
+),
+
+cohort_retention AS (
+    SELECT
+        -- Grain
+        ca.cohort_month,
+        ca.activity_month,
+        ca.months_since_first,
+
+        -- Retention
+        cs.cohort_size,
+        ca.active_customers,
+        cast(ca.active_customers AS DECIMAL) / cs.cohort_size * 100 AS retention_rate,
+
+        -- Activity value
+        ca.order_count,
+        ca.revenue,
+        ca.revenue / ca.active_customers AS revenue_per_active_customer,
+
+        -- Incremental high-water mark
+        ca.order_updated_at,
+
+        -- Metadata
+        current_timestamp AS dbt_updated_at
+
+    FROM cohort_activity AS ca
+    INNER JOIN cohort_sizes AS cs ON ca.cohort_month = cs.cohort_month
+)
+
+SELECT * FROM cohort_retention
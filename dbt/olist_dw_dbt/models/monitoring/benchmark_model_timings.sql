@@ -0,0 +1,18 @@
+{{
+    config(
+        materialized='incremental',
+        on_schema_change='append_new_columns',
+        schema='monitoring'
+    )
+}}
+
+-- Create empty table structure for per-model timings of benchmark builds
+SELECT
+    cast(null AS VARCHAR) AS benchmark_id,
+    cast(null AS VARCHAR) AS case_id,
+    cast(null AS VARCHAR) AS unique_id,
+    cast(null AS VARCHAR) AS model_name,
+    cast(null AS VARCHAR) AS status,
+    cast(null AS DOUBLE) AS execution_time_seconds,
+    cast(null AS BIGINT) AS rows_affected
+WHERE 1 = 0
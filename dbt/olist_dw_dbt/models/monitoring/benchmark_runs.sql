@@ -0,0 +1,28 @@
+{{
+    config(
+        materialized='incremental',
+        on_schema_change='append_new_columns',
+        schema='monitoring'
+    )
+}}
+
+-- Create empty table structure for benchmark builds (monitoring/benchmark_build.py)
+SELECT
+    cast(null AS VARCHAR) AS benchmark_id,
+    cast(null AS VARCHAR) AS case_id,
+    cast(null AS VARCHAR) AS label,
+    cast(null AS VARCHAR) AS git_commit,
+    cast(null AS DOUBLE) AS scale_factor,
+    cast(null AS INTEGER) AS seed,
+    cast(null AS VARCHAR) AS dbt_command,
+    cast(null AS INTEGER) AS dbt_threads,
+    cast(null AS INTEGER) AS duckdb_threads,
+    cast(null AS VARCHAR) AS memory_limit,
+    cast(null AS BOOLEAN) AS success,
+    cast(null AS TIMESTAMP) AS started_at,
+    cast(null AS DOUBLE) AS wall_clock_seconds,
+    cast(null AS DOUBLE) AS peak_rss_mb,
+    cast(null AS DOUBLE) AS database_size_mb,
+    cast(null AS INTEGER) AS models_built,
+    cast(null AS INTEGER) AS models_failed
+WHERE 1 = 0
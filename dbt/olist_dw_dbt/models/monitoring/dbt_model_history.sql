@@ -1,6 +1,7 @@
 {{
     config(
-        materialized='table',
+        materialized='incremental',
+        on_schema_change='append_new_columns',
         schema='monitoring'
     )
 }}
@@ -0,0 +1,24 @@
+{{
+    config(
+        materialized='incremental',
+        on_schema_change='append_new_columns',
+        schema='monitoring'
+    )
+}}
+
+-- Create empty table structure for per-node schedule and critical-path analysis
+SELECT
+    cast(null AS VARCHAR) AS invocation_id,
+    cast(null AS VARCHAR) AS unique_id,
+    cast(null AS VARCHAR) AS resource_type,
+    cast(null AS VARCHAR) AS thread_id,
+    cast(null AS VARCHAR) AS status,
+    cast(null AS TIMESTAMP) AS started_at,
+    cast(null AS TIMESTAMP) AS completed_at,
+    cast(null AS DOUBLE) AS start_offset_seconds,
+    cast(null AS DOUBLE) AS duration_seconds,
+    cast(null AS DOUBLE) AS queue_wait_seconds,
+    cast(null AS DOUBLE) AS slack_seconds,
+    cast(null AS BOOLEAN) AS on_critical_path,
+    cast(null AS INTEGER) AS critical_path_position
+WHERE 1 = 0
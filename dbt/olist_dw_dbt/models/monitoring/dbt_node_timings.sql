@@ -0,0 +1,18 @@
+{{
+    config(
+        materialized='incremental',
+        on_schema_change='append_new_columns',
+        schema='monitoring'
+    )
+}}
+
+-- Create empty table structure for per-phase node timings (compile, execute)
+SELECT
+    cast(null AS VARCHAR) AS invocation_id,
+    cast(null AS VARCHAR) AS unique_id,
+    cast(null AS VARCHAR) AS resource_type,
+    cast(null AS VARCHAR) AS phase,
+    cast(null AS TIMESTAMP) AS started_at,
+    cast(null AS TIMESTAMP) AS completed_at,
+    cast(null AS DOUBLE) AS duration_seconds
+WHERE 1 = 0
@@ -0,0 +1,25 @@
+{{
+    config(
+        materialized='incremental',
+        on_schema_change='append_new_columns',
+        schema='monitoring'
+    )
+}}
+
+-- Create empty table structure for run-level critical path and thread utilization
+SELECT
+    cast(null AS VARCHAR) AS invocation_id,
+    cast(null AS INTEGER) AS threads,
+    cast(null AS INTEGER) AS nodes_executed,
+    cast(null AS TIMESTAMP) AS run_started_at,
+    cast(null AS TIMESTAMP) AS run_completed_at,
+    cast(null AS DOUBLE) AS wall_clock_seconds,
+    cast(null AS DOUBLE) AS total_node_seconds,
+    cast(null AS DOUBLE) AS critical_path_seconds,
+    cast(null AS INTEGER) AS critical_path_nodes,
+    cast(null AS DOUBLE) AS avg_active_threads,
+    cast(null AS INTEGER) AS max_active_threads,
+    cast(null AS DOUBLE) AS thread_utilization,
+    cast(null AS DOUBLE) AS idle_gap_seconds,
+    cast(null AS BOOLEAN) AS thread_bound
+WHERE 1 = 0
@@ -0,0 +1,23 @@
+{{
+    config(
+        materialized='incremental',
+        on_schema_change='append_new_columns',
+        schema='monitoring'
+    )
+}}
+
+-- Create empty table structure for data test results
+SELECT
+    cast(null AS VARCHAR) AS invocation_id,
+    cast(null AS VARCHAR) AS test_name,
+    cast(null AS VARCHAR) AS test_type,
+    cast(null AS VARCHAR) AS tested_node,
+    cast(null AS VARCHAR) AS column_name,
+    cast(null AS VARCHAR) AS severity,
+    cast(null AS VARCHAR) AS status,
+    cast(null AS INTEGER) AS failures,
+    cast(null AS DOUBLE) AS execution_time_seconds,
+    cast(null AS VARCHAR) AS message,
+    cast(null AS TIMESTAMP) AS executed_at,
+    cast(null AS VARCHAR) AS unique_id
+WHERE 1 = 0
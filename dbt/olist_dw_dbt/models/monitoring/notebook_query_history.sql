@@ -0,0 +1,25 @@
+{{
+    config(
+        materialized='incremental',
+        on_schema_change='append_new_columns',
+        schema='monitoring'
+    )
+}}
+
+-- Create empty table structure for per-query notebook profiling (olist_utils.profiling)
+SELECT
+    cast(null AS VARCHAR) AS query_id,
+    cast(null AS VARCHAR) AS session_id,
+    cast(null AS VARCHAR) AS notebook,
+    cast(null AS VARCHAR) AS cell_id,
+    cast(null AS VARCHAR) AS query_hash,
+    cast(null AS VARCHAR) AS sql_text,
+    cast(null AS INTEGER) AS param_count,
+    cast(null AS TIMESTAMP) AS started_at,
+    cast(null AS DOUBLE) AS wall_seconds,
+    cast(null AS BIGINT) AS rows_returned,
+    cast(null AS BIGINT) AS bytes_returned,
+    cast(null AS BOOLEAN) AS cache_hit,
+    cast(null AS VARCHAR) AS explain_analyze,
+    cast(null AS TIMESTAMP) AS loaded_at
+WHERE 1 = 0
@@ -6,7 +6,7 @@
 }}
 
 WITH source AS (
-    SELECT * FROM read_csv('{{ var("csv_source_path") }}/product_category_name_translation.csv', header = true, auto_detect = true)
+    SELECT * FROM {{ source('raw', 'category_translation') }}
 ),
 
 cleaned AS (
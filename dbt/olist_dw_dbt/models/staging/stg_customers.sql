@@ -6,7 +6,7 @@
 }}
 
 WITH source AS (
-    SELECT * FROM read_csv('{{ var("csv_source_path") }}/olist_customers_dataset.csv', header = true, auto_detect = true)
+    SELECT * FROM {{ source('raw', 'customers') }}
 ),
 
 cleaned AS (
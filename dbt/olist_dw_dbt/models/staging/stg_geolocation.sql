@@ -6,7 +6,7 @@
 }}
 
 WITH source AS (
-    SELECT * FROM read_csv('{{ var("csv_source_path") }}/olist_geolocation_dataset.csv', header = true, auto_detect = true)
+    SELECT * FROM {{ source('raw', 'geolocation') }}
 ),
 
 -- Remove duplicates by taking average coordinates per zip code
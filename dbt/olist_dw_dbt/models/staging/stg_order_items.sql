@@ -6,7 +6,7 @@
 }}
 
 WITH source AS (
-    SELECT * FROM read_csv('{{ var("csv_source_path") }}/olist_order_items_dataset.csv', header = true, auto_detect = true)
+    SELECT * FROM {{ source('raw', 'order_items') }}
 ),
 
 cleaned AS (
@@ -20,18 +20,18 @@ cleaned AS (
         seller_id,
 
         -- Shipping
-        cast(shipping_limit_date AS TIMESTAMP) AS shipping_limit_date,
+        shipping_limit_date,
 
-        -- Pricing (cast to DECIMAL for precision)
-        cast(price AS DECIMAL(10, 2)) AS price,
-        cast(freight_value AS DECIMAL(10, 2)) AS freight_value,
+        -- Pricing (DECIMAL from the source schema)
+        price,
+        freight_value,
 
         -- Calculated fields
-        cast(price AS DECIMAL(10, 2)) + cast(freight_value AS DECIMAL(10, 2)) AS total_item_value,
+        price + freight_value AS total_item_value,
 
         -- Item revenue breakdown
-        cast(price AS DECIMAL(10, 2)) AS item_revenue,
-        cast(freight_value AS DECIMAL(10, 2)) AS freight_revenue
+        price AS item_revenue,
+        freight_value AS freight_revenue
 
     FROM source
     WHERE
@@ -6,7 +6,7 @@
 }}
 
 WITH source AS (
-    SELECT * FROM read_csv('{{ var("csv_source_path") }}/olist_order_payments_dataset.csv', header = true, auto_detect = true)
+    SELECT * FROM {{ source('raw', 'payments') }}
 ),
 
 cleaned AS (
@@ -21,10 +21,10 @@ cleaned AS (
         payment_type,
 
         -- Installments
-        cast(payment_installments AS INTEGER) AS payment_installments,
+        payment_installments,
 
         -- Payment amount
-        cast(payment_value AS DECIMAL(10, 2)) AS payment_value,
+        payment_value,
 
         -- Payment type categorization
         CASE
@@ -6,7 +6,7 @@
 }}
 
 WITH source AS (
-    SELECT * FROM read_csv('{{ var("csv_source_path") }}/olist_products_dataset.csv', header = true, auto_detect = true)
+    SELECT * FROM {{ source('raw', 'products') }}
 ),
 
 cleaned AS (
@@ -17,26 +17,24 @@ cleaned AS (
         -- Category
         product_category_name,
 
-        -- Product metadata
-        cast(product_name_lenght AS INTEGER) AS product_name_length,
-        cast(product_description_lenght AS INTEGER) AS product_description_length,
-        cast(product_photos_qty AS INTEGER) AS product_photos_qty,
+        -- Product metadata (source columns carry the dataset's original spelling)
+        product_name_lenght AS product_name_length,
+        product_description_lenght AS product_description_length,
+        product_photos_qty,
 
         -- Dimensions
-        cast(product_weight_g AS DECIMAL(10, 2)) AS product_weight_g,
-        cast(product_length_cm AS DECIMAL(10, 2)) AS product_length_cm,
-        cast(product_height_cm AS DECIMAL(10, 2)) AS product_height_cm,
-        cast(product_width_cm AS DECIMAL(10, 2)) AS product_width_cm,
+        product_weight_g,
+        product_length_cm,
+        product_height_cm,
+        product_width_cm,
 
         -- Calculated fields
-        cast(product_length_cm AS DECIMAL(10, 2))
-        * cast(product_height_cm AS DECIMAL(10, 2))
-        * cast(product_width_cm AS DECIMAL(10, 2)) AS product_volume_cm3,
+        product_length_cm * product_height_cm * product_width_cm AS product_volume_cm3,
 
         -- Product completeness score
         CASE WHEN product_name_lenght IS NOT null THEN 1 ELSE 0 END
         + CASE WHEN product_description_lenght IS NOT null THEN 1 ELSE 0 END
-        + CASE WHEN product_photos_qty IS NOT null AND cast(product_photos_qty AS INTEGER) > 0 THEN 1 ELSE 0 END
+        + CASE WHEN product_photos_qty IS NOT null AND product_photos_qty > 0 THEN 1 ELSE 0 END
         + CASE WHEN product_category_name IS NOT null THEN 1 ELSE 0 END AS product_completeness_score
 
     FROM source
@@ -6,7 +6,7 @@
 }}
 
 WITH source AS (
-    SELECT * FROM read_csv('{{ var("csv_source_path") }}/olist_sellers_dataset.csv', header = true, auto_detect = true)
+    SELECT * FROM {{ source('raw', 'sellers') }}
 ),
 
 cleaned AS (
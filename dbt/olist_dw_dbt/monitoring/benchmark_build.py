@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+"""
+End-to-end dbt build benchmark across data scales and DuckDB settings.
+
+For every combination of --scales, --duckdb-threads and --memory-limits the
+project is built from scratch into its own throwaway DuckDB file and timed:
+
+- wall clock of the dbt command and per-model execution times
+  (from that build's run_results.json)
+- peak RSS of the dbt process - DuckDB runs inside it, so this is the
+  build's memory high-water mark (os.wait4 rusage of the child)
+- size of the built database file
+
+Source data comes from scripts/generate_synthetic_data.py (generated once per
+scale factor and seed, then landed as Parquet by convert_sources_to_parquet.py
+and reused by later runs). Each build uses a generated profiles.yml with a
+`benchmark` target, so the real warehouse is never touched.
+
+Results are stored in core_monitoring.benchmark_runs and
+core_monitoring.benchmark_model_timings under a --label, and every case is
+compared with the latest run of the same case saved under --baseline-label
+(wall clock, peak RSS and database size, plus the models that slowed down).
+
+Usage:
+    python monitoring/benchmark_build.py --scales 1 10 --save-baseline
+    python monitoring/benchmark_build.py --scales 1 10 --label my-branch
+    python monitoring/benchmark_build.py --scales 10 --duckdb-threads 2 4 8 \\
+        --memory-limits 4GB 16GB --fail-on-regression
+"""
+
+import argparse
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import yaml
+from log_run_results import DB_PATH, insert_batch
+
+# Paths
+DBT_PROJECT_DIR = Path(__file__).parent.parent
+SCRIPTS_DIR = DBT_PROJECT_DIR / "scripts"
+SYNTHETIC_DIR = DBT_PROJECT_DIR / "synthetic"
+WORK_DIR = DBT_PROJECT_DIR / "target" / "benchmarks"
+
+# The source definitions expect a database named olist_analytical
+DATABASE_FILE = "olist_analytical.duckdb"
+
+# Default thresholds
+DEFAULT_TIME_RATIO = 1.2
+DEFAULT_MIN_SECONDS = 1.0
+DEFAULT_MEMORY_RATIO = 1.2
+
+
+def case_id(case):
+    """Short identifier of a case's settings, e.g. sf10-dbt4-duckdb8-8GB."""
+    threads = case["duckdb_threads"] or "default"
+    memory_limit = case["memory_limit"] or "default"
+    return (
+        f"sf{case['scale_factor']:g}-dbt{case['dbt_threads']}"
+        f"-duckdb{threads}-{memory_limit}"
+    )
+
+
+def git_commit():
+    """Short commit hash of the project, or None outside a git checkout."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=DBT_PROJECT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_script(script, *args):
+    """Run one of the project scripts; raises with its output on failure."""
+    result = subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / script), *map(str, args)],
+        cwd=DBT_PROJECT_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{script} failed:\n{result.stdout[-2000:]}{result.stderr}")
+
+
+def prepare_sources(scale_factor, seed, synthetic_dir):
+    """Generate (once) and land the synthetic sources; returns the Parquet dir."""
+    csv_dir = synthetic_dir / f"sf{scale_factor:g}-seed{seed}"
+    parquet_dir = csv_dir / "parquet"
+
+    if not (csv_dir / "olist_orders_dataset.csv").exists():
+        run_script(
+            "generate_synthetic_data.py",
+            "--scale",
+            scale_factor,
+            "--seed",
+            seed,
+            "--output-dir",
+            csv_dir,
+        )
+    # Skips files whose fingerprint has not changed
+    run_script(
+        "convert_sources_to_parquet.py",
+        "--csv-dir",
+        csv_dir,
+        "--parquet-dir",
+        parquet_dir,
+    )
+    return parquet_dir
+
+
+def write_profile(case, db_path, profiles_dir):
+    """profiles.yml with a benchmark target on db_path and the case settings."""
+    settings = {}
+    if case["duckdb_threads"]:
+        settings["threads"] = case["duckdb_threads"]
+    if case["memory_limit"]:
+        settings["memory_limit"] = case["memory_limit"]
+
+    output = {
+        "type": "duckdb",
+        "path": str(db_path),
+        "threads": case["dbt_threads"],
+    }
+    if settings:
+        output["settings"] = settings
+
+    profiles_dir.mkdir(parents=True, exist_ok=True)
+    profile = {
+        "olist_dw_dbt": {"target": "benchmark", "outputs": {"benchmark": output}}
+    }
+    with open(profiles_dir / "profiles.yml", "w") as f:
+        yaml.safe_dump(profile, f, sort_keys=False)
+
+
+def run_dbt(command, case_dir, parquet_dir, select):
+    """
+    Run the dbt command for one case and measure it.
+
+    Returns (exit_code, wall_clock_seconds, peak_rss_mb). The child is reaped
+    with os.wait4 so its own rusage (not the sum of all children) is read;
+    ru_maxrss is in kilobytes on Linux.
+    """
+    dbt_vars = {
+        "parquet_source_path": str(parquet_dir),
+        "fact_partition_export_path": str(case_dir / "facts"),
+    }
+    args = [
+        "dbt",
+        command,
+        "--profiles-dir",
+        str(case_dir),
+        "--target",
+        "benchmark",
+        "--target-path",
+        str(case_dir / "target"),
+        "--vars",
+        json.dumps(dbt_vars),
+    ]
+    if select:
+        args += ["--select", *select]
+
+    with open(case_dir / "dbt.log", "w") as log:
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            args, cwd=DBT_PROJECT_DIR, stdout=log, stderr=subprocess.STDOUT
+        )
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - started
+
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, elapsed, usage.ru_maxrss / 1024
+
+
+def database_size_mb(db_path):
+    """Size of the database file plus its WAL, in MB."""
+    paths = [db_path, db_path.with_name(db_path.name + ".wal")]
+    return sum(path.stat().st_size for path in paths if path.exists()) / 1024**2
+
+
+def parse_model_timings(run_results_path):
+    """Per-model status, time and rows from a build's run_results.json."""
+    if not run_results_path.exists():
+        return []
+    with open(run_results_path, "r") as f:
+        run_results = json.load(f)
+
+    timings = []
+    for result in run_results.get("results", []):
+        unique_id = result.get("unique_id", "")
+        if not unique_id.startswith("model."):
+            continue
+        timings.append(
+            {
+                "unique_id": unique_id,
+                "model_name": unique_id.split(".")[-1],
+                "status": result.get("status", "unknown"),
+                "execution_time_seconds": result.get("execution_time", 0),
+                "rows_affected": result.get("adapter_response", {}).get(
+                    "rows_affected"
+                ),
+            }
+        )
+    return timings
+
+
+def run_case(case, parquet_dir, work_dir, command, select, keep_database):
+    """Build the project for one case; returns (run row, model timing rows)."""
+    case_dir = work_dir / case_id(case)
+    shutil.rmtree(case_dir, ignore_errors=True)
+    case_dir.mkdir(parents=True)
+
+    db_path = case_dir / DATABASE_FILE
+    write_profile(case, db_path, case_dir)
+
+    started_at = datetime.now(timezone.utc).isoformat()
+    exit_code, elapsed, peak_rss_mb = run_dbt(command, case_dir, parquet_dir, select)
+    size_mb = database_size_mb(db_path)
+    models = parse_model_timings(case_dir / "target" / "run_results.json")
+
+    if not keep_database:
+        db_path.unlink(missing_ok=True)
+        db_path.with_name(db_path.name + ".wal").unlink(missing_ok=True)
+
+    run = dict(
+        case,
+        case_id=case_id(case),
+        dbt_command=command,
+        success=exit_code == 0,
+        started_at=started_at,
+        wall_clock_seconds=elapsed,
+        peak_rss_mb=peak_rss_mb,
+        database_size_mb=size_mb,
+        models_built=sum(m["status"] == "success" for m in models),
+        models_failed=sum(m["status"] != "success" for m in models),
+    )
+    models = [dict(model, case_id=run["case_id"]) for model in models]
+    return run, models
+
+
+def load_baseline(con, label):
+    """Latest run of every case saved under label, and its model timings."""
+    runs = con.execute(
+        """
+        SELECT *
+        FROM core_monitoring.benchmark_runs
+        WHERE label = ? AND success
+        QUALIFY row_number() OVER (PARTITION BY case_id ORDER BY started_at DESC) = 1
+        """,
+        [label],
+    ).df()
+    models = con.execute(
+        """
+        SELECT t.case_id, t.unique_id, t.model_name, t.execution_time_seconds
+        FROM core_monitoring.benchmark_model_timings AS t
+        INNER JOIN (
+            SELECT benchmark_id, case_id
+            FROM core_monitoring.benchmark_runs
+            WHERE label = ? AND success
+            QUALIFY row_number() OVER (
+                PARTITION BY case_id ORDER BY started_at DESC
+            ) = 1
+        ) AS b
+            ON t.benchmark_id = b.benchmark_id AND t.case_id = b.case_id
+        WHERE t.status = 'success'
+        """,
+        [label],
+    ).df()
+    return runs, models
+
+
+def compare_to_baseline(
+    runs,
+    models,
+    baseline_runs,
+    baseline_models,
+    time_ratio=DEFAULT_TIME_RATIO,
+    min_seconds=DEFAULT_MIN_SECONDS,
+    memory_ratio=DEFAULT_MEMORY_RATIO,
+):
+    """
+    Compare each case with its baseline run.
+
+    Returns (case_report, model_report) DataFrames. A case regresses when its
+    wall clock is more than time_ratio x the baseline (and at least
+    min_seconds slower) or its peak RSS is more than memory_ratio x the
+    baseline; a model regresses on the same time rule.
+    """
+    if baseline_runs.empty:
+        return pd.DataFrame(), pd.DataFrame()
+
+    cases = pd.DataFrame(runs).merge(
+        baseline_runs[
+            ["case_id", "wall_clock_seconds", "peak_rss_mb", "database_size_mb"]
+        ],
+        on="case_id",
+        suffixes=("", "_baseline"),
+    )
+    cases["time_ratio"] = (
+        cases["wall_clock_seconds"] / cases["wall_clock_seconds_baseline"]
+    )
+    cases["memory_ratio"] = cases["peak_rss_mb"] / cases["peak_rss_mb_baseline"]
+    cases["size_ratio"] = cases["database_size_mb"] / cases["database_size_mb_baseline"]
+    cases["is_regression"] = (
+        (cases["time_ratio"] > time_ratio)
+        & (
+            cases["wall_clock_seconds"] - cases["wall_clock_seconds_baseline"]
+            >= min_seconds
+        )
+    ) | (cases["memory_ratio"] > memory_ratio)
+
+    model_report = pd.DataFrame()
+    if models and not baseline_models.empty:
+        model_report = pd.DataFrame(models).merge(
+            baseline_models,
+            on=["case_id", "unique_id"],
+            suffixes=("", "_baseline"),
+        )
+        model_report = model_report[model_report["status"] == "success"].copy()
+        model_report["time_ratio"] = (
+            model_report["execution_time_seconds"]
+            / model_report["execution_time_seconds_baseline"]
+        )
+        model_report["is_regression"] = (model_report["time_ratio"] > time_ratio) & (
+            model_report["execution_time_seconds"]
+            - model_report["execution_time_seconds_baseline"]
+            >= min_seconds
+        )
+        model_report = model_report.sort_values(
+            ["is_regression", "time_ratio"], ascending=[False, False]
+        ).reset_index(drop=True)
+
+    return cases, model_report
+
+
+def store_results(benchmark_id, runs, models):
+    """Insert the runs and model timings into the monitoring tables."""
+    con = duckdb.connect(str(DB_PATH))
+    try:
+        con.begin()
+        insert_batch(
+            con,
+            "benchmark_runs",
+            [dict(run, benchmark_id=benchmark_id) for run in runs],
+            [
+                "benchmark_id",
+                "case_id",
+                "label",
+                "git_commit",
+                "scale_factor",
+                "seed",
+                "dbt_command",
+                "dbt_threads",
+                "duckdb_threads",
+                "memory_limit",
+                "success",
+                "started_at",
+                "wall_clock_seconds",
+                "peak_rss_mb",
+                "database_size_mb",
+                "models_built",
+                "models_failed",
+            ],
+            timestamp_columns=["started_at"],
+        )
+        insert_batch(
+            con,
+            "benchmark_model_timings",
+            [dict(model, benchmark_id=benchmark_id) for model in models],
+            [
+                "benchmark_id",
+                "case_id",
+                "unique_id",
+                "model_name",
+                "status",
+                "execution_time_seconds",
+                "rows_affected",
+            ],
+        )
+        con.commit()
+    except Exception:
+        con.rollback()
+        raise
+    finally:
+        con.close()
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark dbt builds across data scales and DuckDB settings"
+    )
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        type=float,
+        default=[1.0],
+        help="Synthetic data scale factors to build (default: 1)",
+    )
+    parser.add_argument(
+        "--duckdb-threads",
+        nargs="+",
+        type=int,
+        default=[None],
+        help="DuckDB threads settings to try (default: DuckDB default)",
+    )
+    parser.add_argument(
+        "--memory-limits",
+        nargs="+",
+        default=[None],
+        help="DuckDB memory_limit settings to try, e.g. 4GB 16GB (default: DuckDB's)",
+    )
+    parser.add_argument(
+        "--dbt-threads",
+        type=int,
+        default=4,
+        help="dbt threads for every case (default: 4)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Synthetic data seed (default: 42)",
+    )
+    parser.add_argument(
+        "--command",
+        choices=["build", "run"],
+        default="build",
+        help="dbt command to time (default: build)",
+    )
+    parser.add_argument(
+        "--select",
+        nargs="+",
+        help="Only build these nodes (forwarded to dbt --select)",
+    )
+    parser.add_argument(
+        "--label",
+        default="adhoc",
+        help="Label to store this run under (default: adhoc)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store this run as the new baseline (same as --label baseline)",
+    )
+    parser.add_argument(
+        "--baseline-label",
+        default="baseline",
+        help="Label of the runs to compare against (default: baseline)",
+    )
+    parser.add_argument(
+        "--time-ratio",
+        type=float,
+        default=DEFAULT_TIME_RATIO,
+        help=f"Flag when time > ratio x baseline (default: {DEFAULT_TIME_RATIO})",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=DEFAULT_MIN_SECONDS,
+        help=f"Ignore slowdowns smaller than this (default: {DEFAULT_MIN_SECONDS})",
+    )
+    parser.add_argument(
+        "--memory-ratio",
+        type=float,
+        default=DEFAULT_MEMORY_RATIO,
+        help=f"Flag when peak RSS > ratio x baseline (default: {DEFAULT_MEMORY_RATIO})",
+    )
+    parser.add_argument(
+        "--synthetic-dir",
+        type=Path,
+        default=SYNTHETIC_DIR,
+        help="Where generated source data is kept between runs (default: synthetic/)",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=WORK_DIR,
+        help="Per-case databases, profiles and logs (default: target/benchmarks/)",
+    )
+    parser.add_argument(
+        "--keep-databases",
+        action="store_true",
+        help="Keep the built database files (they are deleted after measuring)",
+    )
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="Only print the results, do not write them to the monitoring tables",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with status 1 when a case or model regressed against the baseline",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to benchmark dbt builds."""
+    args = parse_args()
+    label = "baseline" if args.save_baseline else args.label
+
+    print("=" * 80)
+    print("DBT CUSTOM MONITORING - Build Benchmark")
+    print("=" * 80)
+
+    if shutil.which("dbt") is None:
+        print("❌ dbt is not installed (pip install -r requirements.txt)")
+        sys.exit(1)
+
+    benchmark_id = uuid.uuid4().hex
+    commit = git_commit()
+    cases = [
+        {
+            "label": label,
+            "git_commit": commit,
+            "scale_factor": scale_factor,
+            "seed": args.seed,
+            "dbt_threads": args.dbt_threads,
+            "duckdb_threads": duckdb_threads,
+            "memory_limit": memory_limit,
+        }
+        for scale_factor, duckdb_threads, memory_limit in itertools.product(
+            args.scales, args.duckdb_threads, args.memory_limits
+        )
+    ]
+    print(f"\nBenchmark: {benchmark_id} (label {label}, commit {commit or 'unknown'})")
+    print(f"Cases:     {len(cases)}  dbt {args.command}, {args.dbt_threads} threads")
+
+    # Source data
+    print("\n1. Preparing synthetic sources...")
+    parquet_dirs = {}
+    for scale_factor in args.scales:
+        try:
+            start = time.perf_counter()
+            parquet_dirs[scale_factor] = prepare_sources(
+                scale_factor, args.seed, args.synthetic_dir
+            )
+            elapsed = time.perf_counter() - start
+            print(
+                f"✓ sf{scale_factor:g}: {parquet_dirs[scale_factor]} ({elapsed:.1f}s)"
+            )
+        except RuntimeError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+
+    # Builds
+    print("\n2. Running builds...")
+    runs, models = [], []
+    for case in cases:
+        run, run_models = run_case(
+            case,
+            parquet_dirs[case["scale_factor"]],
+            args.work_dir,
+            args.command,
+            args.select,
+            args.keep_databases,
+        )
+        status = "✓" if run["success"] else "❌"
+        print(
+            f"{status} {run['case_id']:36} {run['wall_clock_seconds']:9.2f}s  "
+            f"peak {run['peak_rss_mb']:9,.0f} MB  db {run['database_size_mb']:9,.1f} MB"
+        )
+        if not run["success"]:
+            print(f"   see {args.work_dir / run['case_id'] / 'dbt.log'}")
+        runs.append(run)
+        models.extend(run_models)
+
+    # Baseline comparison (read-only, so dashboards are not blocked)
+    print(f"\n3. Comparing against baseline '{args.baseline_label}'...")
+    case_report, model_report = pd.DataFrame(), pd.DataFrame()
+    try:
+        con = duckdb.connect(str(DB_PATH), read_only=True)
+        try:
+            baseline_runs, baseline_models = load_baseline(con, args.baseline_label)
+        finally:
+            con.close()
+        case_report, model_report = compare_to_baseline(
+            runs,
+            models,
+            baseline_runs,
+            baseline_models,
+            time_ratio=args.time_ratio,
+            min_seconds=args.min_seconds,
+            memory_ratio=args.memory_ratio,
+        )
+    except Exception as e:
+        print(f"⚠️  Could not load the baseline: {e}")
+
+    if case_report.empty:
+        print("⚠️  No baseline for these cases yet (save one with --save-baseline)")
+    else:
+        for _, row in case_report.iterrows():
+            status = "❌" if row["is_regression"] else "✓"
+            print(
+                f"{status} {row['case_id']:36} time {row['time_ratio']:5.2f}x  "
+                f"memory {row['memory_ratio']:5.2f}x  size {row['size_ratio']:5.2f}x"
+            )
+        if not model_report.empty and model_report["is_regression"].any():
+            print("\n   Slower models:")
+            for _, row in model_report[model_report["is_regression"]].iterrows():
+                print(
+                    f"   {row['case_id']:30} {row['model_name']:36} "
+                    f"{row['execution_time_seconds']:8.2f}s "
+                    f"(baseline {row['execution_time_seconds_baseline']:.2f}s)"
+                )
+
+    # Store results
+    if args.no_store:
+        print("\n4. Skipping storage (--no-store)")
+    else:
+        print("\n4. Storing results in the monitoring tables...")
+        try:
+            store_results(benchmark_id, runs, models)
+            print(f"✓ Stored {len(runs)} runs and {len(models)} model timings")
+        except Exception as e:
+            print(f"❌ Failed to store results: {e}")
+            sys.exit(1)
+
+    failed = [run for run in runs if not run["success"]]
+    regressed = not case_report.empty and (
+        case_report["is_regression"].any()
+        or (not model_report.empty and model_report["is_regression"].any())
+    )
+
+    print("\n" + "=" * 80)
+    if failed:
+        print(f"❌ FAILED - {len(failed)} of {len(runs)} builds failed")
+    elif regressed:
+        print("⚠️  REGRESSIONS FOUND - See cases above")
+    else:
+        print(f"✅ SUCCESS - {len(runs)} builds benchmarked")
+    print("=" * 80)
+
+    if failed or (args.fail_on_regression and regressed):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
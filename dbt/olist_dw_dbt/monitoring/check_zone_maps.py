@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Zone-map pruning report for the clustered fact tables.
+
+DuckDB keeps min/max statistics for every column in every row group (about
+122,880 rows) and skips row groups whose range cannot match a filter. That only
+helps when the table is written sorted on the filtered column, which is what the
+cluster_by model config (macros/cluster_by.sql) does for the core facts.
+
+For every model with a cluster_by config (read from the manifest index), this
+script reads pragma_storage_info for the table and reports per row group:
+
+- row count and min/max of each cluster column
+- how many other row groups its leading-column range overlaps
+- the share of sample range filters that still have to scan it
+
+The sample filters split the leading column into --ranges slices of equal row
+count (24 slices of order_date are roughly monthly ranges). Each table's
+pruning effectiveness is the share of row groups those filters skip, relative
+to what a perfectly sorted table would skip. Incremental runs append re-loaded
+orders at the end of the table, so effectiveness drops over time; a
+--full-refresh of the model re-sorts it.
+
+Usage:
+    python monitoring/check_zone_maps.py
+    python monitoring/check_zone_maps.py --model fct_orders --ranges 104
+    python monitoring/check_zone_maps.py --fail-below   # exit 1 if poorly clustered
+"""
+
+import argparse
+import math
+import sys
+
+import duckdb
+import pandas as pd
+from log_run_results import DB_PATH
+from manifest_index import load_manifest_index
+
+# Defaults
+DEFAULT_RANGES = 24
+DEFAULT_MIN_EFFECTIVENESS = 0.8
+
+ROW_GROUP_RANGES_SQL = """
+    SELECT
+        row_group_id,
+        sum(count)::BIGINT AS row_count,
+        min(try_cast(regexp_extract(stats, 'Min: (.*?), Max: ', 1) AS {data_type}))
+            AS min_value,
+        max(try_cast(regexp_extract(stats, 'Max: (.*?)\\]', 1) AS {data_type}))
+            AS max_value
+    FROM pragma_storage_info('{table}')
+    WHERE column_name = ? AND segment_type <> 'VALIDITY'
+    GROUP BY row_group_id
+    ORDER BY row_group_id
+"""
+
+SAMPLE_RANGES_SQL = """
+    SELECT
+        slice,
+        min({column}) AS range_start,
+        max({column}) AS range_end,
+        count(*) AS rows_in_range
+    FROM (
+        SELECT {column}, ntile(?) OVER (ORDER BY {column}) AS slice
+        FROM {table}
+        WHERE {column} IS NOT NULL
+    )
+    GROUP BY slice
+    ORDER BY slice
+"""
+
+
+def clustered_models(manifest_index, model=None):
+    """Return [(model_name, schema, [cluster columns])] from the manifest index."""
+    models = []
+    for node in manifest_index["nodes"].values():
+        if node.get("resource_type") != "model":
+            continue
+        columns = (node.get("config") or {}).get("cluster_by")
+        if not columns or (model and node["name"] != model):
+            continue
+        if isinstance(columns, str):
+            columns = [columns]
+        models.append((node["name"], node["schema"], list(columns)))
+    return sorted(models)
+
+
+def column_types(con, schema, table):
+    """Map column name -> DuckDB data type for one table."""
+    rows = con.execute(
+        """
+        SELECT column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = ? AND table_name = ?
+        """,
+        [schema, table],
+    ).fetchall()
+    return dict(rows)
+
+
+def row_group_ranges(con, table, column, data_type):
+    """Per-row-group row count and min/max of one column from storage stats."""
+    sql = ROW_GROUP_RANGES_SQL.format(table=table, data_type=data_type)
+    return con.execute(sql, [column]).df()
+
+
+def sample_ranges(con, table, column, slices):
+    """Split the column into equal-row slices used as sample range filters."""
+    sql = SAMPLE_RANGES_SQL.format(table=table, column=column)
+    return con.execute(sql, [slices]).df()
+
+
+def overlaps(row_groups, start, end):
+    """Boolean mask of row groups whose min/max range can match [start, end]."""
+    unknown = row_groups["min_value"].isna() | row_groups["max_value"].isna()
+    return unknown | (
+        (row_groups["min_value"] <= end) & (row_groups["max_value"] >= start)
+    )
+
+
+def analyze_pruning(row_groups, ranges):
+    """
+    Replay the sample ranges against the row-group min/max statistics.
+
+    Returns (row_groups with overlap and scan-share columns, per-range frame,
+    summary dict).
+    """
+    row_groups = row_groups.copy()
+    total = len(row_groups)
+    row_group_size = int(row_groups["row_count"].max())
+
+    row_groups["overlapping_row_groups"] = [
+        int(overlaps(row_groups, rg["min_value"], rg["max_value"]).sum()) - 1
+        for _, rg in row_groups.iterrows()
+    ]
+
+    scanned_by = pd.Series(0, index=row_groups.index)
+    records = []
+    for _, r in ranges.iterrows():
+        mask = overlaps(row_groups, r["range_start"], r["range_end"])
+        scanned_by += mask.astype(int)
+        ideal = min(total, math.ceil(r["rows_in_range"] / row_group_size))
+        records.append(
+            {
+                "range_start": r["range_start"],
+                "range_end": r["range_end"],
+                "rows_in_range": int(r["rows_in_range"]),
+                "scanned": int(mask.sum()),
+                "ideal": ideal,
+            }
+        )
+    row_groups["scan_share"] = scanned_by / max(len(ranges), 1)
+    per_range = pd.DataFrame(records)
+
+    skipped = 1 - per_range["scanned"].mean() / total
+    ideal_skipped = 1 - per_range["ideal"].mean() / total
+    summary = {
+        "row_groups": total,
+        "rows": int(row_groups["row_count"].sum()),
+        "skipped": skipped,
+        "ideal_skipped": ideal_skipped,
+        "effectiveness": skipped / ideal_skipped if ideal_skipped > 0 else None,
+    }
+    return row_groups, per_range, summary
+
+
+def format_value(value):
+    """Render a statistic, dropping the time part of midnight timestamps."""
+    if isinstance(value, pd.Timestamp) and value == value.normalize():
+        return str(value.date())
+    return str(value)
+
+
+def check_table(con, model, schema, columns, slices):
+    """Print the zone-map report for one table and return its summary."""
+    table = f"{schema}.{model}"
+    print(f"\n📦 {table}  (cluster_by: {', '.join(columns)})")
+
+    types = column_types(con, schema, model)
+    if not types:
+        print("  ⚠️  Table not found - build it first")
+        return None
+    missing = [c for c in columns if c not in types]
+    if missing:
+        print(f"  ⚠️  Cluster columns not in table: {', '.join(missing)}")
+        return None
+
+    leading = columns[0]
+    row_groups = row_group_ranges(con, table, leading, types[leading])
+    if row_groups.empty:
+        print("  ⚠️  No storage statistics (empty table?)")
+        return None
+
+    ranges = sample_ranges(con, table, leading, slices)
+    row_groups, per_range, summary = analyze_pruning(row_groups, ranges)
+
+    for column in columns[1:]:
+        other = row_group_ranges(con, table, column, types[column])
+        row_groups = row_groups.merge(
+            other[["row_group_id", "min_value", "max_value"]].rename(
+                columns={"min_value": f"{column}_min", "max_value": f"{column}_max"}
+            ),
+            on="row_group_id",
+            how="left",
+        )
+
+    print(
+        f"  {summary['rows']:,} rows in {summary['row_groups']} row groups; "
+        f"{len(per_range)} sample ranges on {leading}"
+    )
+    print(
+        f"\n  {'row group':>9}  {'rows':>9}  {leading + ' min':>16}  "
+        f"{leading + ' max':>16}  {'overlaps':>8}  {'scanned by':>10}"
+    )
+    for _, rg in row_groups.iterrows():
+        line = (
+            f"  {rg['row_group_id']:>9}  {rg['row_count']:>9,}  "
+            f"{format_value(rg['min_value']):>16}  "
+            f"{format_value(rg['max_value']):>16}  "
+            f"{rg['overlapping_row_groups']:>8}  {rg['scan_share']:>10.0%}"
+        )
+        for column in columns[1:]:
+            low = format_value(rg[f"{column}_min"])
+            high = format_value(rg[f"{column}_max"])
+            line += f"  {column} {low}..{high}"
+        print(line)
+
+    if summary["row_groups"] == 1:
+        print(
+            "\n  ℹ️  The table fits in one row group, so there is nothing to skip "
+            "yet; pruning starts once it outgrows a row group"
+        )
+        return summary
+
+    effectiveness = summary["effectiveness"]
+    print(
+        f"\n  ✓ Sample ranges skip {summary['skipped']:.0%} of row groups "
+        f"(a perfectly sorted table would skip {summary['ideal_skipped']:.0%})"
+    )
+    if effectiveness is not None:
+        print(f"  ✓ Pruning effectiveness: {effectiveness:.0%}")
+    return summary
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Report min/max row-group pruning for clustered fact tables"
+    )
+    parser.add_argument(
+        "--model",
+        help="Only check this model (default: every model with cluster_by)",
+    )
+    parser.add_argument(
+        "--ranges",
+        type=int,
+        default=DEFAULT_RANGES,
+        help=f"Sample range filters per table (default: {DEFAULT_RANGES})",
+    )
+    parser.add_argument(
+        "--min-effectiveness",
+        type=float,
+        default=DEFAULT_MIN_EFFECTIVENESS,
+        help=(
+            "Flag tables skipping less than this share of the ideal "
+            f"(default: {DEFAULT_MIN_EFFECTIVENESS})"
+        ),
+    )
+    parser.add_argument(
+        "--fail-below",
+        action="store_true",
+        help="Exit with status 1 when any table is below --min-effectiveness",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to report zone-map pruning per clustered table."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("DBT CUSTOM MONITORING - Zone-Map Pruning")
+    print("=" * 80)
+
+    manifest_index = load_manifest_index()
+    if manifest_index is None:
+        print("   Run 'dbt parse' first")
+        sys.exit(1)
+
+    models = clustered_models(manifest_index, args.model)
+    if not models:
+        print("\n⚠️  No models with a cluster_by config found")
+        return
+
+    try:
+        con = duckdb.connect(str(DB_PATH), read_only=True)
+    except Exception as e:
+        print(f"❌ Failed to connect: {e}")
+        sys.exit(1)
+
+    poorly_clustered = []
+    try:
+        for model, schema, columns in models:
+            summary = check_table(con, model, schema, columns, args.ranges)
+            effectiveness = summary and summary.get("effectiveness")
+            if effectiveness is not None and effectiveness < args.min_effectiveness:
+                poorly_clustered.append(model)
+    finally:
+        con.close()
+
+    print("\n" + "=" * 80)
+    if poorly_clustered:
+        print("⚠️  POORLY CLUSTERED - Re-sort with a full refresh:")
+        for model in poorly_clustered:
+            print(f"   dbt build --full-refresh --select {model}")
+    else:
+        print("✅ SUCCESS - Clustered tables prune as expected")
+    print("=" * 80)
+
+    if args.fail_below and poorly_clustered:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Critical-path and parallelism analysis of a dbt invocation.
+
+Joins the manifest's depends_on graph with each executed node's timing
+(first started_at to last completed_at across compile and execute) to work
+out:
+
+- the critical path: the longest dependency chain by node duration, i.e. the
+  lower bound on wall-clock time no matter how many threads are used
+- per-node slack (how much a node could slow down without lengthening the
+  critical path) and queue wait (time between its last dependency finishing
+  and the node actually starting, i.e. waiting for a free thread)
+- thread utilization: average and peak number of nodes running at once, and
+  idle gaps where no node was running at all
+
+log_run_results.py stores the results in core_monitoring.dbt_node_schedule
+and core_monitoring.dbt_run_parallelism; run this file directly to print the
+analysis of the artifacts in target/.
+
+Usage:
+    python monitoring/critical_path.py
+    python monitoring/critical_path.py path/to/run_results.json path/to/manifest.json
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from manifest_index import load_manifest_index
+
+# Paths
+DBT_PROJECT_DIR = Path(__file__).parent.parent
+RUN_RESULTS_PATH = DBT_PROJECT_DIR / "target" / "run_results.json"
+MANIFEST_PATH = DBT_PROJECT_DIR / "target" / "manifest.json"
+
+# More threads only help when the run is well above its critical path and the
+# configured threads were kept busy
+THREAD_BOUND_UTILIZATION = 0.8
+THREAD_BOUND_PATH_RATIO = 1.2
+
+
+def parse_timestamp(value):
+    """Parse a dbt ISO-8601 timestamp (with a trailing Z) as naive UTC."""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).replace(tzinfo=None)
+
+
+def node_spans(run_results):
+    """Return {unique_id: span} for every node with timing information."""
+    spans = {}
+    for result in run_results.get("results", []):
+        timing = result.get("timing", [])
+        starts = [parse_timestamp(t.get("started_at")) for t in timing]
+        ends = [parse_timestamp(t.get("completed_at")) for t in timing]
+        starts = [t for t in starts if t]
+        ends = [t for t in ends if t]
+        if not starts or not ends:
+            continue
+
+        spans[result["unique_id"]] = {
+            "thread_id": result.get("thread_id"),
+            "status": result.get("status"),
+            "started_at": min(starts),
+            "completed_at": max(ends),
+            "duration_seconds": (max(ends) - min(starts)).total_seconds(),
+        }
+    return spans
+
+
+def executed_parents(unique_id, nodes, spans, through):
+    """
+    Nearest executed ancestors of a node.
+
+    Parents that did not run in this invocation (ephemeral models, nodes
+    outside the selection) are replaced by their own executed ancestors, so
+    fct_orders still depends on stg_orders through int_orders_enriched.
+    through memoizes the ancestors found behind each non-executed node.
+    """
+    found = []
+    for parent in nodes.get(unique_id, {}).get("depends_on", {}).get("nodes", []):
+        if parent in spans:
+            ancestors = [parent]
+        else:
+            if parent not in through:
+                # Set before recursing so a cycle cannot loop forever
+                through[parent] = []
+                through[parent] = executed_parents(parent, nodes, spans, through)
+            ancestors = through[parent]
+        found.extend(a for a in ancestors if a not in found)
+    return found
+
+
+def topological_order(spans, parents):
+    """Order executed nodes so every node comes after its executed parents."""
+    order = []
+    visited = set()
+
+    def visit(unique_id):
+        stack = [(unique_id, False)]
+        while stack:
+            node_id, expanded = stack.pop()
+            if expanded:
+                order.append(node_id)
+                continue
+            if node_id in visited:
+                continue
+            visited.add(node_id)
+            stack.append((node_id, True))
+            stack.extend((parent, False) for parent in parents[node_id])
+
+    # Visit in start order so ties keep the order dbt actually ran nodes in
+    for unique_id in sorted(spans, key=lambda n: spans[n]["started_at"]):
+        visit(unique_id)
+    return order
+
+
+def busy_intervals(spans):
+    """Merge node spans into the intervals where at least one node ran."""
+    merged = []
+    for span in sorted(spans.values(), key=lambda s: s["started_at"]):
+        if merged and span["started_at"] <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], span["completed_at"])
+        else:
+            merged.append([span["started_at"], span["completed_at"]])
+    return merged
+
+
+def peak_concurrency(spans):
+    """Maximum number of nodes running at the same time."""
+    events = []
+    for span in spans.values():
+        events.append((span["started_at"], 1))
+        events.append((span["completed_at"], -1))
+
+    active = peak = 0
+    # Ends sort before starts at the same instant, so back-to-back nodes don't overlap
+    for _, delta in sorted(events, key=lambda e: (e[0], e[1])):
+        active += delta
+        peak = max(peak, active)
+    return peak
+
+
+def analyze_run(run_results, manifest):
+    """
+    Analyze one invocation.
+
+    Returns (node_schedule, run_parallelism): a list of per-node rows and one
+    run-level row, shaped for the dbt_node_schedule / dbt_run_parallelism
+    tables.
+    """
+    invocation_id = run_results.get("metadata", {}).get("invocation_id", "unknown")
+    nodes = manifest.get("nodes", {})
+    spans = node_spans(run_results)
+    if not spans:
+        return [], None
+
+    # Only dependencies that were executed in this invocation constrain it;
+    # ephemeral and other non-executed parents are replaced by their ancestors
+    through = {}
+    parents = {
+        unique_id: executed_parents(unique_id, nodes, spans, through)
+        for unique_id in spans
+    }
+    children = {unique_id: [] for unique_id in spans}
+    for unique_id, node_parents in parents.items():
+        for parent in node_parents:
+            children[parent].append(unique_id)
+
+    order = topological_order(spans, parents)
+
+    # Longest chain ending at each node (head) and starting at each node (tail)
+    head = {}
+    critical_parent = {}
+    for unique_id in order:
+        best_parent = max(parents[unique_id], key=lambda p: head[p], default=None)
+        critical_parent[unique_id] = best_parent
+        head[unique_id] = spans[unique_id]["duration_seconds"] + (
+            head[best_parent] if best_parent else 0
+        )
+
+    tail = {}
+    for unique_id in reversed(order):
+        tail[unique_id] = spans[unique_id]["duration_seconds"] + max(
+            (tail[child] for child in children[unique_id]), default=0
+        )
+
+    critical_path_seconds = max(head.values())
+    critical_path = []
+    node_id = max(head, key=head.get)
+    while node_id:
+        critical_path.append(node_id)
+        node_id = critical_parent[node_id]
+    critical_path.reverse()
+    on_critical_path = set(critical_path)
+
+    run_started_at = min(s["started_at"] for s in spans.values())
+    run_completed_at = max(s["completed_at"] for s in spans.values())
+
+    node_schedule = []
+    for unique_id in order:
+        span = spans[unique_id]
+        ready_at = max(
+            (spans[parent]["completed_at"] for parent in parents[unique_id]),
+            default=run_started_at,
+        )
+        node_schedule.append(
+            {
+                "invocation_id": invocation_id,
+                "unique_id": unique_id,
+                "resource_type": unique_id.split(".")[0],
+                "thread_id": span["thread_id"],
+                "status": span["status"],
+                "started_at": span["started_at"],
+                "completed_at": span["completed_at"],
+                "start_offset_seconds": (
+                    span["started_at"] - run_started_at
+                ).total_seconds(),
+                "duration_seconds": span["duration_seconds"],
+                "queue_wait_seconds": max(
+                    (span["started_at"] - ready_at).total_seconds(), 0
+                ),
+                "slack_seconds": critical_path_seconds
+                - (head[unique_id] + tail[unique_id] - span["duration_seconds"]),
+                "on_critical_path": unique_id in on_critical_path,
+                "critical_path_position": (
+                    critical_path.index(unique_id) + 1
+                    if unique_id in on_critical_path
+                    else None
+                ),
+            }
+        )
+
+    wall_clock_seconds = (run_completed_at - run_started_at).total_seconds()
+    busy_seconds = sum(
+        (end - start).total_seconds() for start, end in busy_intervals(spans)
+    )
+    total_node_seconds = sum(s["duration_seconds"] for s in spans.values())
+    threads = run_results.get("args", {}).get("threads")
+    avg_active_threads = (
+        total_node_seconds / wall_clock_seconds if wall_clock_seconds > 0 else 0
+    )
+
+    thread_bound = bool(
+        threads
+        and avg_active_threads >= THREAD_BOUND_UTILIZATION * threads
+        and wall_clock_seconds > THREAD_BOUND_PATH_RATIO * critical_path_seconds
+    )
+
+    run_parallelism = {
+        "invocation_id": invocation_id,
+        "threads": threads,
+        "nodes_executed": len(spans),
+        "run_started_at": run_started_at,
+        "run_completed_at": run_completed_at,
+        "wall_clock_seconds": wall_clock_seconds,
+        "total_node_seconds": total_node_seconds,
+        "critical_path_seconds": critical_path_seconds,
+        "critical_path_nodes": len(critical_path),
+        "avg_active_threads": avg_active_threads,
+        "max_active_threads": peak_concurrency(spans),
+        "thread_utilization": avg_active_threads / threads if threads else None,
+        "idle_gap_seconds": wall_clock_seconds - busy_seconds,
+        "thread_bound": thread_bound,
+    }
+
+    return node_schedule, run_parallelism
+
+
+def main():
+    """Print the critical path and parallelism summary for one invocation."""
+    run_results_path = Path(sys.argv[1]) if len(sys.argv) > 1 else RUN_RESULTS_PATH
+    manifest_path = Path(sys.argv[2]) if len(sys.argv) > 2 else MANIFEST_PATH
+
+    if not run_results_path.exists():
+        print(f"❌ File not found: {run_results_path}")
+        sys.exit(1)
+    with open(run_results_path, "r") as f:
+        run_results = json.load(f)
+
+    manifest = load_manifest_index(manifest_path)
+    if not manifest:
+        sys.exit(1)
+
+    node_schedule, run = analyze_run(run_results, manifest)
+    if run is None:
+        print("❌ No node timings in run_results.json")
+        sys.exit(1)
+
+    print("=" * 80)
+    print("DBT CUSTOM MONITORING - Critical Path Analysis")
+    print("=" * 80)
+
+    print(f"\nInvocation:        {run['invocation_id']}")
+    print(f"Threads:           {run['threads']}")
+    print(f"Wall clock:        {run['wall_clock_seconds']:.2f}s")
+    print(f"Critical path:     {run['critical_path_seconds']:.2f}s")
+    print(f"Sum of node time:  {run['total_node_seconds']:.2f}s")
+    print(
+        f"Active threads:    {run['avg_active_threads']:.2f} avg, "
+        f"{run['max_active_threads']} peak"
+    )
+    print(f"Idle gaps:         {run['idle_gap_seconds']:.2f}s")
+
+    print("\nCritical path:")
+    critical = sorted(
+        (row for row in node_schedule if row["on_critical_path"]),
+        key=lambda row: row["critical_path_position"],
+    )
+    for row in critical:
+        print(
+            f"  {row['critical_path_position']:>3}. {row['unique_id']:60} "
+            f"{row['duration_seconds']:8.2f}s"
+        )
+
+    print("\n" + "=" * 80)
+    if run["thread_bound"]:
+        print("⚠️  Thread bound - more threads should shorten this run")
+    else:
+        print("✓ Not thread bound - speed up the critical path models instead")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
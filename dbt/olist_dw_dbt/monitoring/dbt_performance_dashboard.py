@@ -245,6 +245,268 @@ def __(con, px, mo):
     return (layer_performance,) if len(layer_performance) > 0 else tuple()
 
 
+@app.cell
+def __(mo):
+    mo.md(
+        """
+    ## Performance Regressions
+
+    Each model's latest successful run compared with its previous 20 runs
+    (median, p95 and EWMA of execution time, median rows_affected).
+    Same check as `python3 monitoring/detect_regressions.py`.
+    """
+    )
+    return
+
+
+@app.cell
+def __(con, mo):
+    from detect_regressions import detect_regressions
+
+    regression_report = detect_regressions(con)
+
+    if len(regression_report) > 0:
+        flagged = regression_report[regression_report["is_regression"]]
+        regression_view = mo.vstack(
+            [
+                mo.hstack(
+                    [
+                        mo.stat(
+                            label="Models Compared",
+                            value=f"{len(regression_report):,}",
+                        ),
+                        mo.stat(label="Regressions", value=f"{len(flagged):,}"),
+                    ]
+                ),
+                mo.ui.table(
+                    regression_report[
+                        [
+                            "model_name",
+                            "reasons",
+                            "latest_seconds",
+                            "median_seconds",
+                            "p95_seconds",
+                            "ewma_seconds",
+                            "time_ratio",
+                            "latest_rows",
+                            "rows_change_pct",
+                            "baseline_runs",
+                        ]
+                    ].round(2),
+                    selection=None,
+                ),
+            ]
+        )
+    else:
+        regression_view = mo.md(
+            "**Not enough history yet.** Regressions are checked once a model has more than 5 successful runs."
+        )
+    regression_view
+    return detect_regressions, regression_report, regression_view
+
+
+@app.cell
+def __(mo):
+    mo.md(
+        """
+    ## Critical Path & Parallelism (Latest Run)
+
+    Each bar is one node on its dbt thread; red bars are the critical path, the
+    longest dependency chain and the floor on wall-clock time. If the run is
+    **not** thread bound, raising `threads` won't help - speed up the
+    critical-path models instead.
+    """
+    )
+    return
+
+
+@app.cell
+def __(con, mo, px):
+    # Latest run's parallelism summary and node schedule
+    parallelism = con.execute(
+        """
+        SELECT *
+        FROM core_monitoring.dbt_run_parallelism
+        ORDER BY run_started_at DESC
+        LIMIT 1
+    """
+    ).df()
+
+    if len(parallelism) > 0:
+        run_stats = parallelism.iloc[0]
+        node_schedule = con.execute(
+            """
+            SELECT
+                unique_id,
+                split_part(unique_id, '.', 3) AS node_name,
+                resource_type,
+                thread_id,
+                started_at,
+                completed_at,
+                round(duration_seconds, 2) AS duration_seconds,
+                round(queue_wait_seconds, 2) AS queue_wait_seconds,
+                round(slack_seconds, 2) AS slack_seconds,
+                on_critical_path
+            FROM core_monitoring.dbt_node_schedule
+            WHERE invocation_id = ?
+            ORDER BY started_at
+        """,
+            [run_stats["invocation_id"]],
+        ).df()
+
+        fig_gantt = px.timeline(
+            node_schedule,
+            x_start="started_at",
+            x_end="completed_at",
+            y="thread_id",
+            color="on_critical_path",
+            color_discrete_map={True: "#d62728", False: "#9ecae1"},
+            hover_name="node_name",
+            hover_data=["duration_seconds", "queue_wait_seconds", "slack_seconds"],
+            title=f"Node Schedule by Thread ({run_stats['invocation_id']})",
+            labels={"thread_id": "Thread", "on_critical_path": "Critical Path"},
+        )
+        fig_gantt.update_layout(height=400)
+
+        parallelism_view = mo.vstack(
+            [
+                mo.hstack(
+                    [
+                        mo.stat(
+                            label="Wall Clock (sec)",
+                            value=f"{run_stats['wall_clock_seconds']:,.1f}",
+                        ),
+                        mo.stat(
+                            label="Critical Path (sec)",
+                            value=f"{run_stats['critical_path_seconds']:,.1f}",
+                        ),
+                        mo.stat(
+                            label="Avg / Peak Threads",
+                            value=(
+                                f"{run_stats['avg_active_threads']:.1f} / "
+                                f"{run_stats['max_active_threads']}"
+                            ),
+                        ),
+                        mo.stat(
+                            label="Idle Gaps (sec)",
+                            value=f"{run_stats['idle_gap_seconds']:,.1f}",
+                        ),
+                        mo.stat(
+                            label="Thread Bound",
+                            value="Yes" if run_stats["thread_bound"] else "No",
+                        ),
+                    ]
+                ),
+                fig_gantt,
+            ]
+        )
+    else:
+        node_schedule = None
+        parallelism_view = mo.md(
+            "**No parallelism data yet.** It is recorded by `python3 monitoring/log_run_results.py`."
+        )
+    parallelism_view
+    return node_schedule, parallelism, parallelism_view
+
+
+@app.cell
+def __(mo):
+    mo.md(
+        """
+    ## Notebook Queries (Last 7 Days)
+
+    Read queries issued by the analysis notebooks, profiled by
+    `olist_utils.profiling` when `OLIST_QUERY_LOG` is set and loaded with
+    `python3 monitoring/log_notebook_queries.py`. Cells with a high p95 and a
+    low cache hit rate are the first candidates for a mart or a rewrite.
+    """
+    )
+    return
+
+
+@app.cell
+def __(con, mo, px):
+    # Slowest notebook cells by total query time
+    notebook_cells = con.execute(
+        """
+        SELECT
+            notebook,
+            coalesce(cell_id, '(no cell)') AS cell_id,
+            count(*) AS query_count,
+            round(quantile_cont(wall_seconds, 0.5), 3) AS p50_seconds,
+            round(quantile_cont(wall_seconds, 0.95), 3) AS p95_seconds,
+            round(sum(wall_seconds), 2) AS total_seconds,
+            round(avg(CASE WHEN cache_hit THEN 1.0 ELSE 0.0 END), 2) AS cache_hit_rate,
+            max(rows_returned) AS max_rows,
+            round(max(bytes_returned) / 1024.0 / 1024.0, 2) AS max_mb
+        FROM core_monitoring.notebook_query_history
+        WHERE started_at >= current_timestamp - INTERVAL 7 DAY
+        GROUP BY 1, 2
+        ORDER BY total_seconds DESC
+        LIMIT 20
+    """
+    ).df()
+
+    if len(notebook_cells) > 0:
+        slowest_queries = con.execute(
+            """
+            SELECT
+                notebook,
+                cell_id,
+                query_hash,
+                count(*) AS runs,
+                round(quantile_cont(wall_seconds, 0.95), 3) AS p95_seconds,
+                max(rows_returned) AS max_rows,
+                any_value(sql_text) AS sql_text,
+                max(explain_analyze) AS explain_analyze
+            FROM core_monitoring.notebook_query_history
+            WHERE started_at >= current_timestamp - INTERVAL 7 DAY
+              AND NOT cache_hit
+            GROUP BY 1, 2, 3
+            ORDER BY p95_seconds DESC
+            LIMIT 10
+        """
+        ).df()
+
+        fig_cells = px.bar(
+            notebook_cells.assign(
+                cell=notebook_cells["notebook"] + " / " + notebook_cells["cell_id"]
+            ),
+            x="total_seconds",
+            y="cell",
+            orientation="h",
+            color="cache_hit_rate",
+            hover_data=[
+                "query_count",
+                "p50_seconds",
+                "p95_seconds",
+                "max_rows",
+                "max_mb",
+            ],
+            title="Notebook Cells by Total Query Time",
+            labels={
+                "total_seconds": "Total Query Time (sec)",
+                "cell": "Notebook / Cell",
+            },
+        )
+        fig_cells.update_layout(height=500, yaxis={"categoryorder": "total ascending"})
+
+        notebook_query_view = mo.vstack(
+            [
+                fig_cells,
+                mo.md("**Slowest uncached queries (p95):**"),
+                mo.ui.table(slowest_queries, selection=None),
+            ]
+        )
+    else:
+        slowest_queries = None
+        notebook_query_view = mo.md(
+            "**No notebook query data yet.** Run a notebook with `OLIST_QUERY_LOG` set, then `python3 monitoring/log_notebook_queries.py`."
+        )
+    notebook_query_view
+    return notebook_cells, notebook_query_view, slowest_queries
+
+
 @app.cell
 def __(mo):
     mo.md(
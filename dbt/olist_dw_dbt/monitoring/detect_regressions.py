@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Per-model performance regression detector.
+
+For every model (unique_id) in core_monitoring.dbt_model_history, the latest
+successful execution is compared with a rolling baseline built from the
+previous successful executions of the same model:
+
+- median and p95 of execution_time_seconds
+- EWMA (exponentially weighted moving average) of execution_time_seconds
+- median of rows_affected
+
+A model is flagged when its latest execution time exceeds its p95 and is more
+than --time-ratio times its median/EWMA baseline (and slower by at least
+--min-seconds, so sub-second jitter is ignored), or when rows_affected moved
+by more than --rows-change of its median.
+
+Usage:
+    python monitoring/detect_regressions.py
+    python monitoring/detect_regressions.py --window 30 --time-ratio 2.0
+    python monitoring/detect_regressions.py --fail-on-regression   # exit 1 if flagged
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+# Paths
+DB_PATH = Path(
+    "/home/dhafin/Documents/Projects/EDA/data/duckdb/olist_analytical.duckdb"
+)
+
+# Default thresholds
+DEFAULT_WINDOW = 20
+DEFAULT_MIN_HISTORY = 5
+DEFAULT_TIME_RATIO = 1.5
+DEFAULT_MIN_SECONDS = 0.5
+DEFAULT_ROWS_CHANGE = 0.5
+DEFAULT_EWMA_ALPHA = 0.3
+
+
+def load_recent_executions(con, window):
+    """Load the latest window + 1 successful executions of every model."""
+    return con.execute(
+        """
+        SELECT
+            unique_id,
+            model_name,
+            invocation_id,
+            executed_at,
+            execution_time_seconds,
+            rows_affected
+        FROM (
+            SELECT
+                *,
+                row_number() OVER (
+                    PARTITION BY unique_id
+                    ORDER BY executed_at DESC
+                ) AS run_rank
+            FROM core_monitoring.dbt_model_history
+            WHERE status = 'success'
+        )
+        WHERE run_rank <= ?
+        ORDER BY unique_id, executed_at
+        """,
+        [window + 1],
+    ).df()
+
+
+def compare_to_baseline(
+    executions,
+    min_history=DEFAULT_MIN_HISTORY,
+    time_ratio=DEFAULT_TIME_RATIO,
+    min_seconds=DEFAULT_MIN_SECONDS,
+    rows_change=DEFAULT_ROWS_CHANGE,
+    ewma_alpha=DEFAULT_EWMA_ALPHA,
+):
+    """
+    Compare each model's latest execution with the baseline of its earlier ones.
+
+    executions must be ordered by executed_at within each unique_id. Returns
+    one row per model with enough history, regressions first.
+    """
+    rows = []
+    for unique_id, history in executions.groupby("unique_id", sort=False):
+        if len(history) <= min_history:
+            continue
+
+        latest = history.iloc[-1]
+        baseline = history.iloc[:-1]
+        seconds = baseline["execution_time_seconds"]
+
+        median_seconds = seconds.median()
+        p95_seconds = seconds.quantile(0.95)
+        ewma_seconds = seconds.ewm(alpha=ewma_alpha).mean().iloc[-1]
+        expected_seconds = max(median_seconds, ewma_seconds)
+        latest_seconds = latest["execution_time_seconds"]
+
+        slower = (
+            latest_seconds > p95_seconds
+            and latest_seconds > expected_seconds * time_ratio
+            and latest_seconds - expected_seconds >= min_seconds
+        )
+
+        # Views and some adapters report rows_affected <= 0; skip those
+        median_rows = baseline["rows_affected"].median()
+        latest_rows = latest["rows_affected"]
+        rows_change_pct = None
+        rows_shifted = False
+        if pd.notna(median_rows) and median_rows > 0 and pd.notna(latest_rows):
+            rows_change_pct = (latest_rows - median_rows) / median_rows * 100
+            rows_shifted = abs(rows_change_pct) > rows_change * 100
+
+        reasons = []
+        if slower:
+            reasons.append("execution_time")
+        if rows_shifted:
+            reasons.append("rows_affected")
+
+        rows.append(
+            {
+                "unique_id": unique_id,
+                "model_name": latest["model_name"],
+                "invocation_id": latest["invocation_id"],
+                "executed_at": latest["executed_at"],
+                "baseline_runs": len(baseline),
+                "latest_seconds": latest_seconds,
+                "median_seconds": median_seconds,
+                "p95_seconds": p95_seconds,
+                "ewma_seconds": ewma_seconds,
+                "time_ratio": (
+                    latest_seconds / expected_seconds if expected_seconds > 0 else None
+                ),
+                "latest_rows": latest_rows,
+                "median_rows": median_rows,
+                "rows_change_pct": rows_change_pct,
+                "is_regression": bool(reasons),
+                "reasons": ", ".join(reasons),
+            }
+        )
+
+    report = pd.DataFrame(rows)
+    if report.empty:
+        return report
+    return report.sort_values(
+        ["is_regression", "time_ratio"], ascending=[False, False]
+    ).reset_index(drop=True)
+
+
+def detect_regressions(con, window=DEFAULT_WINDOW, **thresholds):
+    """Load recent history from con and return the regression report."""
+    return compare_to_baseline(load_recent_executions(con, window), **thresholds)
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Flag dbt models whose latest run deviates from their baseline"
+    )
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=DEFAULT_WINDOW,
+        help=f"Previous runs per model in the baseline (default: {DEFAULT_WINDOW})",
+    )
+    parser.add_argument(
+        "--min-history",
+        type=int,
+        default=DEFAULT_MIN_HISTORY,
+        help=f"Skip models with fewer baseline runs (default: {DEFAULT_MIN_HISTORY})",
+    )
+    parser.add_argument(
+        "--time-ratio",
+        type=float,
+        default=DEFAULT_TIME_RATIO,
+        help=f"Flag when latest > ratio x baseline (default: {DEFAULT_TIME_RATIO})",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=DEFAULT_MIN_SECONDS,
+        help=f"Ignore slowdowns smaller than this (default: {DEFAULT_MIN_SECONDS})",
+    )
+    parser.add_argument(
+        "--rows-change",
+        type=float,
+        default=DEFAULT_ROWS_CHANGE,
+        help=f"Flag row count shifts above this share (default: {DEFAULT_ROWS_CHANGE})",
+    )
+    parser.add_argument(
+        "--ewma-alpha",
+        type=float,
+        default=DEFAULT_EWMA_ALPHA,
+        help=f"EWMA smoothing factor (default: {DEFAULT_EWMA_ALPHA})",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with status 1 when any model is flagged",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to report model performance regressions."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("DBT CUSTOM MONITORING - Model Performance Regressions")
+    print("=" * 80)
+
+    try:
+        con = duckdb.connect(str(DB_PATH), read_only=True)
+    except Exception as e:
+        print(f"❌ Failed to connect: {e}")
+        sys.exit(1)
+
+    try:
+        report = detect_regressions(
+            con,
+            window=args.window,
+            min_history=args.min_history,
+            time_ratio=args.time_ratio,
+            min_seconds=args.min_seconds,
+            rows_change=args.rows_change,
+            ewma_alpha=args.ewma_alpha,
+        )
+    finally:
+        con.close()
+
+    if report.empty:
+        print(
+            "\n⚠️  Not enough history yet "
+            f"(need more than {args.min_history} successful runs per model)"
+        )
+        return
+
+    regressions = report[report["is_regression"]]
+    print(f"\n✓ Compared {len(report)} models against their last {args.window} runs")
+
+    if regressions.empty:
+        print("✓ No regressions detected")
+    else:
+        print(f"\n❌ {len(regressions)} models regressed:\n")
+        for _, row in regressions.iterrows():
+            line = (
+                f"  {row['model_name']:40} {row['latest_seconds']:8.2f}s "
+                f"(median {row['median_seconds']:.2f}s, p95 {row['p95_seconds']:.2f}s, "
+                f"ewma {row['ewma_seconds']:.2f}s)"
+            )
+            if row["rows_change_pct"] is not None and pd.notna(row["rows_change_pct"]):
+                line += f"  rows {row['rows_change_pct']:+.1f}%"
+            print(f"{line}  [{row['reasons']}]")
+
+    print("\n" + "=" * 80)
+    if regressions.empty:
+        print("✅ SUCCESS - All models within their baseline")
+    else:
+        print("⚠️  REGRESSIONS FOUND - See models above")
+    print("=" * 80)
+
+    if args.fail_on_regression and not regressions.empty:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
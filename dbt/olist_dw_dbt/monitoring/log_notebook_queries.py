@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Load notebook query profiles into core_monitoring.notebook_query_history.
+
+Notebooks open the warehouse read-only, so olist_utils.profiling appends one
+JSON record per read query to the file named by OLIST_QUERY_LOG. This script
+reads those JSONL files, skips query_ids that are already loaded and inserts
+the rest in one transaction. Re-running it is a no-op.
+
+Usage:
+    OLIST_QUERY_LOG=/tmp/olist_queries.jsonl marimo run ...
+    python monitoring/log_notebook_queries.py /tmp/olist_queries.jsonl
+    python monitoring/log_notebook_queries.py logs/   # every *.jsonl in logs/
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+from log_run_results import DB_PATH, insert_batch
+
+COLUMNS = [
+    "query_id",
+    "session_id",
+    "notebook",
+    "cell_id",
+    "query_hash",
+    "sql_text",
+    "param_count",
+    "started_at",
+    "wall_seconds",
+    "rows_returned",
+    "bytes_returned",
+    "cache_hit",
+    "explain_analyze",
+    "loaded_at",
+]
+
+
+def find_log_files(paths):
+    """Expand the given files and directories into JSONL log files."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.glob("*.jsonl")))
+        elif path.exists():
+            files.append(path)
+        else:
+            print(f"⚠️  Not found, skipping: {path}")
+    return files
+
+
+def read_query_log(path):
+    """Read the records of one JSONL log, skipping truncated lines."""
+    records = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # The last line may be partial if the notebook was killed mid-write
+                continue
+    return records
+
+
+def get_loaded_query_ids(con):
+    """Return the query_ids already present in notebook_query_history."""
+    rows = con.execute(
+        "SELECT query_id FROM core_monitoring.notebook_query_history"
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def insert_notebook_queries(con, queries):
+    """Insert query records into notebook_query_history table."""
+    return insert_batch(
+        con,
+        "notebook_query_history",
+        queries,
+        COLUMNS,
+        timestamp_columns=["started_at", "loaded_at"],
+    )
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Load notebook query profiles into the monitoring tables"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        type=Path,
+        help="JSONL logs or directories of them (default: $OLIST_QUERY_LOG)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to load notebook query profiles."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("DBT CUSTOM MONITORING - Logging Notebook Queries")
+    print("=" * 80)
+
+    # Locate logs
+    print("\n1. Locating query logs...")
+    paths = args.paths
+    if not paths and os.getenv("OLIST_QUERY_LOG"):
+        paths = [Path(os.environ["OLIST_QUERY_LOG"])]
+    if not paths:
+        print("❌ No query log given (pass a path or set OLIST_QUERY_LOG)")
+        sys.exit(1)
+
+    log_files = find_log_files(paths)
+    if not log_files:
+        print("❌ No query logs to load")
+        sys.exit(1)
+    print(f"✓ Found {len(log_files)} query logs")
+
+    # Read already-loaded queries (read-only, so dashboards are not blocked)
+    print("\n2. Checking loaded queries...")
+    try:
+        con = duckdb.connect(str(DB_PATH), read_only=True)
+        loaded_ids = get_loaded_query_ids(con)
+        con.close()
+        print(f"✓ {len(loaded_ids)} queries already in notebook_query_history")
+    except Exception as e:
+        print(f"❌ Failed to read {DB_PATH}: {e}")
+        sys.exit(1)
+
+    # Parse logs
+    print("\n3. Parsing query logs...")
+    loaded_at = datetime.now(timezone.utc).isoformat()
+    new_queries = {}
+    skipped = 0
+    for path in log_files:
+        records = read_query_log(path)
+        for record in records:
+            query_id = record.get("query_id")
+            if not query_id or query_id in loaded_ids or query_id in new_queries:
+                skipped += 1
+                continue
+            new_queries[query_id] = dict(record, loaded_at=loaded_at)
+        print(f"✓ {path.name}: {len(records)} records")
+    print(f"✓ {len(new_queries)} new queries, {skipped} skipped (loaded or invalid)")
+
+    if not new_queries:
+        print("\n" + "=" * 80)
+        print("✅ SUCCESS - Nothing new to log")
+        print("=" * 80)
+        return
+
+    # Connect to database
+    print("\n4. Connecting to DuckDB...")
+    try:
+        con = duckdb.connect(str(DB_PATH))
+        print(f"✓ Connected to {DB_PATH}")
+    except Exception as e:
+        print(f"❌ Failed to connect: {e}")
+        sys.exit(1)
+
+    # Insert data
+    print("\n5. Inserting data into monitoring tables...")
+    try:
+        con.begin()
+
+        # Re-check inside the transaction so concurrent loaders stay idempotent
+        for query_id in get_loaded_query_ids(con) & set(new_queries):
+            del new_queries[query_id]
+
+        inserted = insert_notebook_queries(con, list(new_queries.values()))
+        print(f"✓ Inserted {inserted} notebook queries")
+
+        con.commit()
+        print("✓ Committed transaction")
+    except Exception as e:
+        print(f"❌ Failed to insert data: {e}")
+        try:
+            con.rollback()
+        except Exception:
+            pass
+        sys.exit(1)
+    finally:
+        con.close()
+
+    print("\n" + "=" * 80)
+    print("✅ SUCCESS - Notebook queries logged to monitoring tables")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,40 @@
 Custom dbt monitoring script for DuckDB.
 Parses run_results.json and manifest.json to populate monitoring tables.
 
+manifest.json is read through manifest_index.py, which streams out only the
+node fields used here and caches that slim index by manifest hash.
+
+Critical-path and parallelism analysis (critical_path.py) is stored per node
+and per run alongside the timings.
+
+Model executions, per-phase node timings (compile and execute) and test
+results are each built as one DataFrame and inserted with a single
+INSERT ... SELECT, so the write lock on the warehouse is held only briefly.
+
+Batch mode (--artifacts-dir) backfills history from a directory of archived
+artifacts: every run_results.json with a manifest.json next to it is parsed
+in a process pool, invocation_ids that are already loaded are skipped, and
+all new runs are inserted in one transaction. Re-running it is a no-op.
+
 Usage:
     python monitoring/log_run_results.py
+    python monitoring/log_run_results.py --artifacts-dir /path/to/archived/artifacts
+    python monitoring/log_run_results.py --artifacts-dir archive --workers 8
 """
 
+import argparse
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 
 import duckdb
+import pandas as pd
+from critical_path import analyze_run
+from manifest_index import load_manifest_index
 
 # Paths
 DBT_PROJECT_DIR = Path(__file__).parent.parent
@@ -113,109 +137,409 @@ def parse_model_executions(run_results, manifest):
     return model_executions
 
 
-def insert_run_summary(con, run_summary):
-    """Insert run summary into dbt_run_history table."""
-    sql = """
-        INSERT INTO core_monitoring.dbt_run_history (
-            invocation_id,
-            run_started_at,
-            run_completed_at,
-            dbt_command,
-            success,
-            total_models,
-            total_tests,
-            total_runtime_seconds,
-            dbt_version,
-            target_name
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+def parse_node_timings(run_results):
+    """Parse every timing phase (compile, execute) of every executed node."""
+    invocation_id = get_invocation_id(run_results)
+    node_timings = []
+
+    for result in run_results.get("results", []):
+        unique_id = result.get("unique_id", "")
+        for phase in result.get("timing", []):
+            started_at = phase.get("started_at")
+            completed_at = phase.get("completed_at")
+            duration = None
+            if started_at and completed_at:
+                duration = (
+                    pd.Timestamp(completed_at) - pd.Timestamp(started_at)
+                ).total_seconds()
+
+            node_timings.append(
+                {
+                    "invocation_id": invocation_id,
+                    "unique_id": unique_id,
+                    "resource_type": unique_id.split(".")[0],
+                    "phase": phase.get("name", "unknown"),
+                    "started_at": started_at,
+                    "completed_at": completed_at,
+                    "duration_seconds": duration,
+                }
+            )
+
+    return node_timings
+
+
+def parse_test_results(run_results, manifest):
+    """Parse data test results (status, failure count, tested model)."""
+    invocation_id = get_invocation_id(run_results)
+    nodes = manifest.get("nodes", {})
+    test_results = []
+
+    for result in run_results.get("results", []):
+        unique_id = result.get("unique_id", "")
+        if not unique_id.startswith("test."):
+            continue
+
+        node = nodes.get(unique_id, {})
+        depends_on = node.get("depends_on", {}).get("nodes", [])
+        tested_node = node.get("attached_node") or (
+            depends_on[0] if depends_on else None
+        )
+        test_type = node.get("test_metadata", {}).get("name", "singular")
+
+        timing = result.get("timing", [])
+        test_results.append(
+            {
+                "invocation_id": invocation_id,
+                "test_name": node.get("name", unique_id.split(".")[-1]),
+                "test_type": test_type,
+                "tested_node": tested_node,
+                "column_name": node.get("column_name"),
+                "severity": node.get("config", {}).get("severity", "unknown"),
+                "status": result.get("status", "unknown"),
+                "failures": result.get("failures"),
+                "execution_time_seconds": result.get("execution_time", 0),
+                "message": result.get("message"),
+                "executed_at": timing[-1].get("completed_at") if timing else None,
+                "unique_id": unique_id,
+            }
+        )
+
+    return test_results
+
+
+def insert_batch(con, table_name, rows, columns, timestamp_columns=()):
     """
+    Insert a list of row dicts into core_monitoring.<table_name> as one batch.
+
+    The rows are turned into a single DataFrame, registered as a view and
+    loaded with one INSERT ... SELECT instead of one statement per row.
+    dbt timestamps are ISO-8601 UTC strings; they are stored as naive UTC.
+    """
+    if not rows:
+        return 0
+
+    batch = pd.DataFrame.from_records(rows, columns=columns)
+    for column in timestamp_columns:
+        batch[column] = pd.to_datetime(batch[column], utc=True).dt.tz_localize(None)
+
+    column_list = ", ".join(columns)
+    con.register("monitoring_batch", batch)
+    try:
+        con.execute(
+            f"""
+            INSERT INTO core_monitoring.{table_name} ({column_list})
+            SELECT {column_list} FROM monitoring_batch
+            """
+        )
+    finally:
+        con.unregister("monitoring_batch")
+
+    return len(batch)
+
+
+def parse_artifacts(artifact_paths, loaded_ids=frozenset()):
+    """
+    Parse one run_results.json / manifest.json pair into monitoring rows.
+
+    Runs inside a worker process in batch mode. The manifest (the expensive
+    file) is only read when the invocation has not been loaded yet.
+    """
+    run_results_path, manifest_path = artifact_paths
+
+    run_results = load_json_file(run_results_path)
+    if not run_results:
+        return None
+
+    invocation_id = get_invocation_id(run_results)
+    if invocation_id in loaded_ids:
+        return {"invocation_id": invocation_id, "skipped": True}
+
+    manifest = load_manifest_index(manifest_path)
+    if not manifest:
+        return None
+
+    node_schedule, run_parallelism = analyze_run(run_results, manifest)
+
+    return {
+        "invocation_id": invocation_id,
+        "skipped": False,
+        "source": str(run_results_path),
+        "run_summary": parse_run_summary(run_results, manifest),
+        "model_executions": parse_model_executions(run_results, manifest),
+        "node_timings": parse_node_timings(run_results),
+        "test_results": parse_test_results(run_results, manifest),
+        "node_schedule": node_schedule,
+        "run_parallelism": [run_parallelism] if run_parallelism else [],
+    }
+
+
+def find_artifact_pairs(artifacts_dir):
+    """Find every archived run_results.json that has a manifest.json beside it."""
+    pairs = []
+    for run_results_path in sorted(artifacts_dir.rglob("run_results.json")):
+        manifest_path = run_results_path.with_name("manifest.json")
+        if not manifest_path.exists():
+            print(f"⚠️  No manifest.json next to {run_results_path}, skipped")
+            continue
+        pairs.append((run_results_path, manifest_path))
+    return pairs
+
+
+def parse_artifact_pairs(pairs, loaded_ids, workers):
+    """Parse artifact pairs, in a process pool when there is more than one."""
+    parse = partial(parse_artifacts, loaded_ids=frozenset(loaded_ids))
+    if workers <= 1 or len(pairs) <= 1:
+        return [parse(pair) for pair in pairs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(parse, pairs))
+
 
-    con.execute(
-        sql,
+def get_loaded_invocation_ids(con):
+    """Return the invocation_ids already present in dbt_run_history."""
+    rows = con.execute(
+        "SELECT DISTINCT invocation_id FROM core_monitoring.dbt_run_history"
+    ).fetchall()
+    return {row[0] for row in rows}
+
+
+def insert_run_summaries(con, run_summaries):
+    """Insert run summaries into dbt_run_history table."""
+    return insert_batch(
+        con,
+        "dbt_run_history",
+        run_summaries,
         [
-            run_summary["invocation_id"],
-            run_summary["run_started_at"],
-            run_summary["run_completed_at"],
-            run_summary["dbt_command"],
-            run_summary["success"],
-            run_summary["total_models"],
-            run_summary["total_tests"],
-            run_summary["total_runtime_seconds"],
-            run_summary["dbt_version"],
-            run_summary["target_name"],
+            "invocation_id",
+            "run_started_at",
+            "run_completed_at",
+            "dbt_command",
+            "success",
+            "total_models",
+            "total_tests",
+            "total_runtime_seconds",
+            "dbt_version",
+            "target_name",
         ],
+        timestamp_columns=["run_started_at", "run_completed_at"],
     )
 
 
 def insert_model_executions(con, model_executions):
     """Insert model executions into dbt_model_history table."""
-    if not model_executions:
-        return
+    return insert_batch(
+        con,
+        "dbt_model_history",
+        model_executions,
+        [
+            "invocation_id",
+            "model_name",
+            "schema_name",
+            "materialization",
+            "status",
+            "execution_time_seconds",
+            "rows_affected",
+            "executed_at",
+            "unique_id",
+        ],
+        timestamp_columns=["executed_at"],
+    )
 
-    sql = """
-        INSERT INTO core_monitoring.dbt_model_history (
-            invocation_id,
-            model_name,
-            schema_name,
-            materialization,
-            status,
-            execution_time_seconds,
-            rows_affected,
-            executed_at,
-            unique_id
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """
 
-    for execution in model_executions:
-        con.execute(
-            sql,
-            [
-                execution["invocation_id"],
-                execution["model_name"],
-                execution["schema_name"],
-                execution["materialization"],
-                execution["status"],
-                execution["execution_time_seconds"],
-                execution["rows_affected"],
-                execution["executed_at"],
-                execution["unique_id"],
-            ],
-        )
+def insert_node_timings(con, node_timings):
+    """Insert per-phase node timings into dbt_node_timings table."""
+    return insert_batch(
+        con,
+        "dbt_node_timings",
+        node_timings,
+        [
+            "invocation_id",
+            "unique_id",
+            "resource_type",
+            "phase",
+            "started_at",
+            "completed_at",
+            "duration_seconds",
+        ],
+        timestamp_columns=["started_at", "completed_at"],
+    )
+
+
+def insert_test_results(con, test_results):
+    """Insert test results into dbt_test_history table."""
+    return insert_batch(
+        con,
+        "dbt_test_history",
+        test_results,
+        [
+            "invocation_id",
+            "test_name",
+            "test_type",
+            "tested_node",
+            "column_name",
+            "severity",
+            "status",
+            "failures",
+            "execution_time_seconds",
+            "message",
+            "executed_at",
+            "unique_id",
+        ],
+        timestamp_columns=["executed_at"],
+    )
+
+
+def insert_node_schedule(con, node_schedule):
+    """Insert critical-path node schedule into dbt_node_schedule table."""
+    return insert_batch(
+        con,
+        "dbt_node_schedule",
+        node_schedule,
+        [
+            "invocation_id",
+            "unique_id",
+            "resource_type",
+            "thread_id",
+            "status",
+            "started_at",
+            "completed_at",
+            "start_offset_seconds",
+            "duration_seconds",
+            "queue_wait_seconds",
+            "slack_seconds",
+            "on_critical_path",
+            "critical_path_position",
+        ],
+        timestamp_columns=["started_at", "completed_at"],
+    )
+
+
+def insert_run_parallelism(con, run_parallelism):
+    """Insert run-level parallelism metrics into dbt_run_parallelism table."""
+    return insert_batch(
+        con,
+        "dbt_run_parallelism",
+        run_parallelism,
+        [
+            "invocation_id",
+            "threads",
+            "nodes_executed",
+            "run_started_at",
+            "run_completed_at",
+            "wall_clock_seconds",
+            "total_node_seconds",
+            "critical_path_seconds",
+            "critical_path_nodes",
+            "avg_active_threads",
+            "max_active_threads",
+            "thread_utilization",
+            "idle_gap_seconds",
+            "thread_bound",
+        ],
+        timestamp_columns=["run_started_at", "run_completed_at"],
+    )
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Log dbt run results to the monitoring tables"
+    )
+    parser.add_argument(
+        "--artifacts-dir",
+        type=Path,
+        help="Backfill from every run_results.json/manifest.json pair under this dir",
+    )
+    parser.add_argument(
+        "--run-results",
+        type=Path,
+        default=RUN_RESULTS_PATH,
+        help="run_results.json to load in single-run mode (default: target/)",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=MANIFEST_PATH,
+        help="manifest.json to load in single-run mode (default: target/)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Parser processes in batch mode (default: CPU count)",
+    )
+    return parser.parse_args()
 
 
 def main():
     """Main function to log dbt run results."""
+    args = parse_args()
+
     print("=" * 80)
     print("DBT CUSTOM MONITORING - Logging Run Results")
     print("=" * 80)
 
-    # Load JSON files
-    print("\n1. Loading dbt artifacts...")
-    run_results = load_json_file(RUN_RESULTS_PATH)
-    if not run_results:
-        print("❌ Cannot proceed without run_results.json")
+    # Locate artifacts
+    print("\n1. Locating dbt artifacts...")
+    if args.artifacts_dir:
+        if not args.artifacts_dir.is_dir():
+            print(f"❌ Artifacts directory not found: {args.artifacts_dir}")
+            sys.exit(1)
+        pairs = find_artifact_pairs(args.artifacts_dir)
+        print(f"✓ Found {len(pairs)} archived runs in {args.artifacts_dir}")
+    else:
+        pairs = [(args.run_results, args.manifest)]
+        print(f"✓ Using {args.run_results.name} and {args.manifest.name}")
+
+    if not pairs:
+        print("❌ No run_results.json files to load")
         sys.exit(1)
 
-    manifest = load_json_file(MANIFEST_PATH)
-    if not manifest:
-        print("❌ Cannot proceed without manifest.json")
+    # Read already-loaded invocations (read-only, so dashboards are not blocked)
+    print("\n2. Checking loaded invocations...")
+    try:
+        con = duckdb.connect(str(DB_PATH), read_only=True)
+        loaded_ids = get_loaded_invocation_ids(con)
+        con.close()
+        print(f"✓ {len(loaded_ids)} invocations already in dbt_run_history")
+    except Exception as e:
+        print(f"❌ Failed to read {DB_PATH}: {e}")
         sys.exit(1)
 
-    print(f"✓ Loaded run_results.json")
-    print(f"✓ Loaded manifest.json")
-
     # Parse data
-    print("\n2. Parsing run results...")
-    run_summary = parse_run_summary(run_results, manifest)
-    model_executions = parse_model_executions(run_results, manifest)
+    print("\n3. Parsing run results...")
+    parsed = parse_artifact_pairs(pairs, loaded_ids, args.workers)
 
-    print(f"✓ Invocation ID: {run_summary['invocation_id']}")
-    print(f"✓ Command: {run_summary['dbt_command']}")
-    print(f"✓ Models executed: {len(model_executions)}")
-    print(f"✓ Runtime: {run_summary['total_runtime_seconds']:.2f}s")
+    if any(run is None for run in parsed) and not args.artifacts_dir:
+        print("❌ Cannot proceed without run_results.json and manifest.json")
+        sys.exit(1)
+
+    new_runs = {}
+    skipped = 0
+    for run in parsed:
+        if run is None or run["skipped"] or run["invocation_id"] in new_runs:
+            skipped += 1
+            continue
+        new_runs[run["invocation_id"]] = run
+
+    for run in new_runs.values():
+        run_summary = run["run_summary"]
+        print(
+            f"✓ {run_summary['invocation_id']}  {run_summary['dbt_command']:6}  "
+            f"{len(run['model_executions']):>4} models  "
+            f"{len(run['test_results']):>4} tests  "
+            f"{run_summary['total_runtime_seconds']:.2f}s"
+        )
+    print(f"✓ {len(new_runs)} new runs, {skipped} skipped (loaded or invalid)")
+
+    if not new_runs:
+        print("\n" + "=" * 80)
+        print("✅ SUCCESS - Nothing new to log")
+        print("=" * 80)
+        return
 
     # Connect to database
-    print("\n3. Connecting to DuckDB...")
+    print("\n4. Connecting to DuckDB...")
     try:
         con = duckdb.connect(str(DB_PATH))
         print(f"✓ Connected to {DB_PATH}")
@@ -224,14 +548,42 @@ def main():
         sys.exit(1)
 
     # Insert data
-    print("\n4. Inserting data into monitoring tables...")
+    print("\n5. Inserting data into monitoring tables...")
     try:
         con.begin()
-        insert_run_summary(con, run_summary)
-        print(f"✓ Inserted run summary")
 
-        insert_model_executions(con, model_executions)
-        print(f"✓ Inserted {len(model_executions)} model executions")
+        # Re-check inside the transaction so concurrent loaders stay idempotent
+        for invocation_id in get_loaded_invocation_ids(con) & set(new_runs):
+            del new_runs[invocation_id]
+        runs = list(new_runs.values())
+
+        inserted = insert_run_summaries(con, [run["run_summary"] for run in runs])
+        print(f"✓ Inserted {inserted} run summaries")
+
+        inserted = insert_model_executions(
+            con, [row for run in runs for row in run["model_executions"]]
+        )
+        print(f"✓ Inserted {inserted} model executions")
+
+        inserted = insert_node_timings(
+            con, [row for run in runs for row in run["node_timings"]]
+        )
+        print(f"✓ Inserted {inserted} node phase timings")
+
+        inserted = insert_test_results(
+            con, [row for run in runs for row in run["test_results"]]
+        )
+        print(f"✓ Inserted {inserted} test results")
+
+        inserted = insert_node_schedule(
+            con, [row for run in runs for row in run["node_schedule"]]
+        )
+        print(f"✓ Inserted {inserted} node schedule rows")
+
+        inserted = insert_run_parallelism(
+            con, [row for run in runs for row in run["run_parallelism"]]
+        )
+        print(f"✓ Inserted {inserted} run parallelism summaries")
 
         con.commit()
         print("✓ Committed transaction")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Slim, cached index of a dbt manifest.json.
+
+The monitoring loader only needs a handful of fields per node (name, schema,
+materialization, test metadata, dependencies), but manifest.json also carries
+raw and compiled SQL, docs and column metadata for every node and can be tens
+to hundreds of MB. This module streams the "nodes" object with ijson (when it
+is installed) so only one node is in memory at a time, keeps the needed
+fields, and caches the result as a small JSON file keyed by the manifest's
+SHA-256. Later loads of the same manifest read the cached index instead.
+Only the INDEX_CACHE_KEEP most recently used index files are kept.
+
+The index keeps the manifest's shape ({"nodes": {unique_id: {...}}}) so it can
+be passed anywhere a manifest dict was used for node lookups.
+
+Usage:
+    python monitoring/manifest_index.py                 # index target/manifest.json
+    python monitoring/manifest_index.py path/to/manifest.json
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+try:
+    import ijson
+except ImportError:  # fall back to a full json.load
+    ijson = None
+
+# Paths
+DBT_PROJECT_DIR = Path(__file__).parent.parent
+MANIFEST_PATH = DBT_PROJECT_DIR / "target" / "manifest.json"
+INDEX_CACHE_DIR = DBT_PROJECT_DIR / "target" / "manifest_index"
+
+# Bump when the slim node shape changes so stale cache files are ignored
+INDEX_VERSION = 2
+
+# Index files kept in INDEX_CACHE_DIR; older ones are deleted on each write
+INDEX_CACHE_KEEP = 5
+
+
+def file_sha256(filepath, chunk_size=1024 * 1024):
+    """Hash a file in chunks without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def slim_node(node):
+    """Keep only the node fields the monitoring scripts read."""
+    config = node.get("config") or {}
+    return {
+        "name": node.get("name"),
+        "resource_type": node.get("resource_type"),
+        "schema": node.get("schema"),
+        "fqn": node.get("fqn", []),
+        "config": {
+            "materialized": config.get("materialized"),
+            "severity": config.get("severity"),
+            "cluster_by": config.get("cluster_by"),
+        },
+        "depends_on": {"nodes": (node.get("depends_on") or {}).get("nodes", [])},
+        "attached_node": node.get("attached_node"),
+        "column_name": node.get("column_name"),
+        "test_metadata": {"name": (node.get("test_metadata") or {}).get("name")},
+    }
+
+
+def iter_manifest_nodes(manifest_path):
+    """Yield (unique_id, node) pairs from the manifest's "nodes" object."""
+    with open(manifest_path, "rb") as f:
+        if ijson is not None:
+            yield from ijson.kvitems(f, "nodes", use_float=True)
+            return
+
+        manifest = json.load(f)
+    yield from manifest.get("nodes", {}).items()
+
+
+def build_manifest_index(manifest_path):
+    """Extract the slim node index from a manifest.json."""
+    return {
+        "nodes": {
+            unique_id: slim_node(node)
+            for unique_id, node in iter_manifest_nodes(manifest_path)
+        }
+    }
+
+
+def prune_index_cache(cache_dir, keep=INDEX_CACHE_KEEP):
+    """Delete all but the `keep` most recently used index files."""
+    cached = []
+    for path in Path(cache_dir).glob("*.json"):
+        try:
+            cached.append((path.stat().st_mtime, path))
+        except FileNotFoundError:  # pruned by a concurrent worker
+            continue
+    cached.sort(reverse=True)
+    for _, path in cached[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def load_manifest_index(manifest_path=MANIFEST_PATH, cache_dir=INDEX_CACHE_DIR):
+    """
+    Return the slim index for manifest_path, building and caching it on a miss.
+
+    Returns None if the manifest does not exist.
+    """
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        print(f"❌ File not found: {manifest_path}")
+        return None
+
+    manifest_hash = file_sha256(manifest_path)
+    cache_path = Path(cache_dir) / f"{manifest_hash[:16]}.json"
+
+    if cache_path.exists():
+        with open(cache_path, "r") as f:
+            cached = json.load(f)
+        if (
+            cached.get("index_version") == INDEX_VERSION
+            and cached.get("manifest_sha256") == manifest_hash
+        ):
+            # Mark as recently used so pruning keeps it
+            os.utime(cache_path)
+            return cached
+
+    index = build_manifest_index(manifest_path)
+    index["index_version"] = INDEX_VERSION
+    index["manifest_sha256"] = manifest_hash
+
+    # Write atomically: batch-mode workers may index the same manifest at once
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(index, f)
+    tmp_path.replace(cache_path)
+    prune_index_cache(cache_dir)
+
+    return index
+
+
+def main():
+    """Build (or reuse) the index for one manifest and print a summary."""
+    manifest_path = Path(sys.argv[1]) if len(sys.argv) > 1 else MANIFEST_PATH
+    index = load_manifest_index(manifest_path)
+    if index is None:
+        sys.exit(1)
+
+    print(f"✓ {len(index['nodes'])} nodes indexed from {manifest_path}")
+    print(f"✓ Manifest hash: {index['manifest_sha256'][:16]}")
+
+
+if __name__ == "__main__":
+    main()
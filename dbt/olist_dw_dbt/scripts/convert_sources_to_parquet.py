@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Parquet landing zone for the raw Olist CSV files.
+
+Converts every source declared in models/staging/_sources.yml from CSV into
+compressed Parquet once, so the staging views read columnar files instead of
+re-parsing the CSVs on every query. The CSVs are read with the explicit column
+schema declared in _sources.yml (column data_type), so nothing is type-sniffed
+and timestamps are parsed at read time.
+
+A fingerprint of each CSV (plus its declared schema) is stored next to the
+Parquet files and a table is only reconverted when either of them changes.
+
+Usage:
+    python scripts/convert_sources_to_parquet.py
+    python scripts/convert_sources_to_parquet.py --force
+    python scripts/convert_sources_to_parquet.py --tables orders geolocation
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+import yaml
+
+# Paths
+DBT_PROJECT_DIR = Path(__file__).parent.parent
+DBT_PROJECT_PATH = DBT_PROJECT_DIR / "dbt_project.yml"
+SOURCES_PATH = DBT_PROJECT_DIR / "models" / "staging" / "_sources.yml"
+FINGERPRINTS_FILE = "_fingerprints.json"
+
+# Parquet writer settings
+PARQUET_COMPRESSION = "zstd"
+PARQUET_ROW_GROUP_SIZE = 122880
+
+
+def load_project_vars():
+    """Read the vars block from dbt_project.yml."""
+    with open(DBT_PROJECT_PATH, "r") as f:
+        project = yaml.safe_load(f)
+    return project.get("vars", {})
+
+
+def load_source_tables():
+    """
+    Return the schema registry for every raw source table.
+
+    Each entry is {"csv_file", "columns", "timestamp_format"}, where columns
+    is an ordered {column_name: data_type} mapping in CSV column order.
+    """
+    with open(SOURCES_PATH, "r") as f:
+        sources = yaml.safe_load(f)
+
+    tables = {}
+    for source in sources.get("sources", []):
+        timestamp_format = source.get("meta", {}).get("timestamp_format")
+        for table in source.get("tables", []):
+            csv_file = table.get("meta", {}).get("csv_file")
+            if not csv_file:
+                continue
+
+            columns = {}
+            for column in table.get("columns", []):
+                if "data_type" not in column:
+                    raise ValueError(
+                        f"{table['name']}.{column['name']} has no data_type in {SOURCES_PATH.name}"
+                    )
+                columns[column["name"]] = column["data_type"]
+
+            tables[table["name"]] = {
+                "csv_file": csv_file,
+                "columns": columns,
+                "timestamp_format": timestamp_format,
+            }
+    return tables
+
+
+def schema_hash(table):
+    """Hash the declared schema so registry edits trigger a reconversion."""
+    payload = json.dumps(
+        [list(table["columns"].items()), table["timestamp_format"]]
+    ).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def read_csv_sql(csv_path, table):
+    """Build a read_csv call with an explicit schema (no auto-detection)."""
+    columns = ", ".join(
+        f"'{name}': '{data_type}'" for name, data_type in table["columns"].items()
+    )
+    options = [
+        f"'{csv_path}'",
+        "header = true",
+        "auto_detect = false",
+        f"columns = {{{columns}}}",
+    ]
+    if table["timestamp_format"]:
+        options.append(f"timestampformat = '{table['timestamp_format']}'")
+    return f"read_csv({', '.join(options)})"
+
+
+def file_sha256(filepath, chunk_size=1024 * 1024):
+    """Hash a file in chunks without loading it into memory."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_fingerprints(parquet_dir):
+    """Load stored fingerprints from the landing zone."""
+    path = parquet_dir / FINGERPRINTS_FILE
+    if not path.exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_fingerprints(parquet_dir, fingerprints):
+    """Persist fingerprints atomically."""
+    path = parquet_dir / FINGERPRINTS_FILE
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(fingerprints, f, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def needs_conversion(csv_path, parquet_path, stored, schema):
+    """
+    Decide whether a CSV must be reconverted.
+
+    Size and mtime are checked first so unchanged files are skipped without
+    hashing; the SHA-256 is only computed when those differ (e.g. after a
+    copy that touched the mtime but not the content).
+
+    Returns (needs_conversion, fingerprint).
+    """
+    stat = csv_path.stat()
+    fingerprint = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "schema": schema,
+    }
+
+    if not stored or not parquet_path.exists() or stored.get("schema") != schema:
+        fingerprint["sha256"] = file_sha256(csv_path)
+        return True, fingerprint
+
+    if (
+        stored.get("size") == fingerprint["size"]
+        and stored.get("mtime_ns") == fingerprint["mtime_ns"]
+    ):
+        fingerprint["sha256"] = stored.get("sha256")
+        return False, fingerprint
+
+    fingerprint["sha256"] = file_sha256(csv_path)
+    return fingerprint["sha256"] != stored.get("sha256"), fingerprint
+
+
+def convert_table(con, csv_path, parquet_path, table):
+    """Write one CSV to Parquet via a temp file, then swap it into place."""
+    tmp_path = parquet_path.with_suffix(".parquet.tmp")
+    con.execute(
+        f"""
+        COPY (
+            SELECT *
+            FROM {read_csv_sql(csv_path, table)}
+        ) TO '{tmp_path}' (
+            FORMAT parquet,
+            COMPRESSION {PARQUET_COMPRESSION},
+            ROW_GROUP_SIZE {PARQUET_ROW_GROUP_SIZE}
+        )
+        """
+    )
+    tmp_path.replace(parquet_path)
+
+    return con.execute(
+        f"SELECT count(*) FROM read_parquet('{parquet_path}')"
+    ).fetchone()[0]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    project_vars = load_project_vars()
+
+    parser = argparse.ArgumentParser(
+        description="Convert raw Olist CSV sources to Parquet"
+    )
+    parser.add_argument(
+        "--csv-dir",
+        type=Path,
+        default=Path(project_vars.get("csv_source_path", ".")),
+        help="Directory containing the raw CSV files (default: csv_source_path var)",
+    )
+    parser.add_argument(
+        "--parquet-dir",
+        type=Path,
+        default=Path(project_vars.get("parquet_source_path", "parquet")),
+        help="Landing zone for Parquet files (default: parquet_source_path var)",
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="+",
+        help="Only convert these source tables (default: all)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Reconvert even if the CSV fingerprint is unchanged",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to land CSV sources as Parquet."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("PARQUET LANDING ZONE - Converting raw CSV sources")
+    print("=" * 80)
+
+    tables = load_source_tables()
+    if args.tables:
+        unknown = set(args.tables) - set(tables)
+        if unknown:
+            print(f"❌ Unknown source tables: {', '.join(sorted(unknown))}")
+            sys.exit(1)
+        tables = {name: tables[name] for name in args.tables}
+
+    if not args.csv_dir.exists():
+        print(f"❌ CSV directory not found: {args.csv_dir}")
+        sys.exit(1)
+
+    args.parquet_dir.mkdir(parents=True, exist_ok=True)
+    fingerprints = load_fingerprints(args.parquet_dir)
+
+    print(f"\nCSV source:   {args.csv_dir}")
+    print(f"Landing zone: {args.parquet_dir}\n")
+
+    con = duckdb.connect()
+    converted = 0
+    try:
+        for name, table in tables.items():
+            csv_path = args.csv_dir / table["csv_file"]
+            parquet_path = args.parquet_dir / f"{name}.parquet"
+
+            if not csv_path.exists():
+                print(f"❌ {name}: CSV not found at {csv_path}")
+                sys.exit(1)
+
+            stale, fingerprint = needs_conversion(
+                csv_path, parquet_path, fingerprints.get(name), schema_hash(table)
+            )
+            if not stale and not args.force:
+                # Refresh size/mtime but keep the stored row count
+                fingerprints[name] = {**fingerprints[name], **fingerprint}
+                print(f"✓ {name:22} unchanged, skipped")
+                continue
+
+            start = time.perf_counter()
+            row_count = convert_table(con, csv_path, parquet_path, table)
+            elapsed = time.perf_counter() - start
+
+            fingerprint["rows"] = row_count
+            fingerprints[name] = fingerprint
+            save_fingerprints(args.parquet_dir, fingerprints)
+            converted += 1
+
+            print(f"✓ {name:22} {row_count:>10,} rows in {elapsed:.2f}s")
+    finally:
+        con.close()
+
+    save_fingerprints(args.parquet_dir, fingerprints)
+
+    print("\n" + "=" * 80)
+    print(f"✅ SUCCESS - {converted} of {len(tables)} sources converted")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,995 @@
+#!/usr/bin/env python3
+"""
+Synthetic Olist source data at a configurable scale factor.
+
+Writes all nine raw CSVs declared in models/staging/_sources.yml (same file
+names, column order and timestamp format as the Kaggle export), so the
+warehouse and notebooks can be load-tested at 1x, 10x or 100x the real data
+before production volumes get there. Scale factor 1 produces about as many
+rows as the Kaggle dataset (~99k orders).
+
+The data is generated inside DuckDB rather than row by row in Python. Every
+random draw is a hash of (row key, purpose, seed), so the output is
+deterministic for a given seed and DuckDB version regardless of thread count,
+and 100x runs are spilled to disk by DuckDB instead of held in Python memory.
+
+Distributions follow the real dataset: customer states, order growth over
+2016-2018, daytime purchase hours, order statuses, 1-6 items per order with
+popular products and sellers, lognormal prices and product dimensions,
+payment types and installments, state-dependent delivery times and review
+scores that drop when a delivery is late. Referential integrity holds by
+construction: every order has one customer, every item references a
+generated product and seller, payments add up to the order value, and every
+customer and seller zip prefix exists in geolocation. Geolocation and the
+category translation describe Brazil and the catalog, not order volume, so
+they stay the same size at every scale factor.
+
+Usage:
+    python scripts/generate_synthetic_data.py --scale 10
+    python scripts/generate_synthetic_data.py --scale 100 --output-dir /data/sf100
+    python scripts/convert_sources_to_parquet.py --csv-dir synthetic/sf10 \\
+        --parquet-dir synthetic/sf10/parquet
+    dbt build --vars '{parquet_source_path: synthetic/sf10/parquet}'
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import duckdb
+from convert_sources_to_parquet import load_source_tables
+
+# Paths
+DBT_PROJECT_DIR = Path(__file__).parent.parent
+SYNTHETIC_DIR = DBT_PROJECT_DIR / "synthetic"
+
+# Row counts of the Kaggle dataset at scale factor 1
+BASE_ORDERS = 99441
+BASE_PRODUCTS = 32951
+BASE_SELLERS = 3095
+
+# Geolocation: ~19k zip prefixes with ~52 coordinate rows each (fixed size)
+GEO_ZIP_PREFIXES = 19015
+GEO_ROWS_PER_ZIP = 52
+
+# Purchase window of the real data
+ORDER_START_DATE = "2016-09-04"
+ORDER_DAYS = 727
+
+# Share of orders placed by a customer_unique_id that already ordered
+REPEAT_CUSTOMER_RATE = 0.031
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# (state, share of customers, zip prefix range, lat, lng, typical delivery
+# days, cities) - zip ranges follow the Correios state ranges
+STATES = [
+    (
+        "SP",
+        0.420,
+        (1000, 19999),
+        -23.55,
+        -46.63,
+        8,
+        ["sao paulo", "campinas", "guarulhos", "santo andre", "ribeirao preto"],
+    ),
+    (
+        "RJ",
+        0.129,
+        (20000, 28999),
+        -22.91,
+        -43.17,
+        15,
+        ["rio de janeiro", "niteroi", "nova iguacu", "duque de caxias"],
+    ),
+    (
+        "ES",
+        0.020,
+        (29000, 29999),
+        -20.32,
+        -40.34,
+        15,
+        ["vitoria", "vila velha", "serra"],
+    ),
+    (
+        "MG",
+        0.117,
+        (30000, 39999),
+        -19.92,
+        -43.94,
+        12,
+        ["belo horizonte", "uberlandia", "contagem", "juiz de fora"],
+    ),
+    ("BA", 0.034, (40000, 48999), -12.97, -38.50, 19, ["salvador", "feira de santana"]),
+    ("SE", 0.003, (49000, 49999), -10.91, -37.07, 21, ["aracaju"]),
+    (
+        "PE",
+        0.017,
+        (50000, 56999),
+        -8.05,
+        -34.88,
+        18,
+        ["recife", "jaboatao dos guararapes"],
+    ),
+    ("AL", 0.004, (57000, 57999), -9.66, -35.74, 24, ["maceio"]),
+    ("PB", 0.005, (58000, 58999), -7.12, -34.86, 20, ["joao pessoa", "campina grande"]),
+    ("RN", 0.005, (59000, 59999), -5.79, -35.21, 19, ["natal"]),
+    ("CE", 0.013, (60000, 63999), -3.73, -38.52, 21, ["fortaleza"]),
+    ("PI", 0.005, (64000, 64999), -5.09, -42.80, 19, ["teresina"]),
+    ("MA", 0.008, (65000, 65999), -2.53, -44.30, 21, ["sao luis"]),
+    ("PA", 0.010, (66000, 68899), -1.46, -48.50, 23, ["belem", "ananindeua"]),
+    ("AP", 0.001, (68900, 68999), 0.03, -51.07, 27, ["macapa"]),
+    ("AM", 0.002, (69000, 69299), -3.12, -60.02, 26, ["manaus"]),
+    ("RR", 0.001, (69300, 69399), 2.82, -60.67, 29, ["boa vista"]),
+    ("AC", 0.001, (69900, 69999), -9.97, -67.81, 21, ["rio branco"]),
+    ("DF", 0.021, (70000, 72799), -15.79, -47.88, 13, ["brasilia"]),
+    (
+        "GO",
+        0.020,
+        (72800, 76799),
+        -16.68,
+        -49.25,
+        15,
+        ["goiania", "anapolis", "aparecida de goiania"],
+    ),
+    ("RO", 0.003, (76800, 76999), -8.76, -63.90, 19, ["porto velho"]),
+    ("TO", 0.003, (77000, 77999), -10.18, -48.33, 17, ["palmas"]),
+    ("MT", 0.009, (78000, 78899), -15.60, -56.10, 18, ["cuiaba", "varzea grande"]),
+    ("MS", 0.007, (79000, 79999), -20.44, -54.65, 15, ["campo grande"]),
+    (
+        "PR",
+        0.051,
+        (80000, 87999),
+        -25.43,
+        -49.27,
+        12,
+        ["curitiba", "londrina", "maringa"],
+    ),
+    (
+        "SC",
+        0.037,
+        (88000, 89999),
+        -27.60,
+        -48.55,
+        14,
+        ["florianopolis", "joinville", "blumenau"],
+    ),
+    (
+        "RS",
+        0.055,
+        (90000, 99999),
+        -30.03,
+        -51.23,
+        15,
+        ["porto alegre", "caxias do sul", "pelotas"],
+    ),
+]
+
+# Sellers are far more concentrated in the south-east than customers
+SELLER_STATE_WEIGHTS = {
+    "SP": 0.597,
+    "PR": 0.113,
+    "MG": 0.079,
+    "SC": 0.037,
+    "RJ": 0.055,
+    "RS": 0.042,
+    "GO": 0.013,
+    "DF": 0.010,
+    "ES": 0.008,
+    "BA": 0.009,
+    "PE": 0.003,
+    "CE": 0.004,
+    "MS": 0.002,
+    "MT": 0.002,
+    "RN": 0.002,
+}
+
+# Product categories (Portuguese, English), most popular first
+CATEGORIES = [
+    ("cama_mesa_banho", "bed_bath_table"),
+    ("beleza_saude", "health_beauty"),
+    ("esporte_lazer", "sports_leisure"),
+    ("moveis_decoracao", "furniture_decor"),
+    ("informatica_acessorios", "computers_accessories"),
+    ("utilidades_domesticas", "housewares"),
+    ("relogios_presentes", "watches_gifts"),
+    ("telefonia", "telephony"),
+    ("ferramentas_jardim", "garden_tools"),
+    ("automotivo", "auto"),
+    ("brinquedos", "toys"),
+    ("cool_stuff", "cool_stuff"),
+    ("perfumaria", "perfumery"),
+    ("bebes", "baby"),
+    ("eletronicos", "electronics"),
+    ("papelaria", "stationery"),
+    ("fashion_bolsas_e_acessorios", "fashion_bags_accessories"),
+    ("pet_shop", "pet_shop"),
+    ("moveis_escritorio", "office_furniture"),
+    ("consoles_games", "consoles_games"),
+    ("malas_acessorios", "luggage_accessories"),
+    ("construcao_ferramentas_construcao", "construction_tools_construction"),
+    ("eletrodomesticos", "home_appliances"),
+    ("instrumentos_musicais", "musical_instruments"),
+    ("eletroportateis", "small_appliances"),
+    ("casa_construcao", "home_construction"),
+    ("livros_interesse_geral", "books_general_interest"),
+    ("alimentos", "food"),
+    ("moveis_sala", "furniture_living_room"),
+    ("casa_conforto", "home_confort"),
+    ("bebidas", "drinks"),
+    ("audio", "audio"),
+    ("market_place", "market_place"),
+    ("construcao_ferramentas_iluminacao", "construction_tools_lights"),
+    ("climatizacao", "air_conditioning"),
+    ("industria_comercio_e_negocios", "industry_commerce_and_business"),
+    ("alimentos_bebidas", "food_drink"),
+    ("livros_tecnicos", "books_technical"),
+    ("telefonia_fixa", "fixed_telephony"),
+    ("fashion_calcados", "fashion_shoes"),
+    ("eletrodomesticos_2", "home_appliances_2"),
+    ("agro_industria_e_comercio", "agro_industry_and_commerce"),
+    ("artigos_de_natal", "christmas_supplies"),
+    ("sinalizacao_e_seguranca", "signaling_and_security"),
+    ("artes", "art"),
+    ("construcao_ferramentas_seguranca", "construction_tools_safety"),
+    ("dvds_blu_ray", "dvds_blu_ray"),
+    ("fashion_roupa_masculina", "fashion_male_clothing"),
+    ("artigos_de_festas", "party_supplies"),
+    ("musica", "music"),
+]
+
+# Share of products without a category (as in the Kaggle data)
+NULL_CATEGORY_RATE = 0.0185
+
+ORDER_STATUS_WEIGHTS = [
+    ("delivered", 0.9702),
+    ("shipped", 0.0111),
+    ("canceled", 0.0063),
+    ("unavailable", 0.0061),
+    ("invoiced", 0.0032),
+    ("processing", 0.0030),
+    ("created", 0.0001),
+]
+
+# Purchases by hour of day (0-23)
+HOUR_WEIGHTS = [
+    2.4,
+    1.2,
+    0.5,
+    0.3,
+    0.2,
+    0.2,
+    0.5,
+    1.2,
+    3.0,
+    4.8,
+    6.2,
+    6.6,
+    6.0,
+    6.5,
+    6.7,
+    6.4,
+    6.8,
+    6.2,
+    5.8,
+    5.9,
+    6.3,
+    6.3,
+    5.8,
+    4.5,
+]
+
+PAYMENT_TYPE_WEIGHTS = [
+    ("credit_card", 0.740),
+    ("boleto", 0.190),
+    ("voucher", 0.055),
+    ("debit_card", 0.015),
+]
+
+# Review score distributions by delivery outcome
+REVIEW_SCORE_WEIGHTS = {
+    "on_time": [(1, 0.070), (2, 0.025), (3, 0.078), (4, 0.205), (5, 0.622)],
+    "late": [(1, 0.460), (2, 0.100), (3, 0.140), (4, 0.120), (5, 0.180)],
+    "not_delivered": [(1, 0.700), (2, 0.080), (3, 0.080), (4, 0.040), (5, 0.100)],
+}
+
+REVIEW_TITLES = ["recomendo", "otimo", "bom", "produto ok", "nao recebi", "pessimo"]
+REVIEW_MESSAGES = [
+    "produto chegou antes do prazo, recomendo",
+    "muito bom, qualidade excelente",
+    "entrega rapida e produto conforme anunciado",
+    "produto bom mas a entrega atrasou",
+    "ainda nao recebi o produto",
+    "veio com defeito, quero devolver",
+]
+
+
+def sql_string(value):
+    """Quote a Python string as a SQL literal."""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def weighted_case(draw, weights):
+    """CASE expression mapping a uniform [0, 1) draw onto weighted values."""
+    total = sum(weight for _, weight in weights)
+    branches = []
+    cumulative = 0.0
+    for value, weight in weights[:-1]:
+        cumulative += weight / total
+        literal = sql_string(value) if isinstance(value, str) else value
+        branches.append(f"WHEN {draw} < {cumulative:.6f} THEN {literal}")
+    last = weights[-1][0]
+    last = sql_string(last) if isinstance(last, str) else last
+    return f"CASE {' '.join(branches)} ELSE {last} END"
+
+
+def create_helpers(con, seed):
+    """Seeded random macros: every draw is a hash of (key, purpose, seed)."""
+    con.execute(
+        f"""
+        CREATE MACRO rnd(k, purpose) AS
+            ((hash(k, purpose, {seed}) >> 11) + 0.5) / 9007199254740992.0
+        """
+    )
+    con.execute(
+        """
+        CREATE MACRO rnorm(k, purpose) AS
+            sqrt(-2 * ln(rnd(k, purpose || '_r')))
+                * cos(2 * pi() * rnd(k, purpose || '_t'))
+        """
+    )
+    con.execute(
+        f"""
+        CREATE MACRO synth_id(kind, k) AS md5(kind || ':' || {seed} || ':' || k)
+        """
+    )
+
+
+def create_reference_tables(con):
+    """States, zip prefixes and categories the generated rows draw from."""
+    total_weight = sum(state[1] for state in STATES)
+    state_rows = []
+    for state, weight, (zip_lo, zip_hi), lat, lng, delivery_days, cities in STATES:
+        zip_count = min(
+            zip_hi - zip_lo + 1,
+            max(30, round(GEO_ZIP_PREFIXES * weight / total_weight)),
+        )
+        city_list = "[" + ", ".join(sql_string(city) for city in cities) + "]"
+        state_rows.append(
+            f"({sql_string(state)}, {zip_lo}, {zip_hi}, {zip_count}, "
+            f"{lat}, {lng}, {delivery_days}, {city_list})"
+        )
+    con.execute(
+        f"""
+        CREATE TABLE states AS
+        SELECT * FROM (VALUES {', '.join(state_rows)}) AS t(
+            state, zip_lo, zip_hi, zip_count, lat, lng, delivery_days, cities
+        )
+        """
+    )
+
+    # Zip prefixes spread evenly over each state's range
+    con.execute(
+        """
+        CREATE TABLE zips AS
+        SELECT
+            state,
+            zip_rank,
+            cast(
+                zip_lo + floor(zip_rank * (zip_hi - zip_lo + 1) / zip_count) AS INTEGER
+            ) AS zip_prefix,
+            cities[1 + zip_rank % len(cities)] AS city,
+            lat + rnorm(zip_lo + zip_rank, 'zip_lat') * 0.6 AS lat,
+            lng + rnorm(zip_lo + zip_rank, 'zip_lng') * 0.6 AS lng,
+            delivery_days
+        FROM (
+            SELECT *, unnest(range(zip_count)) AS zip_rank
+            FROM states
+        )
+        """
+    )
+
+    category_rows = ", ".join(
+        f"({rank}, {sql_string(pt)}, {sql_string(en)})"
+        for rank, (pt, en) in enumerate(CATEGORIES)
+    )
+    con.execute(
+        f"""
+        CREATE TABLE categories AS
+        SELECT * FROM (VALUES {category_rows}) AS t(
+            category_rank, product_category_name, product_category_name_english
+        )
+        """
+    )
+
+
+def state_draw(key_sql, purpose, weights):
+    """Weighted state pick for a row key."""
+    return weighted_case(f"rnd({key_sql}, '{purpose}')", weights)
+
+
+def generate(con, scale):
+    """Build one table per raw source, named synth_<source table>."""
+    n_orders = max(1, round(BASE_ORDERS * scale))
+    n_products = max(1, round(BASE_PRODUCTS * scale))
+    n_sellers = max(1, round(BASE_SELLERS * scale))
+    n_categories = len(CATEGORIES)
+    customer_states = [(state[0], state[1]) for state in STATES]
+    seller_states = list(SELLER_STATE_WEIGHTS.items())
+
+    # Reference data: fixed size at every scale factor
+    con.execute(
+        f"""
+        CREATE TABLE synth_geolocation AS
+        SELECT
+            zip_prefix AS geolocation_zip_code_prefix,
+            lat + rnorm(zip_prefix * 1000 + k, 'geo_lat') * 0.02 AS geolocation_lat,
+            lng + rnorm(zip_prefix * 1000 + k, 'geo_lng') * 0.02 AS geolocation_lng,
+            city AS geolocation_city,
+            state AS geolocation_state
+        FROM (
+            SELECT
+                *,
+                unnest(range(1 + cast(
+                    floor(rnd(zip_prefix, 'geo_rows') * {2 * GEO_ROWS_PER_ZIP - 1})
+                    AS INTEGER
+                ))) AS k
+            FROM zips
+        )
+        ORDER BY geolocation_zip_code_prefix, k
+        """
+    )
+    con.execute(
+        """
+        CREATE TABLE synth_category_translation AS
+        SELECT product_category_name, product_category_name_english
+        FROM categories
+        ORDER BY category_rank
+        """
+    )
+
+    # Sellers: zip prefix from the seller's state
+    con.execute(
+        f"""
+        CREATE TABLE seller_keys AS
+        SELECT
+            i AS seller_index,
+            synth_id('seller', i) AS seller_id,
+            {state_draw('i', 'seller_state', seller_states)} AS state,
+            rnd(i, 'seller_zip') AS zip_draw
+        FROM range({n_sellers}) AS t(i)
+        """
+    )
+    con.execute(
+        """
+        CREATE TABLE synth_sellers AS
+        SELECT
+            k.seller_index,
+            k.seller_id,
+            z.zip_prefix AS seller_zip_code_prefix,
+            z.city AS seller_city,
+            z.state AS seller_state,
+            z.delivery_days AS seller_delivery_days
+        FROM seller_keys AS k
+        INNER JOIN states AS s ON k.state = s.state
+        INNER JOIN zips AS z
+            ON k.state = z.state
+            AND z.zip_rank = cast(floor(k.zip_draw * s.zip_count) AS INTEGER)
+        ORDER BY k.seller_index
+        """
+    )
+
+    # Products: popular categories and sellers get more products (power-law
+    # index draws), lognormal sizes and weights, one list price per product
+    con.execute(
+        f"""
+        CREATE TABLE synth_products AS
+        SELECT
+            i AS product_index,
+            synth_id('product', i) AS product_id,
+            CASE WHEN NOT no_category THEN c.product_category_name END
+                AS product_category_name,
+            CASE WHEN NOT no_category
+                THEN 20 + cast(floor(rnd(i, 'name_length') * 45) AS INTEGER)
+            END AS product_name_lenght,
+            CASE WHEN NOT no_category
+                THEN cast(least(3992, greatest(4,
+                    round(exp(6.5 + 0.7 * rnorm(i, 'description_length')))
+                )) AS INTEGER)
+            END AS product_description_lenght,
+            CASE WHEN NOT no_category
+                THEN 1 + cast(floor(pow(rnd(i, 'photos'), 2.5) * 6) AS INTEGER)
+            END AS product_photos_qty,
+            cast(least(40425, greatest(50,
+                round(exp(6.6 + 1.3 * rnorm(i, 'weight')))
+            )) AS DECIMAL(10, 2)) AS product_weight_g,
+            cast(least(105, greatest(7,
+                round(exp(3.3 + 0.5 * rnorm(i, 'length')))
+            )) AS DECIMAL(10, 2)) AS product_length_cm,
+            cast(least(105, greatest(2,
+                round(exp(2.6 + 0.7 * rnorm(i, 'height')))
+            )) AS DECIMAL(10, 2)) AS product_height_cm,
+            cast(least(118, greatest(6,
+                round(exp(3.0 + 0.45 * rnorm(i, 'width')))
+            )) AS DECIMAL(10, 2)) AS product_width_cm,
+            cast(least(6735, greatest(0.85,
+                round(exp(4.3 + 0.9 * rnorm(i, 'price')), 2)
+            )) AS DECIMAL(10, 2)) AS list_price,
+            cast(floor(pow(rnd(i, 'product_seller'), 2.5) * {n_sellers}) AS BIGINT)
+                AS seller_index
+        FROM (
+            SELECT
+                i,
+                rnd(i, 'no_category') < {NULL_CATEGORY_RATE} AS no_category,
+                cast(floor(pow(rnd(i, 'category'), 3.5) * {n_categories}) AS INTEGER)
+                    AS category_rank
+            FROM range({n_products}) AS t(i)
+        ) AS p
+        INNER JOIN categories AS c ON p.category_rank = c.category_rank
+        ORDER BY i
+        """
+    )
+
+    # Customers: one customer_id per order (as in Olist); a share of orders
+    # reuse an earlier customer_unique_id, whose location stays the same
+    con.execute(
+        f"""
+        CREATE TABLE customer_keys AS
+        SELECT
+            i AS order_index,
+            person,
+            {state_draw('person', 'customer_state', customer_states)} AS state,
+            rnd(person, 'customer_zip') AS zip_draw
+        FROM (
+            SELECT
+                i,
+                CASE
+                    WHEN i > 0 AND rnd(i, 'repeat') < {REPEAT_CUSTOMER_RATE}
+                        THEN cast(floor(rnd(i, 'repeat_of') * i) AS BIGINT)
+                    ELSE i
+                END AS person
+            FROM range({n_orders}) AS t(i)
+        )
+        """
+    )
+    con.execute(
+        """
+        CREATE TABLE synth_customers AS
+        SELECT
+            k.order_index,
+            synth_id('customer', k.order_index) AS customer_id,
+            synth_id('person', k.person) AS customer_unique_id,
+            z.zip_prefix AS customer_zip_code_prefix,
+            z.city AS customer_city,
+            z.state AS customer_state,
+            z.delivery_days
+        FROM customer_keys AS k
+        INNER JOIN states AS s ON k.state = s.state
+        INNER JOIN zips AS z
+            ON k.state = z.state
+            AND z.zip_rank = cast(floor(k.zip_draw * s.zip_count) AS INTEGER)
+        ORDER BY k.order_index
+        """
+    )
+
+    # Orders: volume grows linearly over the window (sqrt of the order
+    # index), daytime hours, delivery time from the customer's state
+    hour = weighted_case("rnd(i, 'hour')", [(h, w) for h, w in enumerate(HOUR_WEIGHTS)])
+    status = weighted_case("rnd(i, 'status')", ORDER_STATUS_WEIGHTS)
+    con.execute(
+        f"""
+        CREATE TABLE order_base AS
+        SELECT
+            i AS order_index,
+            {status} AS order_status,
+            DATE '{ORDER_START_DATE}'
+                + cast(floor(sqrt((i + rnd(i, 'day')) / {n_orders}) * {ORDER_DAYS})
+                    AS INTEGER)
+                + to_hours(cast({hour} AS BIGINT))
+                + to_seconds(cast(floor(rnd(i, 'second') * 3600) AS BIGINT))
+                AS order_purchase_timestamp,
+            pow(rnd(i, 'approval'), 6) * 60 AS hours_to_approval,
+            0.5 + pow(rnd(i, 'carrier'), 2) * 6 AS days_to_carrier,
+            greatest(1.0, c.delivery_days * exp(0.45 * rnorm(i, 'delivery')))
+                AS days_to_delivery,
+            c.delivery_days + 10 + cast(floor(rnd(i, 'estimate') * 8) AS INTEGER)
+                AS estimated_days
+        FROM range({n_orders}) AS t(i)
+        INNER JOIN synth_customers AS c ON t.i = c.order_index
+        """
+    )
+    con.execute(
+        """
+        CREATE TABLE synth_orders AS
+        SELECT
+            o.order_index,
+            synth_id('order', o.order_index) AS order_id,
+            c.customer_id,
+            o.order_status,
+            o.order_purchase_timestamp,
+            CASE
+                WHEN o.order_status = 'created' THEN null
+                WHEN o.order_status = 'canceled'
+                    AND rnd(o.order_index, 'approved') < 0.5 THEN null
+                ELSE date_trunc('second', o.order_purchase_timestamp
+                    + to_seconds(cast(o.hours_to_approval * 3600 AS BIGINT)))
+            END AS order_approved_at,
+            CASE WHEN o.order_status IN ('delivered', 'shipped')
+                THEN date_trunc('second', o.order_purchase_timestamp
+                    + to_seconds(cast(
+                        (o.hours_to_approval / 24 + o.days_to_carrier) * 86400 AS BIGINT
+                    )))
+            END AS order_delivered_carrier_date,
+            CASE WHEN o.order_status = 'delivered'
+                THEN date_trunc('second', o.order_purchase_timestamp
+                    + to_seconds(cast(
+                        greatest(
+                            o.days_to_delivery,
+                            o.hours_to_approval / 24 + o.days_to_carrier + 0.5
+                        ) * 86400 AS BIGINT
+                    )))
+            END AS order_delivered_customer_date,
+            cast(
+                date_trunc('day', o.order_purchase_timestamp)
+                    + to_days(o.estimated_days)
+                AS TIMESTAMP
+            ) AS order_estimated_delivery_date
+        FROM order_base AS o
+        INNER JOIN synth_customers AS c ON o.order_index = c.order_index
+        ORDER BY o.order_index
+        """
+    )
+
+    # Order items: 1 item for ~90% of orders, up to 6; unavailable orders
+    # have none. Repeated items in an order are often the same product.
+    con.execute(
+        f"""
+        CREATE TABLE synth_order_items AS
+        WITH item_keys AS (
+            SELECT
+                o.order_index,
+                o.order_id,
+                o.order_purchase_timestamp,
+                c.delivery_days,
+                unnest(range(1, 1 + CASE
+                    WHEN o.order_status = 'unavailable' THEN 0
+                    WHEN rnd(o.order_index, 'multi_item') < 0.10
+                        THEN 2 + cast(floor(pow(rnd(o.order_index, 'items'), 3) * 5)
+                            AS INTEGER)
+                    ELSE 1
+                END)) AS order_item_id
+            FROM synth_orders AS o
+            INNER JOIN synth_customers AS c ON o.order_index = c.order_index
+        ),
+
+        item_products AS (
+            SELECT
+                *,
+                CASE
+                    WHEN order_item_id > 1
+                        AND rnd(order_index * 8 + order_item_id, 'same_product') < 0.5
+                        THEN order_index * 8 + 1
+                    ELSE order_index * 8 + order_item_id
+                END AS product_key
+            FROM item_keys
+        )
+
+        SELECT
+            i.order_index,
+            i.order_id,
+            i.order_item_id,
+            p.product_id,
+            s.seller_id,
+            date_trunc('second', i.order_purchase_timestamp
+                + to_days(6)
+                + to_seconds(cast(floor(rnd(i.product_key, 'limit') * 86400) AS BIGINT))
+            ) AS shipping_limit_date,
+            p.list_price AS price,
+            cast(greatest(0, round(
+                8 + p.product_weight_g / 1000 * 1.8
+                + (i.delivery_days + s.seller_delivery_days) * 0.3
+                + 3 * rnorm(i.order_index * 8 + i.order_item_id, 'freight'),
+                2
+            )) AS DECIMAL(10, 2)) AS freight_value
+        FROM item_products AS i
+        INNER JOIN synth_products AS p
+            ON p.product_index = cast(
+                floor(pow(rnd(i.product_key, 'product'), 3) * {n_products}) AS BIGINT
+            )
+        INNER JOIN synth_sellers AS s ON p.seller_index = s.seller_index
+        ORDER BY i.order_index, i.order_item_id
+        """
+    )
+
+    # Payments add up to the order value; ~3% of orders also use vouchers
+    payment_type = weighted_case(
+        "rnd(o.order_index, 'payment_type')", PAYMENT_TYPE_WEIGHTS
+    )
+    con.execute(
+        f"""
+        CREATE TABLE synth_payments AS
+        WITH order_values AS (
+            SELECT
+                o.order_index,
+                o.order_id,
+                coalesce(
+                    v.order_value,
+                    cast(round(exp(4.6 + 0.8 * rnorm(o.order_index, 'value')), 2)
+                        AS DECIMAL(12, 2))
+                ) AS order_value,
+                {payment_type} AS payment_type,
+                CASE
+                    WHEN rnd(o.order_index, 'voucher_split') < 0.03
+                        THEN 1 + cast(floor(pow(rnd(o.order_index, 'vouchers'), 3) * 4)
+                            AS INTEGER)
+                    ELSE 0
+                END AS extra_vouchers
+            FROM synth_orders AS o
+            LEFT JOIN (
+                SELECT order_index, cast(sum(price + freight_value) AS DECIMAL(12, 2))
+                    AS order_value
+                FROM synth_order_items
+                GROUP BY order_index
+            ) AS v ON o.order_index = v.order_index
+        ),
+
+        payment_rows AS (
+            SELECT
+                *,
+                cast(round(order_value * 0.4 / greatest(extra_vouchers, 1), 2)
+                    AS DECIMAL(12, 2)) AS voucher_value,
+                unnest(range(1, 2 + extra_vouchers)) AS payment_sequential
+            FROM order_values
+        )
+
+        SELECT
+            order_index,
+            order_id,
+            payment_sequential,
+            CASE WHEN payment_sequential = 1 THEN payment_type ELSE 'voucher' END
+                AS payment_type,
+            CASE
+                WHEN payment_sequential > 1 OR payment_type != 'credit_card' THEN 1
+                WHEN rnd(order_index, 'installments') < 0.5 THEN 1
+                ELSE 2 + cast(floor(rnd(order_index, 'installment_n') * 9) AS INTEGER)
+            END AS payment_installments,
+            cast(CASE
+                WHEN payment_sequential > 1 THEN voucher_value
+                ELSE order_value - voucher_value * extra_vouchers
+            END AS DECIMAL(10, 2)) AS payment_value
+        FROM payment_rows
+        ORDER BY order_index, payment_sequential
+        """
+    )
+
+    # Reviews: nearly every order has one; late or undelivered orders score
+    # lower and are more likely to carry a comment
+    score_draw = "rnd(order_index, 'score')"
+    on_time = weighted_case(score_draw, REVIEW_SCORE_WEIGHTS["on_time"])
+    late = weighted_case(score_draw, REVIEW_SCORE_WEIGHTS["late"])
+    not_delivered = weighted_case(score_draw, REVIEW_SCORE_WEIGHTS["not_delivered"])
+    titles = "[" + ", ".join(sql_string(t) for t in REVIEW_TITLES) + "]"
+    messages = "[" + ", ".join(sql_string(m) for m in REVIEW_MESSAGES) + "]"
+    con.execute(
+        f"""
+        CREATE TABLE synth_reviews AS
+        WITH scored AS (
+            SELECT
+                order_index,
+                order_id,
+                CASE
+                    WHEN order_delivered_customer_date IS null THEN {not_delivered}
+                    WHEN order_delivered_customer_date > order_estimated_delivery_date
+                        THEN {late}
+                    ELSE {on_time}
+                END AS review_score,
+                cast(date_trunc('day', coalesce(
+                    order_delivered_customer_date, order_estimated_delivery_date
+                )) AS TIMESTAMP) + to_days(1) AS review_creation_date
+            FROM synth_orders
+            WHERE rnd(order_index, 'has_review') < 0.9978
+        )
+
+        SELECT
+            order_index,
+            synth_id('review', order_index) AS review_id,
+            order_id,
+            review_score,
+            CASE WHEN rnd(order_index, 'has_title') < 0.12
+                THEN {titles}[
+                    1 + cast(floor((5 - review_score) / 4.0 * 5.99) AS INTEGER)
+                ]
+            END AS review_comment_title,
+            CASE WHEN rnd(order_index, 'has_message') < 0.30 + (5 - review_score) * 0.12
+                THEN {messages}[
+                    1 + cast(floor((5 - review_score) / 4.0 * 5.99) AS INTEGER)
+                ]
+            END AS review_comment_message,
+            review_creation_date,
+            date_trunc('second', review_creation_date
+                + to_seconds(cast(
+                    floor(pow(rnd(order_index, 'answer'), 2) * 5 * 86400) + 3600
+                    AS BIGINT
+                ))
+            ) AS review_answer_timestamp
+        FROM scored
+        ORDER BY order_index
+        """
+    )
+
+
+# Referential checks run on the generated tables before anything is written
+INTEGRITY_CHECKS = {
+    "order items without an order": """
+        SELECT count(*) FROM synth_order_items AS i
+        ANTI JOIN synth_orders AS o ON i.order_id = o.order_id
+    """,
+    "order items without a product": """
+        SELECT count(*) FROM synth_order_items AS i
+        ANTI JOIN synth_products AS p ON i.product_id = p.product_id
+    """,
+    "order items without a seller": """
+        SELECT count(*) FROM synth_order_items AS i
+        ANTI JOIN synth_sellers AS s ON i.seller_id = s.seller_id
+    """,
+    "orders without a customer": """
+        SELECT count(*) FROM synth_orders AS o
+        ANTI JOIN synth_customers AS c ON o.customer_id = c.customer_id
+    """,
+    "payments not matching the order value": """
+        SELECT count(*) FROM (
+            SELECT p.order_id, sum(p.payment_value) AS paid, any_value(v.value) AS value
+            FROM synth_payments AS p
+            INNER JOIN (
+                SELECT order_id, sum(price + freight_value) AS value
+                FROM synth_order_items
+                GROUP BY order_id
+            ) AS v ON p.order_id = v.order_id
+            GROUP BY p.order_id
+        )
+        WHERE paid != value
+    """,
+    "customer zip prefixes missing from geolocation": """
+        SELECT count(*) FROM synth_customers AS c
+        ANTI JOIN synth_geolocation AS g
+            ON c.customer_zip_code_prefix = g.geolocation_zip_code_prefix
+    """,
+    "seller zip prefixes missing from geolocation": """
+        SELECT count(*) FROM synth_sellers AS s
+        ANTI JOIN synth_geolocation AS g
+            ON s.seller_zip_code_prefix = g.geolocation_zip_code_prefix
+    """,
+    "deliveries before purchase": """
+        SELECT count(*) FROM synth_orders
+        WHERE order_delivered_customer_date < order_purchase_timestamp
+    """,
+}
+
+
+def check_integrity(con):
+    """Return the names of the failed integrity checks."""
+    failed = []
+    for name, sql in INTEGRITY_CHECKS.items():
+        violations = con.execute(sql).fetchone()[0]
+        if violations:
+            failed.append(f"{name} ({violations:,})")
+    return failed
+
+
+def write_csv(con, name, table, output_dir):
+    """Write synth_<name> as the source CSV, in the registry's column order."""
+    csv_path = output_dir / table["csv_file"]
+    columns = ", ".join(table["columns"])
+    con.execute(
+        f"""
+        COPY (SELECT {columns} FROM synth_{name})
+        TO '{csv_path}' (
+            FORMAT csv,
+            HEADER true,
+            TIMESTAMPFORMAT '{TIMESTAMP_FORMAT}'
+        )
+        """
+    )
+    return con.execute(f"SELECT count(*) FROM synth_{name}").fetchone()[0]
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic Olist source CSVs at a scale factor"
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="Scale factor relative to the Kaggle dataset (default: 1)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed; the same seed and scale give the same files (default: 42)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        help="Directory for the CSV files (default: synthetic/sf<scale>)",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        default=None,
+        help="DuckDB memory limit for large scale factors (e.g. 8GB)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Main function to generate the synthetic source files."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("SYNTHETIC DATA - Generating Olist source CSVs")
+    print("=" * 80)
+
+    if args.scale <= 0:
+        print("❌ --scale must be positive")
+        sys.exit(1)
+
+    output_dir = args.output_dir or SYNTHETIC_DIR / f"sf{args.scale:g}"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    tables = load_source_tables()
+
+    n_orders = round(BASE_ORDERS * args.scale)
+    print(f"\nScale factor: {args.scale:g}x (~{n_orders:,} orders)")
+    print(f"Seed:         {args.seed}")
+    print(f"Output:       {output_dir}\n")
+
+    con = duckdb.connect()
+    try:
+        # Large scale factors spill to disk next to the output
+        con.execute(f"SET temp_directory = '{output_dir / '.duckdb_tmp'}'")
+        if args.memory_limit:
+            con.execute(f"SET memory_limit = '{args.memory_limit}'")
+
+        start = time.perf_counter()
+        create_helpers(con, args.seed)
+        create_reference_tables(con)
+        generate(con, args.scale)
+        print(f"✓ Generated tables in {time.perf_counter() - start:.2f}s")
+
+        failed = check_integrity(con)
+        if failed:
+            for check in failed:
+                print(f"❌ Integrity check failed: {check}")
+            sys.exit(1)
+        print(f"✓ {len(INTEGRITY_CHECKS)} integrity checks passed\n")
+
+        missing = {f"synth_{name}" for name in tables} - {
+            row[0] for row in con.execute("SHOW TABLES").fetchall()
+        }
+        if missing:
+            print(f"❌ No generator for: {', '.join(sorted(missing))}")
+            sys.exit(1)
+
+        for name, table in tables.items():
+            start = time.perf_counter()
+            row_count = write_csv(con, name, table, output_dir)
+            elapsed = time.perf_counter() - start
+            print(f"✓ {table['csv_file']:42} {row_count:>12,} rows in {elapsed:.2f}s")
+    finally:
+        con.close()
+
+    print("\n" + "=" * 80)
+    print(f"✅ SUCCESS - {len(tables)} source files written to {output_dir}")
+    print("=" * 80)
+    print("\nNext steps:")
+    print(
+        f"  python scripts/convert_sources_to_parquet.py --csv-dir {output_dir} "
+        f"--parquet-dir {output_dir / 'parquet'}"
+    )
+    print(f"  dbt build --vars '{{parquet_source_path: {output_dir / 'parquet'}}}'")
+
+
+if __name__ == "__main__":
+    main()
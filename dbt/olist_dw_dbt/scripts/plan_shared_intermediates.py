@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Pick the intermediate models worth materializing for one dbt invocation.
+
+Intermediate models are ephemeral, so every model that refs one inlines its
+joins (and re-reads the staging views it depends on). This script lists the
+models a dbt command would select, counts how many selected models depend on
+each ephemeral intermediate (fan-out, from the manifest child_map), and prints
+a --vars payload listing the intermediates with fan-out >= --min-children.
+
+Those models are then built once as tables via intermediate_materialization()
+and dropped again by the drop_shared_intermediates() on-run-end hook.
+
+An intermediate is only promoted when it is itself selected: otherwise its
+consumers would ref a table that this invocation never builds.
+
+A --vars payload among the dbt arguments is merged into the output, since
+dbt keeps only the last --vars flag. An explicit shared_intermediates in it
+takes precedence over the planned list.
+
+Usage:
+    python scripts/plan_shared_intermediates.py
+    python scripts/plan_shared_intermediates.py --select fct_orders+ dim_customers
+    dbt run --vars "$(python scripts/plan_shared_intermediates.py)"
+    python scripts/plan_shared_intermediates.py --vars '{start_date: 2018-01-01}'
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import yaml
+
+# Paths
+DBT_PROJECT_DIR = Path(__file__).parent.parent
+MANIFEST_PATH = DBT_PROJECT_DIR / "target" / "manifest.json"
+
+# Selection flags forwarded to dbt ls; everything else is ignored
+SELECTION_FLAGS = ("--select", "-s", "--models", "-m", "--exclude", "--selector")
+
+
+def list_selected_models(selection_args):
+    """Run dbt ls with the given selection and return the selected unique_ids."""
+    command = [
+        "dbt",
+        "--quiet",
+        "ls",
+        "--resource-type",
+        "model",
+        "--output",
+        "json",
+        "--output-keys",
+        "unique_id",
+        *selection_args,
+    ]
+    result = subprocess.run(
+        command, cwd=DBT_PROJECT_DIR, capture_output=True, text=True, check=True
+    )
+
+    selected = set()
+    for line in result.stdout.splitlines():
+        line = line.strip()
+        if line.startswith("{"):
+            selected.add(json.loads(line)["unique_id"])
+    return selected
+
+
+def find_shared_intermediates(manifest, selected, min_children):
+    """
+    Return {model_name: fan_out} for selected ephemeral intermediates with at
+    least min_children selected model consumers.
+    """
+    shared = {}
+    for unique_id, children in manifest.get("child_map", {}).items():
+        node = manifest["nodes"].get(unique_id)
+        if not node or node["resource_type"] != "model" or unique_id not in selected:
+            continue
+        if "intermediate" not in node["fqn"]:
+            continue
+
+        fan_out = sum(
+            1 for child in children if child in selected and child.startswith("model.")
+        )
+        if fan_out >= min_children:
+            shared[node["name"]] = fan_out
+    return shared
+
+
+def parse_args():
+    """Parse command line arguments (unknown dbt flags are ignored)."""
+    parser = argparse.ArgumentParser(
+        description="Choose ephemeral intermediates to materialize for one dbt run"
+    )
+    parser.add_argument(
+        "--min-children",
+        type=int,
+        default=2,
+        help="Minimum number of selected consumers before materializing (default: 2)",
+    )
+    args, dbt_args = parser.parse_known_args()
+
+    # Keep the selection flags (and their values) and the caller's --vars
+    selection_args = []
+    vars_payloads = []
+    forward = False
+    in_vars = False
+    for arg in dbt_args:
+        if arg.startswith("-"):
+            flag, _, value = arg.partition("=")
+            forward = flag in SELECTION_FLAGS
+            in_vars = flag == "--vars" and not value
+            if flag == "--vars" and value:
+                vars_payloads.append(value)
+        elif in_vars:
+            vars_payloads.append(arg)
+            in_vars = False
+        if forward:
+            selection_args.append(arg)
+    return args, selection_args, vars_payloads
+
+
+def merge_vars(vars_payloads):
+    """Parse the caller's --vars payloads (YAML or JSON) into one dict."""
+    merged = {}
+    for payload in vars_payloads:
+        parsed = yaml.safe_load(payload) or {}
+        if not isinstance(parsed, dict):
+            raise ValueError(f"--vars must be a mapping, got {payload!r}")
+        merged.update(parsed)
+    return merged
+
+
+def main():
+    """Print a --vars payload listing the shared intermediates."""
+    args, selection_args, vars_payloads = parse_args()
+
+    try:
+        caller_vars = merge_vars(vars_payloads)
+    except (yaml.YAMLError, ValueError) as e:
+        print(f"❌ Invalid --vars: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        # dbt ls also rewrites target/manifest.json for the current project state
+        selected = list_selected_models(selection_args)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"❌ dbt ls failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with open(MANIFEST_PATH, "r") as f:
+        manifest = json.load(f)
+
+    shared = find_shared_intermediates(manifest, selected, args.min_children)
+    for name, fan_out in sorted(shared.items()):
+        print(f"✓ {name} -> table ({fan_out} consumers)", file=sys.stderr)
+
+    if "shared_intermediates" in caller_vars:
+        print("✓ shared_intermediates set by --vars, plan ignored", file=sys.stderr)
+
+    payload = {"shared_intermediates": sorted(shared), **caller_vars}
+    print(json.dumps(payload, default=str))
+
+
+if __name__ == "__main__":
+    main()
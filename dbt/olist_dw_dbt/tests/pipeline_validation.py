@@ -34,7 +34,7 @@ def validate_pipeline():
     # LAYER 1: STAGING
     # ========================================================================
     print("\n📊 DATA PIPELINE LAYERS:\n")
-    print_section("Layer 1: STAGING (Views - Direct CSV reads)")
+    print_section("Layer 1: STAGING (Views - Parquet landing zone reads)")
 
     staging_tables = con.execute("""
         SELECT table_name
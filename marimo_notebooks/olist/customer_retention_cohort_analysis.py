@@ -7,16 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
-    import pandas as pd
+    import polars as pl
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    import numpy as np
-    return Path, duckdb, go, load_dotenv, make_subplots, mo, np, os, pd, px
+    return Path, go, make_subplots, mo, pl, px
 
 
 @app.cell
@@ -32,7 +28,7 @@ def _(mo):
     - Q72: Customer cohort retention analysis (monthly cohorts)
     - Q75: First-time buyer behaviors vs repeat customers
 
-    **Data Source:** dim_customers & fct_orders
+    **Data Source:** dim_customers, fct_orders & mart_cohort_retention
 
     **Dataset Period:** 2016-2018
     """)
@@ -40,18 +36,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
-
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
+
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -91,7 +85,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Calculate retention KPIs
-    retention_kpi_query = f"""
+    retention_kpi_query = """
     WITH customer_orders AS (
         SELECT
             customer_id,
@@ -99,7 +93,7 @@ def _(con, date_range):
             MIN(order_date) as first_order_date,
             MAX(order_date) as last_order_date
         FROM core_core.fct_orders
-        WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        WHERE order_date BETWEEN ? AND ?
         AND is_delivered = TRUE
         GROUP BY customer_id
     )
@@ -113,7 +107,7 @@ def _(con, date_range):
     FROM customer_orders
     """
 
-    retention_kpis = con.execute(retention_kpi_query).df()
+    retention_kpis = con.execute(retention_kpi_query, [date_range.value[0], date_range.value[1]]).df()
     return (retention_kpis,)
 
 
@@ -172,7 +166,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Customer segmentation analysis
-    segment_query = f"""
+    segment_query = """
     WITH customer_orders AS (
         SELECT
             customer_id,
@@ -182,7 +176,7 @@ def _(con, date_range):
             MIN(order_date) as first_order_date,
             MAX(order_date) as last_order_date
         FROM core_core.fct_orders
-        WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        WHERE order_date BETWEEN ? AND ?
         AND is_delivered = TRUE
         GROUP BY customer_id
     )
@@ -210,7 +204,7 @@ def _(con, date_range):
         END
     """
 
-    segments = con.execute(segment_query).df()
+    segments = con.execute(segment_query, [date_range.value[0], date_range.value[1]]).df()
 
     # Calculate percentages
     segments['customer_pct'] = segments['customer_count'] / segments['customer_count'].sum() * 100
@@ -297,7 +291,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Time between first and second purchase
-    time_to_second_query = f"""
+    time_to_second_query = """
     WITH customer_orders AS (
         SELECT
             customer_id,
@@ -319,28 +313,37 @@ def _(con, date_range):
     SELECT
         DATE_DIFF('day', first_order_date, second_order_date) as days_to_second_purchase
     FROM first_second_orders
-    WHERE first_order_date >= '{date_range.value[0]}'
-    AND second_order_date <= '{date_range.value[1]}'
+    WHERE first_order_date >= ?
+    AND second_order_date <= ?
     """
 
-    time_to_second = con.execute(time_to_second_query).df()
+    # One row per repeat customer: kept as a Polars frame (no pandas copy)
+    time_to_second = con.query(time_to_second_query, [date_range.value[0], date_range.value[1]])
     return (time_to_second,)
 
 
 @app.cell
-def _(np, pd, time_to_second):
-    # Calculate statistics
+def _(pl, time_to_second):
+    # Calculate statistics (Polars returns None on an empty range; show nan as pandas did)
     avg_days = time_to_second['days_to_second_purchase'].mean()
     median_days = time_to_second['days_to_second_purchase'].median()
-
-    # Create bins for distribution
-    time_to_second['days_bucket'] = pd.cut(
-        time_to_second['days_to_second_purchase'],
-        bins=[0, 30, 60, 90, 120, 180, 365, np.inf],
-        labels=['0-30 days', '31-60 days', '61-90 days', '91-120 days', '121-180 days', '181-365 days', '365+ days']
+    avg_days = float('nan') if avg_days is None else avg_days
+    median_days = float('nan') if median_days is None else median_days
+
+    # Bucket in Polars (right-closed bins); only the bucket counts become pandas
+    days = pl.col('days_to_second_purchase')
+    bucket_edges = [30, 60, 90, 120, 180, 365]
+    bucket_labels = ['0-30 days', '31-60 days', '61-90 days', '91-120 days', '121-180 days', '181-365 days', '365+ days']
+
+    time_distribution = (
+        time_to_second
+        .filter(days > 0)
+        .group_by(sum((days > edge).cast(pl.Int32) for edge in bucket_edges).alias('bucket'))
+        .agg(days.count().alias('customer_count'))
+        .sort('bucket')
+        .to_pandas()
     )
-
-    time_distribution = time_to_second.groupby('days_bucket', observed=True).size().reset_index(name='customer_count')
+    time_distribution.insert(0, 'days_bucket', [bucket_labels[i] for i in time_distribution.pop('bucket')])
     return avg_days, median_days, time_distribution
 
 
@@ -387,54 +390,32 @@ def _(mo):
 
 @app.cell
 def _(con, date_range):
-    # Cohort retention analysis
-    cohort_query = f"""
-    WITH customer_cohorts AS (
-        SELECT
-            customer_id,
-            DATE_TRUNC('month', MIN(order_date)) as cohort_month,
-            MIN(order_date) as first_order_date
-        FROM core_core.fct_orders
-        WHERE is_delivered = TRUE
-        GROUP BY customer_id
-    ),
-    customer_activities AS (
-        SELECT
-            f.customer_id,
-            c.cohort_month,
-            DATE_TRUNC('month', f.order_date) as activity_month,
-            DATE_DIFF('month', c.cohort_month, DATE_TRUNC('month', f.order_date)) as months_since_first
-        FROM core_core.fct_orders f
-        JOIN customer_cohorts c ON f.customer_id = c.customer_id
-        WHERE f.is_delivered = TRUE
-        AND f.order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
-    )
+    # Cohort retention analysis (sliced from the precomputed cohort matrix, at month grain)
+    cohort_query = """
     SELECT
         cohort_month,
         months_since_first,
-        COUNT(DISTINCT customer_id) as active_customers
-    FROM customer_activities
-    WHERE cohort_month >= '{date_range.value[0]}'
-    GROUP BY cohort_month, months_since_first
+        cohort_size,
+        active_customers,
+        retention_rate
+    FROM core_mart.mart_cohort_retention
+    WHERE cohort_month >= ?
+    AND activity_month <= ?
     ORDER BY cohort_month, months_since_first
     """
 
-    cohort_data = con.execute(cohort_query).df()
+    cohort_data = con.execute(cohort_query, [date_range.value[0], date_range.value[1]]).df()
     return (cohort_data,)
 
 
 @app.cell
 def _(cohort_data):
-    # Create cohort retention matrix
-    cohort_pivot = cohort_data.pivot(
+    # Create cohort retention matrix (retention percentages come from the mart)
+    cohort_retention = cohort_data.pivot(
         index='cohort_month',
         columns='months_since_first',
-        values='active_customers'
+        values='retention_rate'
     ).fillna(0)
-
-    # Calculate retention percentages
-    cohort_sizes = cohort_pivot[0]
-    cohort_retention = cohort_pivot.divide(cohort_sizes, axis=0) * 100
     return (cohort_retention,)
 
 
@@ -499,13 +480,13 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Monthly churn analysis
-    churn_query = f"""
+    churn_query = """
     WITH monthly_active_customers AS (
         SELECT
             DATE_TRUNC('month', order_date) as activity_month,
             customer_id
         FROM core_core.fct_orders
-        WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        WHERE order_date BETWEEN ? AND ?
         AND is_delivered = TRUE
         GROUP BY DATE_TRUNC('month', order_date), customer_id
     ),
@@ -531,7 +512,7 @@ def _(con, date_range):
     WHERE prev_active_customers IS NOT NULL
     """
 
-    churn_data = con.execute(churn_query).df()
+    churn_data = con.execute(churn_query, [date_range.value[0], date_range.value[1]]).df()
     return (churn_data,)
 
 
@@ -598,7 +579,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Compare review writers vs non-writers
-    review_comparison_query = f"""
+    review_comparison_query = """
     WITH customer_review_behavior AS (
         SELECT
             customer_id,
@@ -609,7 +590,7 @@ def _(con, date_range):
             MIN(order_date) as first_order_date,
             MAX(order_date) as last_order_date
         FROM core_core.fct_orders
-        WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        WHERE order_date BETWEEN ? AND ?
         AND is_delivered = TRUE
         GROUP BY customer_id
     )
@@ -628,7 +609,7 @@ def _(con, date_range):
     GROUP BY customer_type
     """
 
-    review_comparison = con.execute(review_comparison_query).df()
+    review_comparison = con.execute(review_comparison_query, [date_range.value[0], date_range.value[1]]).df()
     return (review_comparison,)
 
 
@@ -7,15 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    return Path, duckdb, go, load_dotenv, make_subplots, mo, os, pd, px
+    return Path, go, make_subplots, mo, pd, px
 
 
 @app.cell
@@ -46,18 +43,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
 
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -116,14 +111,19 @@ def _(mo):
 
 @app.cell
 def _(con, lifecycle_filter, segment_filter):
-    # Build filter conditions
+    # Build filter conditions (values are bound as parameters)
     filters = []
+    filter_params = []
     if segment_filter.value != 'All Segments':
-        filters.append(f"rfm_segment = '{segment_filter.value}'")
+        filters.append("rfm_segment = ?")
+        filter_params.append(segment_filter.value)
     if lifecycle_filter.value != 'All':
-        filters.append(f"lifecycle_stage = '{lifecycle_filter.value}'")
+        filters.append("lifecycle_stage = ?")
+        filter_params.append(lifecycle_filter.value)
 
     where_clause = "WHERE " + " AND ".join(filters) if filters else ""
+    # Per-segment queries also drop customers without a segment
+    segment_where_clause = "WHERE " + " AND ".join(filters + ["rfm_segment IS NOT NULL"])
 
     # Calculate customer KPIs
     customer_kpis = con.execute(f"""
@@ -136,10 +136,17 @@ def _(con, lifecycle_filter, segment_filter):
             AVG(avg_review_score) as avg_satisfaction
         FROM marts_customer.mart_customer_analytics
         {where_clause}
-    """).df()
+    """, filter_params).df()
 
     kpi_data = customer_kpis.iloc[0]
-    return customer_kpis, filters, kpi_data, where_clause
+    return (
+        customer_kpis,
+        filter_params,
+        filters,
+        kpi_data,
+        segment_where_clause,
+        where_clause,
+    )
 
 
 @app.cell
@@ -250,7 +257,7 @@ def _(mo):
 
 
 @app.cell
-def _(con, where_clause):
+def _(con, filter_params, where_clause):
     rfm_score_dist = con.execute(f"""
         SELECT
             recency_score,
@@ -261,12 +268,12 @@ def _(con, where_clause):
         {where_clause}
         GROUP BY recency_score, frequency_score, monetary_score
         ORDER BY recency_score, frequency_score, monetary_score
-    """).df()
+    """, filter_params).df()
     return (rfm_score_dist,)
 
 
 @app.cell
-def _(con, where_clause):
+def _(con, filter_params, segment_where_clause):
     # Get score averages by segment
     score_by_segment = con.execute(f"""
         SELECT
@@ -275,11 +282,10 @@ def _(con, where_clause):
             AVG(frequency_score) as avg_f,
             AVG(monetary_score) as avg_m
         FROM marts_customer.mart_customer_analytics
-        {where_clause}
-        AND rfm_segment IS NOT NULL
+        {segment_where_clause}
         GROUP BY rfm_segment
         ORDER BY (avg_r + avg_f + avg_m) DESC
-    """).df()
+    """, filter_params).df()
     return (score_by_segment,)
 
 
@@ -499,7 +505,7 @@ def _(mo):
 
 
 @app.cell
-def _(con, where_clause):
+def _(con, filter_params, segment_where_clause):
     segment_characteristics = con.execute(f"""
         SELECT
             rfm_segment,
@@ -514,11 +520,10 @@ def _(con, where_clause):
             AVG(on_time_delivery_rate) as avg_on_time_rate,
             SUM(lifetime_value) / SUM(SUM(lifetime_value)) OVER () * 100 as ltv_contribution_pct
         FROM marts_customer.mart_customer_analytics
-        {where_clause}
-        AND rfm_segment IS NOT NULL
+        {segment_where_clause}
         GROUP BY rfm_segment
         ORDER BY ltv_contribution_pct DESC
-    """).df()
+    """, filter_params).df()
 
     segment_characteristics
     return (segment_characteristics,)
@@ -649,7 +654,7 @@ def _(mo):
 
 
 @app.cell
-def _(con, where_clause):
+def _(con, filter_params, segment_where_clause):
     behavior_patterns = con.execute(f"""
         SELECT
             rfm_segment,
@@ -659,11 +664,10 @@ def _(con, where_clause):
             AVG(orders_with_comments) / NULLIF(AVG(total_orders), 0) * 100 as comment_rate,
             AVG(unique_categories_purchased) as avg_categories
         FROM marts_customer.mart_customer_analytics
-        {where_clause}
-        AND rfm_segment IS NOT NULL
+        {segment_where_clause}
         GROUP BY rfm_segment
         ORDER BY avg_repurchase_cycle
-    """).df()
+    """, filter_params).df()
     return (behavior_patterns,)
 
 
@@ -7,16 +7,13 @@ app = marimo.App(width="medium")
 @app.cell
 def __():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
     import numpy as np
-    return mo, duckdb, pd, px, go, make_subplots, os, Path, load_dotenv, np
+    return mo, pd, px, go, make_subplots, Path, np
 
 
 @app.cell
@@ -38,20 +35,17 @@ def __(mo):
 
 
 @app.cell
-def __(duckdb, load_dotenv, os, Path):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
+def __(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
 
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
-
-    return con, db_path, db_name, env_path
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
+    return (con,)
 
 
 @app.cell
@@ -90,7 +84,7 @@ def __(mo):
 @app.cell
 def __(con, date_range):
     # Overall satisfaction metrics
-    satisfaction_kpi_query = f"""
+    satisfaction_kpi_query = """
     SELECT
         COUNT(*) as total_orders_with_reviews,
         AVG(review_score) as avg_review_score,
@@ -107,12 +101,12 @@ def __(con, date_range):
         SUM(CASE WHEN review_score = 2 THEN 1 ELSE 0 END) as two_star,
         SUM(CASE WHEN review_score = 1 THEN 1 ELSE 0 END) as one_star
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND review_score IS NOT NULL
     """
 
-    satisfaction_kpis = con.execute(satisfaction_kpi_query).df()
+    satisfaction_kpis = con.execute(satisfaction_kpi_query, [date_range.value[0], date_range.value[1]]).df()
 
     # Calculate NPS
     nps_score = satisfaction_kpis['promoters_pct'].iloc[0] - satisfaction_kpis['detractors_pct'].iloc[0]
@@ -206,7 +200,7 @@ def __(px, review_dist_data):
 @app.cell
 def __(con, date_range):
     # Satisfaction trend over time
-    satisfaction_trend_query = f"""
+    satisfaction_trend_query = """
     SELECT
         DATE_TRUNC('month', order_date) as month,
         COUNT(*) as total_reviews,
@@ -214,14 +208,14 @@ def __(con, date_range):
         SUM(CASE WHEN review_score >= 4 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as promoters_pct,
         SUM(CASE WHEN review_score <= 2 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as detractors_pct
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND review_score IS NOT NULL
     GROUP BY DATE_TRUNC('month', order_date)
     ORDER BY month
     """
 
-    satisfaction_trend = con.execute(satisfaction_trend_query).df()
+    satisfaction_trend = con.execute(satisfaction_trend_query, [date_range.value[0], date_range.value[1]]).df()
     satisfaction_trend['nps'] = satisfaction_trend['promoters_pct'] - satisfaction_trend['detractors_pct']
 
     return satisfaction_trend, satisfaction_trend_query
@@ -290,7 +284,7 @@ def __(mo):
 @app.cell
 def __(con, date_range):
     # Satisfaction by delivery performance
-    delivery_satisfaction_query = f"""
+    delivery_satisfaction_query = """
     SELECT
         delivery_performance,
         COUNT(*) as order_count,
@@ -299,7 +293,7 @@ def __(con, date_range):
         SUM(CASE WHEN review_score <= 2 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as negative_pct,
         AVG(days_to_delivery) as avg_delivery_days
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND review_score IS NOT NULL
     AND delivery_performance IS NOT NULL
@@ -312,7 +306,7 @@ def __(con, date_range):
         END
     """
 
-    delivery_sat = con.execute(delivery_satisfaction_query).df()
+    delivery_sat = con.execute(delivery_satisfaction_query, [date_range.value[0], date_range.value[1]]).df()
     return delivery_sat, delivery_satisfaction_query
 
 
@@ -339,7 +333,7 @@ def __(px, delivery_sat):
 @app.cell
 def __(con, date_range):
     # Satisfaction by delivery time buckets
-    delivery_time_sat_query = f"""
+    delivery_time_sat_query = """
     SELECT
         CASE
             WHEN days_to_delivery < 7 THEN '< 7 days'
@@ -353,7 +347,7 @@ def __(con, date_range):
         AVG(review_score) as avg_rating,
         SUM(CASE WHEN review_score >= 4 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as positive_pct
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND review_score IS NOT NULL
     AND days_to_delivery IS NOT NULL
@@ -368,7 +362,7 @@ def __(con, date_range):
         END
     """
 
-    delivery_time_sat = con.execute(delivery_time_sat_query).df()
+    delivery_time_sat = con.execute(delivery_time_sat_query, [date_range.value[0], date_range.value[1]]).df()
     return delivery_time_sat, delivery_time_sat_query
 
 
@@ -434,7 +428,7 @@ def __(mo):
 @app.cell
 def __(con, date_range):
     # Satisfaction by state
-    state_satisfaction_query = f"""
+    state_satisfaction_query = """
     SELECT
         customer_state,
         COUNT(*) as total_orders,
@@ -444,7 +438,7 @@ def __(con, date_range):
         AVG(days_to_delivery) as avg_delivery_days,
         AVG(total_order_value) as avg_order_value
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND review_score IS NOT NULL
     AND customer_state IS NOT NULL
@@ -453,7 +447,7 @@ def __(con, date_range):
     ORDER BY avg_rating DESC
     """
 
-    state_sat = con.execute(state_satisfaction_query).df()
+    state_sat = con.execute(state_satisfaction_query, [date_range.value[0], date_range.value[1]]).df()
     state_sat['nps'] = state_sat['promoters_pct'] - state_sat['detractors_pct']
 
     return state_sat, state_satisfaction_query
@@ -523,53 +517,66 @@ def __(mo):
 
 @app.cell
 def __(con, date_range):
-    # Correlation analysis - multiple factors
-    factors_query = f"""
+    # Satisfaction by order value, payment method and freight in one scan:
+    # GROUPING SETS returns all three breakdowns, tagged by the factor column
+    factors_query = """
+    WITH reviewed_orders AS (
+        SELECT
+            -- Order value segments
+            CASE
+                WHEN total_order_value < 100 THEN '< R$ 100'
+                WHEN total_order_value < 200 THEN 'R$ 100-200'
+                WHEN total_order_value < 500 THEN 'R$ 200-500'
+                ELSE 'R$ 500+'
+            END as order_value_segment,
+
+            -- Payment method
+            primary_payment_method,
+
+            -- Freight segment
+            CASE
+                WHEN total_freight < 15 THEN 'Low Freight'
+                WHEN total_freight < 25 THEN 'Medium Freight'
+                ELSE 'High Freight'
+            END as freight_segment,
+
+            review_score
+        FROM core_core.fct_orders
+        WHERE order_date BETWEEN ? AND ?
+        AND is_delivered = TRUE
+        AND review_score IS NOT NULL
+    )
     SELECT
-        -- Order value segments
         CASE
-            WHEN total_order_value < 100 THEN '< R$ 100'
-            WHEN total_order_value < 200 THEN 'R$ 100-200'
-            WHEN total_order_value < 500 THEN 'R$ 200-500'
-            ELSE 'R$ 500+'
-        END as order_value_segment,
-
-        -- Payment method
+            WHEN GROUPING(order_value_segment) = 0 THEN 'order_value_segment'
+            WHEN GROUPING(primary_payment_method) = 0 THEN 'primary_payment_method'
+            ELSE 'freight_segment'
+        END as factor,
+        order_value_segment,
         primary_payment_method,
-
-        -- Delivery performance
-        delivery_performance,
-
-        -- Freight segment
-        CASE
-            WHEN total_freight < 15 THEN 'Low Freight'
-            WHEN total_freight < 25 THEN 'Medium Freight'
-            ELSE 'High Freight'
-        END as freight_segment,
-
+        freight_segment,
         COUNT(*) as order_count,
         AVG(review_score) as avg_rating,
         SUM(CASE WHEN review_score >= 4 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as positive_pct
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
-    AND is_delivered = TRUE
-    AND review_score IS NOT NULL
-    GROUP BY order_value_segment, primary_payment_method, delivery_performance, freight_segment
+    FROM reviewed_orders
+    GROUP BY GROUPING SETS (
+        (order_value_segment),
+        (primary_payment_method),
+        (freight_segment)
+    )
     HAVING COUNT(*) >= 10
     """
 
-    factors_data = con.execute(factors_query).df()
+    factors_data = con.execute(factors_query, [date_range.value[0], date_range.value[1]]).df()
     return factors_data, factors_query
 
 
 @app.cell
 def __(factors_data):
     # Analyze by order value
-    order_value_sat = factors_data.groupby('order_value_segment').agg({
-        'order_count': 'sum',
-        'avg_rating': 'mean',
-        'positive_pct': 'mean'
-    }).reset_index()
+    order_value_sat = factors_data[factors_data['factor'] == 'order_value_segment'][
+        ['order_value_segment', 'order_count', 'avg_rating', 'positive_pct']
+    ].copy()
 
     # Sort by order value
     order_value_order = ['< R$ 100', 'R$ 100-200', 'R$ 200-500', 'R$ 500+']
@@ -604,11 +611,9 @@ def __(px, order_value_sat):
 @app.cell
 def __(factors_data):
     # Analyze by payment method
-    payment_sat = factors_data.groupby('primary_payment_method').agg({
-        'order_count': 'sum',
-        'avg_rating': 'mean',
-        'positive_pct': 'mean'
-    }).reset_index().sort_values('avg_rating', ascending=False)
+    payment_sat = factors_data[factors_data['factor'] == 'primary_payment_method'][
+        ['primary_payment_method', 'order_count', 'avg_rating', 'positive_pct']
+    ].sort_values('avg_rating', ascending=False)
 
     return (payment_sat,)
 
@@ -636,11 +641,9 @@ def __(px, payment_sat):
 @app.cell
 def __(factors_data):
     # Analyze by freight cost
-    freight_sat = factors_data.groupby('freight_segment').agg({
-        'order_count': 'sum',
-        'avg_rating': 'mean',
-        'positive_pct': 'mean'
-    }).reset_index()
+    freight_sat = factors_data[factors_data['factor'] == 'freight_segment'][
+        ['freight_segment', 'order_count', 'avg_rating', 'positive_pct']
+    ].copy()
 
     # Order freight segments
     freight_order = ['Low Freight', 'Medium Freight', 'High Freight']
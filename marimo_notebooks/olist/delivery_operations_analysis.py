@@ -7,15 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    return Path, duckdb, go, load_dotenv, make_subplots, mo, os, pd, px
+    return Path, go, make_subplots, mo, pd, px
 
 
 @app.cell
@@ -32,7 +29,7 @@ def _(mo):
     - Q26: Order fulfillment cycle time (purchase to delivery)
     - Q28: Geographical distribution of delivery delays
 
-    **Data Source:** fct_orders
+    **Data Source:** fct_orders & mart_daily_order_cube
 
     **Dataset Period:** 2016-2018
     """)
@@ -40,18 +37,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
-
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
+
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -91,7 +86,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Calculate delivery KPIs
-    delivery_kpi_query = f"""
+    delivery_kpi_query = """
     SELECT
         COUNT(*) as total_orders,
         AVG(days_to_delivery) as avg_delivery_days,
@@ -112,12 +107,12 @@ def _(con, date_range):
         -- Freight metrics
         AVG(total_freight) as avg_freight_cost
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND days_to_delivery IS NOT NULL
     """
 
-    delivery_kpis = con.execute(delivery_kpi_query).df()
+    delivery_kpis = con.execute(delivery_kpi_query, [date_range.value[0], date_range.value[1]]).df()
     return (delivery_kpis,)
 
 
@@ -181,28 +176,29 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Monthly delivery performance trend
-    delivery_trend_query = f"""
+    delivery_trend_query = """
     SELECT
         DATE_TRUNC('month', order_date) as month,
-        COUNT(*) as total_orders,
-        AVG(days_to_delivery) as avg_delivery_days,
-        AVG(days_vs_estimated) as avg_days_vs_estimated,
+        SUM(order_count) as total_orders,
+        SUM(days_to_delivery_sum) / SUM(delivery_count) as avg_delivery_days,
+        SUM(days_vs_estimated_sum) / SUM(days_vs_estimated_count) as avg_days_vs_estimated,
 
         -- Performance categories
-        SUM(CASE WHEN delivery_performance = 'Early' THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as early_pct,
-        SUM(CASE WHEN delivery_performance = 'On Time' THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as ontime_pct,
-        SUM(CASE WHEN delivery_performance = 'Late' THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as late_pct,
+        SUM(CASE WHEN delivery_performance = 'Early' THEN order_count ELSE 0 END)::FLOAT / SUM(order_count) * 100 as early_pct,
+        SUM(CASE WHEN delivery_performance = 'On Time' THEN order_count ELSE 0 END)::FLOAT / SUM(order_count) * 100 as ontime_pct,
+        SUM(CASE WHEN delivery_performance = 'Late' THEN order_count ELSE 0 END)::FLOAT / SUM(order_count) * 100 as late_pct,
 
-        AVG(review_score) as avg_satisfaction
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        SUM(review_score_sum) / SUM(review_count) as avg_satisfaction
+    FROM core_mart.mart_daily_order_cube
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
-    AND days_to_delivery IS NOT NULL
+    -- delivery_performance is null exactly when days_to_delivery is
+    AND delivery_performance IS NOT NULL
     GROUP BY DATE_TRUNC('month', order_date)
     ORDER BY month
     """
 
-    delivery_trend = con.execute(delivery_trend_query).df()
+    delivery_trend = con.execute(delivery_trend_query, [date_range.value[0], date_range.value[1]]).df()
     return (delivery_trend,)
 
 
@@ -299,26 +295,26 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Delivery performance by state
-    state_delivery_query = f"""
+    state_delivery_query = """
     SELECT
         customer_state,
-        COUNT(*) as total_orders,
-        AVG(days_to_delivery) as avg_delivery_days,
-        AVG(days_vs_estimated) as avg_days_vs_estimated,
-        SUM(CASE WHEN delivery_performance = 'Late' THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as late_pct,
-        AVG(review_score) as avg_satisfaction,
-        AVG(total_freight) as avg_freight_cost
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        SUM(order_count) as total_orders,
+        SUM(days_to_delivery_sum) / SUM(delivery_count) as avg_delivery_days,
+        SUM(days_vs_estimated_sum) / SUM(days_vs_estimated_count) as avg_days_vs_estimated,
+        SUM(CASE WHEN delivery_performance = 'Late' THEN order_count ELSE 0 END)::FLOAT / SUM(order_count) * 100 as late_pct,
+        SUM(review_score_sum) / SUM(review_count) as avg_satisfaction,
+        SUM(total_freight) / SUM(order_count) as avg_freight_cost
+    FROM core_mart.mart_daily_order_cube
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
-    AND days_to_delivery IS NOT NULL
+    AND delivery_performance IS NOT NULL
     AND customer_state IS NOT NULL
     GROUP BY customer_state
-    HAVING COUNT(*) >= 100  -- Only include states with significant volume
+    HAVING SUM(order_count) >= 100  -- Only include states with significant volume
     ORDER BY avg_delivery_days
     """
 
-    state_delivery = con.execute(state_delivery_query).df()
+    state_delivery = con.execute(state_delivery_query, [date_range.value[0], date_range.value[1]]).df()
     return (state_delivery,)
 
 
@@ -404,7 +400,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Satisfaction by delivery time buckets
-    satisfaction_by_delivery_query = f"""
+    satisfaction_by_delivery_query = """
     SELECT
         CASE
             WHEN days_to_delivery < 7 THEN '< 7 days'
@@ -418,7 +414,7 @@ def _(con, date_range):
         SUM(CASE WHEN review_score >= 4 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as positive_review_pct,
         AVG(days_to_delivery) as avg_delivery_days
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND days_to_delivery IS NOT NULL
     AND review_score IS NOT NULL
@@ -433,7 +429,7 @@ def _(con, date_range):
         END
     """
 
-    satisfaction_delivery = con.execute(satisfaction_by_delivery_query).df()
+    satisfaction_delivery = con.execute(satisfaction_by_delivery_query, [date_range.value[0], date_range.value[1]]).df()
     return (satisfaction_delivery,)
 
 
@@ -488,7 +484,7 @@ def _(go, make_subplots, satisfaction_delivery):
 @app.cell
 def _(con, date_range):
     # Correlation analysis - delivery performance vs satisfaction
-    correlation_query = f"""
+    correlation_query = """
     SELECT
         delivery_performance,
         COUNT(*) as order_count,
@@ -496,7 +492,7 @@ def _(con, date_range):
         AVG(days_to_delivery) as avg_delivery_days,
         AVG(days_vs_estimated) as avg_days_vs_estimated
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND review_score IS NOT NULL
     AND delivery_performance IS NOT NULL
@@ -509,7 +505,7 @@ def _(con, date_range):
         END
     """
 
-    perf_satisfaction = con.execute(correlation_query).df()
+    perf_satisfaction = con.execute(correlation_query, [date_range.value[0], date_range.value[1]]).df()
     return (perf_satisfaction,)
 
 
@@ -547,7 +543,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Freight vs delivery time analysis
-    freight_delivery_query = f"""
+    freight_delivery_query = """
     SELECT
         CASE
             WHEN total_freight < 10 THEN '< R$ 10'
@@ -562,7 +558,7 @@ def _(con, date_range):
         SUM(CASE WHEN delivery_performance = 'Late' THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as late_pct,
         AVG(review_score) as avg_satisfaction
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND total_freight IS NOT NULL
     AND days_to_delivery IS NOT NULL
@@ -577,7 +573,7 @@ def _(con, date_range):
         END
     """
 
-    freight_delivery = con.execute(freight_delivery_query).df()
+    freight_delivery = con.execute(freight_delivery_query, [date_range.value[0], date_range.value[1]]).df()
     return (freight_delivery,)
 
 
@@ -644,7 +640,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Fulfillment cycle time breakdown
-    fulfillment_query = f"""
+    fulfillment_query = """
     SELECT
         DATE_TRUNC('month', order_date) as month,
         AVG(hours_to_approval) / 24.0 as avg_days_to_approval,
@@ -652,7 +648,7 @@ def _(con, date_range):
         AVG(hours_to_approval / 24.0 + days_to_delivery) as total_cycle_time,
         COUNT(*) as order_count
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND hours_to_approval IS NOT NULL
     AND days_to_delivery IS NOT NULL
@@ -660,7 +656,7 @@ def _(con, date_range):
     ORDER BY month
     """
 
-    fulfillment = con.execute(fulfillment_query).df()
+    fulfillment = con.execute(fulfillment_query, [date_range.value[0], date_range.value[1]]).df()
     return (fulfillment,)
 
 
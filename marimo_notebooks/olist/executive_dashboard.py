@@ -7,15 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    return Path, duckdb, load_dotenv, make_subplots, mo, os, px
+    return Path, make_subplots, mo, px
 
 
 @app.cell
@@ -32,7 +29,7 @@ def _(mo):
     - Q21: Delivery performance metrics
     - Q31: Customer satisfaction score (NPS proxy)
 
-    **Data Source:** dim_customers (99,441 rows) & fct_orders (99,992 rows)
+    **Data Source:** dim_customers (99,441 rows), fct_orders (99,992 rows) & mart_daily_order_cube
 
     **Dataset Period:** 2016-2018
     """)
@@ -40,19 +37,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    # Path: marimo_notebooks/olist/executive_dashboard.py -> ../../.env
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
-
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'  # Each notebook can specify its own database
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
+
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -92,22 +86,22 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Calculate overall KPIs for the selected date range
-    kpi_query = f"""
+    kpi_query = """
     WITH filtered_orders AS (
-        SELECT *
-        FROM core_core.fct_orders
-        WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
-        AND is_delivered = TRUE
+        SELECT
+            o.*,
+            c.first_order_date
+        FROM core_core.fct_orders o
+        LEFT JOIN core_core.dim_customers c ON o.customer_id = c.customer_id
+        WHERE o.order_date BETWEEN ? AND ?
+        AND o.is_delivered = TRUE
     ),
     customer_stats AS (
         SELECT
             COUNT(DISTINCT customer_id) as total_customers,
+            -- New customers placed their first order (dim_customers.first_order_date) on this day
             COUNT(DISTINCT CASE
-                WHEN order_date = (
-                    SELECT MIN(order_date)
-                    FROM core_core.fct_orders f2
-                    WHERE f2.customer_id = filtered_orders.customer_id
-                ) THEN customer_id
+                WHEN order_date = DATE_TRUNC('day', first_order_date) THEN customer_id
             END) as new_customers
         FROM filtered_orders
     )
@@ -132,7 +126,7 @@ def _(con, date_range):
     FROM filtered_orders
     """
 
-    kpis = con.execute(kpi_query).df()
+    kpis = con.execute(kpi_query, [date_range.value[0], date_range.value[1]]).df()
     return (kpis,)
 
 
@@ -196,7 +190,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Monthly revenue trend
-    revenue_trend_query = f"""
+    revenue_trend_query = """
     SELECT
         DATE_TRUNC('month', order_date) as month,
         COUNT(*) as total_orders,
@@ -204,13 +198,13 @@ def _(con, date_range):
         AVG(total_order_value) as avg_order_value,
         COUNT(DISTINCT customer_id) as active_customers
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     GROUP BY DATE_TRUNC('month', order_date)
     ORDER BY month
     """
 
-    revenue_trend = con.execute(revenue_trend_query).df()
+    revenue_trend = con.execute(revenue_trend_query, [date_range.value[0], date_range.value[1]]).df()
 
     # Calculate growth rates
     revenue_trend['mom_growth'] = revenue_trend['monthly_revenue'].pct_change() * 100
@@ -280,46 +274,38 @@ def _(mo):
 
 @app.cell
 def _(con, date_range):
-    # Customer acquisition trend
-    customer_acquisition_query = f"""
-    WITH customer_first_order AS (
-        SELECT
-            customer_id,
-            MIN(order_date) as first_order_date
-        FROM core_core.fct_orders
-        WHERE is_delivered = TRUE
-        GROUP BY customer_id
-    )
+    # Customer acquisition trend (first delivered order precomputed on dim_customers)
+    customer_acquisition_query = """
     SELECT
-        DATE_TRUNC('month', first_order_date) as month,
+        DATE_TRUNC('month', first_delivered_order_date) as month,
         COUNT(*) as new_customers
-    FROM customer_first_order
-    WHERE first_order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
-    GROUP BY DATE_TRUNC('month', first_order_date)
+    FROM core_core.dim_customers
+    WHERE first_delivered_order_date BETWEEN ? AND ?
+    GROUP BY DATE_TRUNC('month', first_delivered_order_date)
     ORDER BY month
     """
 
-    customer_acquisition = con.execute(customer_acquisition_query).df()
+    customer_acquisition = con.execute(customer_acquisition_query, [date_range.value[0], date_range.value[1]]).df()
     return (customer_acquisition,)
 
 
 @app.cell
 def _(con, date_range):
     # Order volume trend
-    order_volume_query = f"""
+    order_volume_query = """
     SELECT
         DATE_TRUNC('month', order_date) as month,
         COUNT(*) as total_orders,
         COUNT(DISTINCT customer_id) as unique_customers,
         COUNT(*)::FLOAT / COUNT(DISTINCT customer_id) as orders_per_customer
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     GROUP BY DATE_TRUNC('month', order_date)
     ORDER BY month
     """
 
-    order_volume = con.execute(order_volume_query).df()
+    order_volume = con.execute(order_volume_query, [date_range.value[0], date_range.value[1]]).df()
     return (order_volume,)
 
 
@@ -406,7 +392,7 @@ def _(px, revenue_trend):
 @app.cell
 def _(con, date_range):
     # AOV distribution by order size
-    aov_distribution_query = f"""
+    aov_distribution_query = """
     SELECT
         CASE
             WHEN total_order_value < 50 THEN '< R$ 50'
@@ -419,7 +405,7 @@ def _(con, date_range):
         SUM(total_order_value) as total_revenue,
         AVG(total_order_value) as avg_order_value
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     GROUP BY order_value_range
     ORDER BY
@@ -432,7 +418,7 @@ def _(con, date_range):
         END
     """
 
-    aov_distribution = con.execute(aov_distribution_query).df()
+    aov_distribution = con.execute(aov_distribution_query, [date_range.value[0], date_range.value[1]]).df()
     return (aov_distribution,)
 
 
@@ -495,23 +481,23 @@ def _(mo):
 
 @app.cell
 def _(con, date_range):
-    # Delivery performance metrics
-    delivery_performance_query = f"""
+    # Delivery performance metrics (rolled up from the daily order cube)
+    delivery_performance_query = """
     SELECT
         DATE_TRUNC('month', order_date) as month,
-        AVG(days_to_delivery) as avg_delivery_days,
-        AVG(days_vs_estimated) as avg_days_vs_estimated,
-        SUM(CASE WHEN delivery_performance = 'Early' THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as early_pct,
-        SUM(CASE WHEN delivery_performance = 'On Time' THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as ontime_pct,
-        SUM(CASE WHEN delivery_performance = 'Late' THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as late_pct
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        SUM(days_to_delivery_sum) / SUM(delivery_count) as avg_delivery_days,
+        SUM(days_vs_estimated_sum) / SUM(days_vs_estimated_count) as avg_days_vs_estimated,
+        SUM(CASE WHEN delivery_performance = 'Early' THEN order_count ELSE 0 END)::FLOAT / SUM(order_count) * 100 as early_pct,
+        SUM(CASE WHEN delivery_performance = 'On Time' THEN order_count ELSE 0 END)::FLOAT / SUM(order_count) * 100 as ontime_pct,
+        SUM(CASE WHEN delivery_performance = 'Late' THEN order_count ELSE 0 END)::FLOAT / SUM(order_count) * 100 as late_pct
+    FROM core_mart.mart_daily_order_cube
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     GROUP BY DATE_TRUNC('month', order_date)
     ORDER BY month
     """
 
-    delivery_performance = con.execute(delivery_performance_query).df()
+    delivery_performance = con.execute(delivery_performance_query, [date_range.value[0], date_range.value[1]]).df()
     return (delivery_performance,)
 
 
@@ -579,24 +565,24 @@ def _(mo):
 
 @app.cell
 def _(con, date_range):
-    # Customer satisfaction trend
-    satisfaction_trend_query = f"""
+    # Customer satisfaction trend (rolled up from the review score histogram)
+    satisfaction_trend_query = """
     SELECT
         DATE_TRUNC('month', order_date) as month,
-        AVG(review_score) as avg_review_score,
-        SUM(CASE WHEN review_score = 5 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as five_star_pct,
-        SUM(CASE WHEN review_score >= 4 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as positive_pct,
-        SUM(CASE WHEN review_score = 3 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as neutral_pct,
-        SUM(CASE WHEN review_score <= 2 THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as negative_pct
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        SUM(review_score_sum) / SUM(review_count) as avg_review_score,
+        SUM(review_score_5)::FLOAT / SUM(review_count) * 100 as five_star_pct,
+        SUM(review_score_4 + review_score_5)::FLOAT / SUM(review_count) * 100 as positive_pct,
+        SUM(review_score_3)::FLOAT / SUM(review_count) * 100 as neutral_pct,
+        SUM(review_score_1 + review_score_2)::FLOAT / SUM(review_count) * 100 as negative_pct
+    FROM core_mart.mart_daily_order_cube
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
-    AND review_score IS NOT NULL
     GROUP BY DATE_TRUNC('month', order_date)
+    HAVING SUM(review_count) > 0
     ORDER BY month
     """
 
-    satisfaction_trend = con.execute(satisfaction_trend_query).df()
+    satisfaction_trend = con.execute(satisfaction_trend_query, [date_range.value[0], date_range.value[1]]).df()
     return (satisfaction_trend,)
 
 
@@ -623,24 +609,36 @@ def _(px, satisfaction_trend):
 
 @app.cell
 def _(con, date_range):
-    # Review score distribution
-    review_distribution_query = f"""
+    # Review score distribution (unpivoted from the daily order cube histogram)
+    review_distribution_query = """
+    WITH histogram AS (
+        SELECT
+            SUM(review_score_1) as score_1,
+            SUM(review_score_2) as score_2,
+            SUM(review_score_3) as score_3,
+            SUM(review_score_4) as score_4,
+            SUM(review_score_5) as score_5
+        FROM core_mart.mart_daily_order_cube
+        WHERE order_date BETWEEN ? AND ?
+        AND is_delivered = TRUE
+    ),
+    scores AS (
+        SELECT
+            CAST(RIGHT(score, 1) AS INTEGER) as review_score,
+            review_count
+        FROM histogram
+        UNPIVOT (review_count FOR score IN (score_1, score_2, score_3, score_4, score_5))
+    )
     SELECT
         review_score,
-        COUNT(*) as review_count,
-        COUNT(*)::FLOAT / (SELECT COUNT(*) FROM core_core.fct_orders
-                           WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
-                           AND is_delivered = TRUE
-                           AND review_score IS NOT NULL) * 100 as percentage
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
-    AND is_delivered = TRUE
-    AND review_score IS NOT NULL
-    GROUP BY review_score
+        review_count,
+        review_count::FLOAT / SUM(review_count) OVER () * 100 as percentage
+    FROM scores
+    WHERE review_count > 0
     ORDER BY review_score
     """
 
-    review_distribution = con.execute(review_distribution_query).df()
+    review_distribution = con.execute(review_distribution_query, [date_range.value[0], date_range.value[1]]).df()
     return (review_distribution,)
 
 
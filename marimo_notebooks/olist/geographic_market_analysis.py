@@ -7,15 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    return Path, duckdb, go, load_dotenv, make_subplots, mo, os, px
+    return Path, go, make_subplots, mo, px
 
 
 @app.cell
@@ -30,7 +27,7 @@ def _(mo):
     - Q67: Regions with highest growth rates
     - Q70: Regions with best unit economics
 
-    **Data Source:** fct_orders
+    **Data Source:** fct_orders & mart_daily_order_cube
 
     **Dataset Period:** 2016-2018
     """)
@@ -38,18 +35,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
-
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
+
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -89,7 +84,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # State-level revenue analysis
-    state_revenue_query = f"""
+    state_revenue_query = """
     SELECT
         customer_state,
         COUNT(DISTINCT customer_id) as unique_customers,
@@ -101,14 +96,14 @@ def _(con, date_range):
         AVG(review_score) as avg_satisfaction,
         AVG(days_to_delivery) as avg_delivery_days
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND customer_state IS NOT NULL
     GROUP BY customer_state
     ORDER BY total_revenue DESC
     """
 
-    state_revenue = con.execute(state_revenue_query).df()
+    state_revenue = con.execute(state_revenue_query, [date_range.value[0], date_range.value[1]]).df()
 
     # Calculate percentages
     state_revenue['revenue_pct'] = state_revenue['total_revenue'] / state_revenue['total_revenue'].sum() * 100
@@ -200,7 +195,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # City-level analysis
-    city_revenue_query = f"""
+    city_revenue_query = """
     SELECT
         customer_city,
         customer_state,
@@ -210,7 +205,7 @@ def _(con, date_range):
         AVG(total_order_value) as avg_order_value,
         AVG(review_score) as avg_satisfaction
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND customer_city IS NOT NULL
     GROUP BY customer_city, customer_state
@@ -219,7 +214,7 @@ def _(con, date_range):
     LIMIT 20
     """
 
-    city_revenue = con.execute(city_revenue_query).df()
+    city_revenue = con.execute(city_revenue_query, [date_range.value[0], date_range.value[1]]).df()
     city_revenue['city_state'] = city_revenue['customer_city'] + ' (' + city_revenue['customer_state'] + ')'
     return (city_revenue,)
 
@@ -287,19 +282,19 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # State growth analysis (comparing first half vs second half)
-    growth_query = f"""
+    growth_query = """
     WITH period_split AS (
         SELECT
             customer_state,
             CASE
-                WHEN order_date < DATE '{date_range.value[0]}'::DATE + INTERVAL '12 months'
+                WHEN order_date < ?::DATE + INTERVAL '12 months'
                 THEN 'First Year'
                 ELSE 'Second Year'
             END as period,
-            COUNT(*) as order_count,
+            SUM(order_count) as order_count,
             SUM(total_order_value) as revenue
-        FROM core_core.fct_orders
-        WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        FROM core_mart.mart_daily_order_cube
+        WHERE order_date BETWEEN ? AND ?
         AND is_delivered = TRUE
         AND customer_state IS NOT NULL
         GROUP BY customer_state, period
@@ -334,7 +329,7 @@ def _(con, date_range):
     ORDER BY revenue_growth_pct DESC
     """
 
-    state_growth = con.execute(growth_query).df()
+    state_growth = con.execute(growth_query, [date_range.value[0], date_range.value[0], date_range.value[1]]).df()
     return (state_growth,)
 
 
@@ -7,15 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    return Path, duckdb, go, load_dotenv, make_subplots, mo, os, px
+    return Path, go, make_subplots, mo, px
 
 
 @app.cell
@@ -28,7 +25,7 @@ def _(mo):
     - Q17: Seasonal revenue patterns for campaign planning
     - Q80: Customer segments to target for reactivation
 
-    **Data Source:** fct_orders & dim_customers
+    **Data Source:** fct_orders, mart_daily_order_cube & dim_customers
 
     **Dataset Period:** 2016-2018
     """)
@@ -36,18 +33,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
-
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
+
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -87,7 +82,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Day of week analysis
-    dow_query = f"""
+    dow_query = """
     SELECT
         EXTRACT(DAYOFWEEK FROM order_date) as day_of_week_num,
         CASE EXTRACT(DAYOFWEEK FROM order_date)
@@ -99,17 +94,17 @@ def _(con, date_range):
             WHEN 5 THEN 'Friday'
             WHEN 6 THEN 'Saturday'
         END as day_of_week,
-        COUNT(*) as total_orders,
+        SUM(order_count) as total_orders,
         SUM(total_order_value) as total_revenue,
-        AVG(total_order_value) as avg_order_value
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        SUM(total_order_value) / SUM(order_count) as avg_order_value
+    FROM core_mart.mart_daily_order_cube
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     GROUP BY EXTRACT(DAYOFWEEK FROM order_date), day_of_week
     ORDER BY day_of_week_num
     """
 
-    dow_data = con.execute(dow_query).df()
+    dow_data = con.execute(dow_query, [date_range.value[0], date_range.value[1]]).df()
     return (dow_data,)
 
 
@@ -175,7 +170,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Monthly seasonality
-    monthly_query = f"""
+    monthly_query = """
     SELECT
         EXTRACT(MONTH FROM order_date) as month_num,
         CASE EXTRACT(MONTH FROM order_date)
@@ -197,13 +192,13 @@ def _(con, date_range):
         AVG(total_order_value) as avg_order_value,
         COUNT(DISTINCT customer_id) as unique_customers
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     GROUP BY EXTRACT(MONTH FROM order_date), month_name
     ORDER BY month_num
     """
 
-    monthly_data = con.execute(monthly_query).df()
+    monthly_data = con.execute(monthly_query, [date_range.value[0], date_range.value[1]]).df()
     return (monthly_data,)
 
 
@@ -251,21 +246,21 @@ def _(monthly_data, px):
 @app.cell
 def _(con, date_range):
     # Quarterly analysis
-    quarterly_query = f"""
+    quarterly_query = """
     SELECT
         EXTRACT(QUARTER FROM order_date) as quarter,
         EXTRACT(YEAR FROM order_date) as year,
-        COUNT(*) as total_orders,
+        SUM(order_count) as total_orders,
         SUM(total_order_value) as total_revenue,
-        AVG(total_order_value) as avg_order_value
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        SUM(total_order_value) / SUM(order_count) as avg_order_value
+    FROM core_mart.mart_daily_order_cube
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     GROUP BY EXTRACT(QUARTER FROM order_date), EXTRACT(YEAR FROM order_date)
     ORDER BY year, quarter
     """
 
-    quarterly_data = con.execute(quarterly_query).df()
+    quarterly_data = con.execute(quarterly_query, [date_range.value[0], date_range.value[1]]).df()
     quarterly_data['period'] = quarterly_data['year'].astype(str) + ' Q' + quarterly_data['quarter'].astype(str)
     return (quarterly_data,)
 
@@ -307,21 +302,21 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Hour of day analysis
-    hour_query = f"""
+    hour_query = """
     SELECT
         EXTRACT(HOUR FROM order_purchase_timestamp) as hour,
         COUNT(*) as total_orders,
         SUM(total_order_value) as total_revenue,
         AVG(total_order_value) as avg_order_value
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND order_purchase_timestamp IS NOT NULL
     GROUP BY EXTRACT(HOUR FROM order_purchase_timestamp)
     ORDER BY hour
     """
 
-    hour_data = con.execute(hour_query).df()
+    hour_data = con.execute(hour_query, [date_range.value[0], date_range.value[1]]).df()
     return (hour_data,)
 
 
@@ -360,7 +355,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Customer reactivation analysis
-    reactivation_query = f"""
+    reactivation_query = """
     WITH customer_activity AS (
         SELECT
             c.customer_id,
@@ -371,7 +366,7 @@ def _(con, date_range):
             c.days_since_last_order,
             c.avg_review_score
         FROM core_core.dim_customers c
-        WHERE c.first_order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        WHERE c.first_order_date BETWEEN ? AND ?
     )
     SELECT
         CASE
@@ -397,7 +392,7 @@ def _(con, date_range):
         END
     """
 
-    reactivation_data = con.execute(reactivation_query).df()
+    reactivation_data = con.execute(reactivation_query, [date_range.value[0], date_range.value[1]]).df()
     return (reactivation_data,)
 
 
@@ -425,7 +420,7 @@ def _(px, reactivation_data):
 @app.cell
 def _(con, date_range):
     # High-value dormant customers
-    dormant_value_query = f"""
+    dormant_value_query = """
     WITH customer_activity AS (
         SELECT
             c.customer_id,
@@ -435,7 +430,7 @@ def _(con, date_range):
         FROM core_core.dim_customers c
         JOIN core_core.fct_orders o ON c.customer_id = o.customer_id
         WHERE o.is_delivered = TRUE
-        AND c.first_order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        AND c.first_order_date BETWEEN ? AND ?
         GROUP BY c.customer_id, c.lifetime_orders, c.days_since_last_order
     )
     SELECT
@@ -458,7 +453,7 @@ def _(con, date_range):
     ORDER BY segment, avg_ltv DESC
     """
 
-    dormant_value = con.execute(dormant_value_query).df()
+    dormant_value = con.execute(dormant_value_query, [date_range.value[0], date_range.value[1]]).df()
     return (dormant_value,)
 
 
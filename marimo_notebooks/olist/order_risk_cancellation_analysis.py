@@ -7,15 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    return Path, duckdb, go, load_dotenv, make_subplots, mo, os, px
+    return Path, go, make_subplots, mo, px
 
 
 @app.cell
@@ -39,18 +36,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
-
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
+
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -90,7 +85,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Overall cancellation metrics
-    cancellation_kpi_query = f"""
+    cancellation_kpi_query = """
     SELECT
         COUNT(*) as total_orders,
         SUM(CASE WHEN is_canceled THEN 1 ELSE 0 END) as canceled_orders,
@@ -102,10 +97,10 @@ def _(con, date_range):
         AVG(CASE WHEN is_canceled THEN total_order_value END) as avg_canceled_order_value,
         AVG(CASE WHEN is_delivered THEN total_order_value END) as avg_delivered_order_value
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     """
 
-    cancellation_kpis = con.execute(cancellation_kpi_query).df()
+    cancellation_kpis = con.execute(cancellation_kpi_query, [date_range.value[0], date_range.value[1]]).df()
     return (cancellation_kpis,)
 
 
@@ -144,7 +139,7 @@ def _(cancellation_kpis, mo):
 @app.cell
 def _(con, date_range):
     # Cancellation trend over time
-    cancellation_trend_query = f"""
+    cancellation_trend_query = """
     SELECT
         DATE_TRUNC('month', order_date) as month,
         COUNT(*) as total_orders,
@@ -152,12 +147,12 @@ def _(con, date_range):
         SUM(CASE WHEN is_canceled THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as cancellation_rate,
         SUM(CASE WHEN is_canceled THEN total_order_value ELSE 0 END) as canceled_revenue
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     GROUP BY DATE_TRUNC('month', order_date)
     ORDER BY month
     """
 
-    cancellation_trend = con.execute(cancellation_trend_query).df()
+    cancellation_trend = con.execute(cancellation_trend_query, [date_range.value[0], date_range.value[1]]).df()
     return (cancellation_trend,)
 
 
@@ -223,7 +218,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Cancellation by order value
-    cancel_by_value_query = f"""
+    cancel_by_value_query = """
     SELECT
         CASE
             WHEN total_order_value < 50 THEN '< R$ 50'
@@ -237,7 +232,7 @@ def _(con, date_range):
         SUM(CASE WHEN is_canceled THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as cancellation_rate,
         AVG(total_order_value) as avg_order_value
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     GROUP BY order_value_range
     ORDER BY
         CASE order_value_range
@@ -249,7 +244,7 @@ def _(con, date_range):
         END
     """
 
-    cancel_by_value = con.execute(cancel_by_value_query).df()
+    cancel_by_value = con.execute(cancel_by_value_query, [date_range.value[0], date_range.value[1]]).df()
     return (cancel_by_value,)
 
 
@@ -276,7 +271,7 @@ def _(cancel_by_value, px):
 @app.cell
 def _(con, date_range):
     # Cancellation by state
-    cancel_by_state_query = f"""
+    cancel_by_state_query = """
     SELECT
         customer_state,
         COUNT(*) as total_orders,
@@ -284,14 +279,14 @@ def _(con, date_range):
         SUM(CASE WHEN is_canceled THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as cancellation_rate,
         AVG(total_order_value) as avg_order_value
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND customer_state IS NOT NULL
     GROUP BY customer_state
     HAVING COUNT(*) >= 100
     ORDER BY cancellation_rate DESC
     """
 
-    cancel_by_state = con.execute(cancel_by_state_query).df()
+    cancel_by_state = con.execute(cancel_by_state_query, [date_range.value[0], date_range.value[1]]).df()
     return (cancel_by_state,)
 
 
@@ -320,20 +315,20 @@ def _(cancel_by_state, px):
 @app.cell
 def _(con, date_range):
     # Cancellation by payment method
-    cancel_by_payment_query = f"""
+    cancel_by_payment_query = """
     SELECT
         primary_payment_method,
         COUNT(*) as total_orders,
         SUM(CASE WHEN is_canceled THEN 1 ELSE 0 END) as canceled_orders,
         SUM(CASE WHEN is_canceled THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as cancellation_rate
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND primary_payment_method IS NOT NULL
     GROUP BY primary_payment_method
     ORDER BY cancellation_rate DESC
     """
 
-    cancel_by_payment = con.execute(cancel_by_payment_query).df()
+    cancel_by_payment = con.execute(cancel_by_payment_query, [date_range.value[0], date_range.value[1]]).df()
     return (cancel_by_payment,)
 
 
@@ -373,7 +368,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Installment distribution analysis
-    installment_dist_query = f"""
+    installment_dist_query = """
     SELECT
         max_installments,
         COUNT(*) as order_count,
@@ -383,13 +378,13 @@ def _(con, date_range):
         SUM(CASE WHEN is_canceled THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as cancellation_rate,
         AVG(CASE WHEN is_delivered THEN review_score END) as avg_satisfaction
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND max_installments IS NOT NULL
     GROUP BY max_installments
     ORDER BY max_installments
     """
 
-    installment_dist = con.execute(installment_dist_query).df()
+    installment_dist = con.execute(installment_dist_query, [date_range.value[0], date_range.value[1]]).df()
     return (installment_dist,)
 
 
@@ -529,7 +524,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Payment method risk analysis
-    payment_risk_query = f"""
+    payment_risk_query = """
     SELECT
         primary_payment_method,
         COUNT(*) as total_orders,
@@ -538,13 +533,13 @@ def _(con, date_range):
         AVG(max_installments) as avg_installments,
         AVG(total_order_value) as avg_order_value
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND primary_payment_method IS NOT NULL
     GROUP BY primary_payment_method
     ORDER BY failure_rate DESC
     """
 
-    payment_risk = con.execute(payment_risk_query).df()
+    payment_risk = con.execute(payment_risk_query, [date_range.value[0], date_range.value[1]]).df()
     return (payment_risk,)
 
 
@@ -597,7 +592,7 @@ def _(go, make_subplots, payment_risk):
 @app.cell
 def _(con, date_range):
     # Geographic payment issues
-    geo_payment_query = f"""
+    geo_payment_query = """
     SELECT
         customer_state,
         primary_payment_method,
@@ -605,7 +600,7 @@ def _(con, date_range):
         SUM(CASE WHEN is_canceled THEN 1 ELSE 0 END) as failed_orders,
         SUM(CASE WHEN is_canceled THEN 1 ELSE 0 END)::FLOAT / COUNT(*) * 100 as failure_rate
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND customer_state IS NOT NULL
     AND primary_payment_method IS NOT NULL
     GROUP BY customer_state, primary_payment_method
@@ -614,7 +609,7 @@ def _(con, date_range):
     LIMIT 30
     """
 
-    geo_payment = con.execute(geo_payment_query).df()
+    geo_payment = con.execute(geo_payment_query, [date_range.value[0], date_range.value[1]]).df()
     return (geo_payment,)
 
 
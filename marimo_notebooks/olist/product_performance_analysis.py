@@ -7,15 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    return Path, duckdb, go, load_dotenv, make_subplots, mo, os, pd, px
+    return Path, go, make_subplots, mo, pd, px
 
 
 @app.cell
@@ -43,18 +40,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
-
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
+
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -117,7 +112,12 @@ def _(mo):
 @app.cell
 def _(category_filter, con, min_sales):
     # Calculate overall product metrics
-    category_condition = "" if category_filter.value == 'All Categories' else f"AND product_category_name_english = '{category_filter.value}'"
+    # Optional category filter, bound as a parameter
+    if category_filter.value == 'All Categories':
+        category_condition, category_params = "", []
+    else:
+        category_condition = "AND product_category_name_english = ?"
+        category_params = [category_filter.value]
 
     product_kpis = con.execute(f"""
         SELECT
@@ -126,14 +126,14 @@ def _(category_filter, con, min_sales):
             SUM(total_revenue) as total_revenue,
             AVG(avg_review_score) as avg_review_score,
             AVG(on_time_delivery_rate) as avg_on_time_rate,
-            COUNT(DISTINCT CASE WHEN total_units_sold >= {min_sales.value} THEN product_id END) as active_products
+            COUNT(DISTINCT CASE WHEN total_units_sold >= ? THEN product_id END) as active_products
         FROM marts_product.mart_product_performance
-        WHERE total_units_sold >= {min_sales.value}
+        WHERE total_units_sold >= ?
         {category_condition}
-    """).df()
+    """, [min_sales.value, min_sales.value] + category_params).df()
 
     kpi_data = product_kpis.iloc[0]
-    return category_condition, kpi_data, product_kpis
+    return category_condition, category_params, kpi_data, product_kpis
 
 
 @app.cell
@@ -160,7 +160,7 @@ def _(mo):
 
 
 @app.cell
-def _(category_condition, con, min_sales):
+def _(category_condition, category_params, con, min_sales):
     top_products = con.execute(f"""
         SELECT
             product_category_name_english as category,
@@ -173,11 +173,11 @@ def _(category_condition, con, min_sales):
             sales_tier,
             review_tier
         FROM marts_product.mart_product_performance
-        WHERE total_units_sold >= {min_sales.value}
+        WHERE total_units_sold >= ?
         {category_condition}
         ORDER BY total_units_sold DESC
         LIMIT 20
-    """).df()
+    """, [min_sales.value] + category_params).df()
 
     top_products
     return (top_products,)
@@ -228,7 +228,7 @@ def _(mo):
 
 @app.cell
 def _(con, min_sales):
-    category_performance = con.execute(f"""
+    category_performance = con.execute("""
         SELECT
             product_category_name_english as category,
             COUNT(DISTINCT product_id) as product_count,
@@ -239,12 +239,12 @@ def _(con, min_sales):
             AVG(on_time_delivery_rate) as avg_on_time_rate,
             SUM(total_revenue) / SUM(total_units_sold) as revenue_per_unit
         FROM marts_product.mart_product_performance
-        WHERE total_units_sold >= {min_sales.value}
+        WHERE total_units_sold >= ?
         AND product_category_name_english IS NOT NULL
         GROUP BY product_category_name_english
         ORDER BY total_revenue DESC
         LIMIT 15
-    """).df()
+    """, [min_sales.value]).df()
 
     category_performance
     return (category_performance,)
@@ -308,7 +308,7 @@ def _(mo):
 
 
 @app.cell
-def _(category_condition, con, min_sales):
+def _(category_condition, category_params, con, min_sales):
     price_review_data = con.execute(f"""
         SELECT
             product_category_name_english as category,
@@ -318,10 +318,10 @@ def _(category_condition, con, min_sales):
             total_reviews,
             on_time_delivery_rate
         FROM marts_product.mart_product_performance
-        WHERE total_units_sold >= {min_sales.value}
+        WHERE total_units_sold >= ?
         AND avg_review_score IS NOT NULL
         {category_condition}
-    """).df()
+    """, [min_sales.value] + category_params).df()
     return (price_review_data,)
 
 
@@ -360,7 +360,7 @@ def _(mo):
 
 
 @app.cell
-def _(category_condition, con, min_sales):
+def _(category_condition, category_params, con, min_sales):
     sales_tiers = con.execute(f"""
         SELECT
             sales_tier,
@@ -368,7 +368,7 @@ def _(category_condition, con, min_sales):
             SUM(total_revenue) as tier_revenue,
             AVG(avg_review_score) as avg_review
         FROM marts_product.mart_product_performance
-        WHERE total_units_sold >= {min_sales.value}
+        WHERE total_units_sold >= ?
         {category_condition}
         GROUP BY sales_tier
         ORDER BY
@@ -379,7 +379,7 @@ def _(category_condition, con, min_sales):
                 WHEN 'Low Seller' THEN 4
                 ELSE 5
             END
-    """).df()
+    """, [min_sales.value] + category_params).df()
 
     sales_tiers
     return (sales_tiers,)
@@ -434,7 +434,7 @@ def _(mo):
 
 
 @app.cell
-def _(category_condition, con, min_sales):
+def _(category_condition, category_params, con, min_sales):
     review_distribution = con.execute(f"""
         SELECT
             review_tier,
@@ -442,12 +442,12 @@ def _(category_condition, con, min_sales):
             AVG(total_units_sold) as avg_units_sold,
             AVG(avg_review_score) as avg_score
         FROM marts_product.mart_product_performance
-        WHERE total_units_sold >= {min_sales.value}
+        WHERE total_units_sold >= ?
         {category_condition}
         AND review_tier != 'No Reviews'
         GROUP BY review_tier
         ORDER BY avg_score DESC
-    """).df()
+    """, [min_sales.value] + category_params).df()
 
     review_distribution
     return (review_distribution,)
@@ -489,7 +489,7 @@ def _(mo):
 
 @app.cell
 def _(con, min_sales):
-    delivery_by_category = con.execute(f"""
+    delivery_by_category = con.execute("""
         SELECT
             product_category_name_english as category,
             AVG(on_time_delivery_rate) as avg_on_time_rate,
@@ -497,13 +497,13 @@ def _(con, min_sales):
             SUM(total_units_sold) as total_units,
             AVG(avg_review_score) as avg_review
         FROM marts_product.mart_product_performance
-        WHERE total_units_sold >= {min_sales.value}
+        WHERE total_units_sold >= ?
         AND product_category_name_english IS NOT NULL
         AND on_time_delivery_rate IS NOT NULL
         GROUP BY product_category_name_english
         ORDER BY avg_on_time_rate DESC
         LIMIT 15
-    """).df()
+    """, [min_sales.value]).df()
     return (delivery_by_category,)
 
 
@@ -550,7 +550,7 @@ def _(mo):
 
 
 @app.cell
-def _(category_condition, con, min_sales):
+def _(category_condition, category_params, con, min_sales):
     geographic_reach = con.execute(f"""
         SELECT
             product_category_name_english as category,
@@ -559,13 +559,13 @@ def _(category_condition, con, min_sales):
             SUM(total_units_sold) as total_units,
             AVG(same_state_sales_rate) as avg_same_state_rate
         FROM marts_product.mart_product_performance
-        WHERE total_units_sold >= {min_sales.value}
+        WHERE total_units_sold >= ?
         {category_condition}
         AND product_category_name_english IS NOT NULL
         GROUP BY product_category_name_english
         ORDER BY avg_states_reached DESC
         LIMIT 15
-    """).df()
+    """, [min_sales.value] + category_params).df()
     return (geographic_reach,)
 
 
@@ -7,15 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    return Path, duckdb, go, load_dotenv, make_subplots, mo, os, px
+    return Path, go, make_subplots, mo, px
 
 
 @app.cell
@@ -34,7 +31,7 @@ def _(mo):
     - Q20: Revenue impact of different delivery speeds
     - Q90: Average order value for different payment methods
 
-    **Data Source:** dim_customers & fct_orders
+    **Data Source:** dim_customers, fct_orders & mart_daily_order_cube
 
     **Dataset Period:** 2016-2018
     """)
@@ -42,18 +39,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
-
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
+
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -95,24 +90,24 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Payment method analysis
-    payment_method_query = f"""
+    payment_method_query = """
     SELECT
         primary_payment_method,
-        COUNT(*) as order_count,
-        COUNT(*)::FLOAT / SUM(COUNT(*)) OVER () * 100 as pct_of_orders,
+        SUM(order_count) as order_count,
+        SUM(order_count)::FLOAT / SUM(SUM(order_count)) OVER () * 100 as pct_of_orders,
         SUM(total_payment_value) as total_revenue,
         SUM(total_payment_value)::FLOAT / SUM(SUM(total_payment_value)) OVER () * 100 as pct_of_revenue,
-        AVG(total_payment_value) as avg_order_value,
-        AVG(max_installments) as avg_installments
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        SUM(total_payment_value) / SUM(order_count) as avg_order_value,
+        SUM(max_installments_sum) / SUM(installment_count) as avg_installments
+    FROM core_mart.mart_daily_order_cube
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND primary_payment_method IS NOT NULL
     GROUP BY primary_payment_method
     ORDER BY order_count DESC
     """
 
-    payment_methods = con.execute(payment_method_query).df()
+    payment_methods = con.execute(payment_method_query, [date_range.value[0], date_range.value[1]]).df()
     return (payment_methods,)
 
 
@@ -193,7 +188,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Installment analysis
-    installment_query = f"""
+    installment_query = """
     SELECT
         CASE
             WHEN max_installments = 1 THEN '1x (No installment)'
@@ -207,7 +202,7 @@ def _(con, date_range):
         AVG(total_payment_value) as avg_order_value,
         AVG(max_installments) as avg_installments
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND max_installments IS NOT NULL
     GROUP BY installment_range
@@ -221,7 +216,7 @@ def _(con, date_range):
         END
     """
 
-    installments = con.execute(installment_query).df()
+    installments = con.execute(installment_query, [date_range.value[0], date_range.value[1]]).df()
 
     # Calculate working capital impact (simple proxy)
     installments['working_capital_impact'] = installments['total_revenue'] * (installments['avg_installments'] - 1) / installments['avg_installments']
@@ -291,7 +286,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Order value distribution
-    order_value_dist_query = f"""
+    order_value_dist_query = """
     SELECT
         CASE
             WHEN total_order_value < 50 THEN '< R$ 50'
@@ -308,7 +303,7 @@ def _(con, date_range):
         COUNT(*)::FLOAT / SUM(COUNT(*)) OVER () * 100 as pct_orders,
         SUM(total_order_value)::FLOAT / SUM(SUM(total_order_value)) OVER () * 100 as pct_revenue
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     GROUP BY value_range
     ORDER BY
@@ -323,7 +318,7 @@ def _(con, date_range):
         END
     """
 
-    order_value_dist = con.execute(order_value_dist_query).df()
+    order_value_dist = con.execute(order_value_dist_query, [date_range.value[0], date_range.value[1]]).df()
     return (order_value_dist,)
 
 
@@ -390,7 +385,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Freight cost analysis
-    freight_analysis_query = f"""
+    freight_analysis_query = """
     SELECT
         CASE
             WHEN total_order_value < 100 THEN '< R$ 100'
@@ -403,7 +398,7 @@ def _(con, date_range):
         AVG(total_order_value) as avg_order_value,
         AVG(total_freight::FLOAT / NULLIF(total_order_value, 0) * 100) as avg_freight_pct
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND total_order_value > 0
     GROUP BY order_value_range
@@ -416,7 +411,7 @@ def _(con, date_range):
         END
     """
 
-    freight_analysis = con.execute(freight_analysis_query).df()
+    freight_analysis = con.execute(freight_analysis_query, [date_range.value[0], date_range.value[1]]).df()
     return (freight_analysis,)
 
 
@@ -482,21 +477,21 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Monthly seasonality
-    seasonality_query = f"""
+    seasonality_query = """
     SELECT
         EXTRACT(MONTH FROM order_date) as month_num,
         TO_CHAR(order_date, 'Mon') as month_name,
-        COUNT(*) as order_count,
+        SUM(order_count) as order_count,
         SUM(total_order_value) as total_revenue,
-        AVG(total_order_value) as avg_order_value
-    FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        SUM(total_order_value) / SUM(order_count) as avg_order_value
+    FROM core_mart.mart_daily_order_cube
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     GROUP BY EXTRACT(MONTH FROM order_date), TO_CHAR(order_date, 'Mon')
     ORDER BY month_num
     """
 
-    seasonality = con.execute(seasonality_query).df()
+    seasonality = con.execute(seasonality_query, [date_range.value[0], date_range.value[1]]).df()
     return (seasonality,)
 
 
@@ -563,7 +558,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Customer LTV analysis
-    ltv_query = f"""
+    ltv_query = """
     WITH customer_orders AS (
         SELECT
             customer_id,
@@ -574,7 +569,7 @@ def _(con, date_range):
             MAX(order_date) as last_order_date,
             DATE_DIFF('day', MIN(order_date), MAX(order_date)) as customer_tenure_days
         FROM core_core.fct_orders
-        WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+        WHERE order_date BETWEEN ? AND ?
         AND is_delivered = TRUE
         GROUP BY customer_id
     )
@@ -603,7 +598,7 @@ def _(con, date_range):
         END
     """
 
-    ltv_analysis = con.execute(ltv_query).df()
+    ltv_analysis = con.execute(ltv_query, [date_range.value[0], date_range.value[1]]).df()
     return (ltv_analysis,)
 
 
@@ -669,7 +664,7 @@ def _(mo):
 @app.cell
 def _(con, date_range):
     # Delivery speed revenue impact
-    delivery_revenue_query = f"""
+    delivery_revenue_query = """
     SELECT
         CASE
             WHEN days_to_delivery < 7 THEN '< 7 days (Fast)'
@@ -684,7 +679,7 @@ def _(con, date_range):
         AVG(review_score) as avg_review_score,
         AVG(total_freight) as avg_freight
     FROM core_core.fct_orders
-    WHERE order_date BETWEEN '{date_range.value[0]}' AND '{date_range.value[1]}'
+    WHERE order_date BETWEEN ? AND ?
     AND is_delivered = TRUE
     AND days_to_delivery IS NOT NULL
     GROUP BY delivery_speed
@@ -698,7 +693,7 @@ def _(con, date_range):
         END
     """
 
-    delivery_revenue = con.execute(delivery_revenue_query).df()
+    delivery_revenue = con.execute(delivery_revenue_query, [date_range.value[0], date_range.value[1]]).df()
     return (delivery_revenue,)
 
 
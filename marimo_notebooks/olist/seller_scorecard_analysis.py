@@ -7,15 +7,12 @@ app = marimo.App(width="medium", auto_download=["html"])
 @app.cell
 def _():
     import marimo as mo
-    import duckdb
     import pandas as pd
     import plotly.express as px
     import plotly.graph_objects as go
     from plotly.subplots import make_subplots
-    import os
     from pathlib import Path
-    from dotenv import load_dotenv
-    return Path, duckdb, go, load_dotenv, make_subplots, mo, os, pd, px
+    return Path, go, make_subplots, mo, pd, px
 
 
 @app.cell
@@ -44,18 +41,16 @@ def _(mo):
 
 
 @app.cell
-def _(Path, duckdb, load_dotenv, os):
-    # Load environment variables from .env file
-    env_path = Path(__file__).parent.parent.parent / '.env'
-    load_dotenv(env_path)
+def _(Path):
+    # Shared data-access module at the repository root
+    # Path: marimo_notebooks/olist/<notebook>.py -> ../../olist_utils
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
 
-    # Configure database for this notebook
-    db_name = 'olist_analytical.duckdb'
-    db_dir = os.getenv('DUCKDB_DIR')
-    db_path = os.path.join(db_dir, db_name)
-
-    # Connect to DuckDB analytical database
-    con = duckdb.connect(database=db_path, read_only=True)
+    # Read-only cursor on the process-wide warehouse connection
+    # (DUCKDB_DIR, DUCKDB_THREADS and DUCKDB_MEMORY_LIMIT come from .env)
+    con = connect()
     return (con,)
 
 
@@ -143,15 +138,20 @@ def _(mo):
 
 @app.cell
 def _(activity_filter, con, health_filter, min_orders, region_filter):
-    # Build filter conditions
+    # Build filter conditions (values are bound as parameters)
     filters = []
+    filter_params = []
     if health_filter.value != 'All':
-        filters.append(f"seller_health = '{health_filter.value}'")
+        filters.append("seller_health = ?")
+        filter_params.append(health_filter.value)
     if activity_filter.value != 'All':
-        filters.append(f"activity_status = '{activity_filter.value}'")
+        filters.append("activity_status = ?")
+        filter_params.append(activity_filter.value)
     if region_filter.value != 'All':
-        filters.append(f"region = '{region_filter.value}'")
-    filters.append(f"total_orders >= {min_orders.value}")
+        filters.append("region = ?")
+        filter_params.append(region_filter.value)
+    filters.append("total_orders >= ?")
+    filter_params.append(min_orders.value)
 
     where_clause = "WHERE " + " AND ".join(filters) if filters else ""
 
@@ -166,10 +166,10 @@ def _(activity_filter, con, health_filter, min_orders, region_filter):
             AVG(overall_performance_score) as avg_performance_score
         FROM marts_seller.mart_seller_scorecard
         {where_clause}
-    """).df()
+    """, filter_params).df()
 
     kpi_data = seller_kpis.iloc[0]
-    return filters, kpi_data, seller_kpis, where_clause
+    return filter_params, filters, kpi_data, seller_kpis, where_clause
 
 
 @app.cell
@@ -196,7 +196,7 @@ def _(mo):
 
 
 @app.cell
-def _(con, where_clause):
+def _(con, filter_params, where_clause):
     top_sellers = con.execute(f"""
         SELECT
             seller_id,
@@ -215,7 +215,7 @@ def _(con, where_clause):
         AND overall_performance_score IS NOT NULL
         ORDER BY overall_performance_score DESC
         LIMIT 20
-    """).df()
+    """, filter_params).df()
 
     top_sellers
     return (top_sellers,)
@@ -267,7 +267,7 @@ def _(mo):
 
 @app.cell
 def _(con, min_orders):
-    health_distribution = con.execute(f"""
+    health_distribution = con.execute("""
         SELECT
             seller_health,
             COUNT(DISTINCT seller_id) as seller_count,
@@ -276,7 +276,7 @@ def _(con, min_orders):
             AVG(avg_review_score) as avg_review,
             AVG(on_time_delivery_rate) as avg_on_time_rate
         FROM marts_seller.mart_seller_scorecard
-        WHERE total_orders >= {min_orders.value}
+        WHERE total_orders >= ?
         GROUP BY seller_health
         ORDER BY
             CASE seller_health
@@ -286,7 +286,7 @@ def _(con, min_orders):
                 WHEN 'Needs Improvement' THEN 4
                 ELSE 5
             END
-    """).df()
+    """, [min_orders.value]).df()
 
     health_distribution
     return (health_distribution,)
@@ -345,7 +345,7 @@ def _(mo):
 
 @app.cell
 def _(con, min_orders):
-    activity_distribution = con.execute(f"""
+    activity_distribution = con.execute("""
         SELECT
             activity_status,
             COUNT(DISTINCT seller_id) as seller_count,
@@ -353,7 +353,7 @@ def _(con, min_orders):
             AVG(orders_last_30_days) as avg_orders_30d,
             AVG(orders_last_90_days) as avg_orders_90d
         FROM marts_seller.mart_seller_scorecard
-        WHERE total_orders >= {min_orders.value}
+        WHERE total_orders >= ?
         GROUP BY activity_status
         ORDER BY
             CASE activity_status
@@ -363,7 +363,7 @@ def _(con, min_orders):
                 WHEN 'Inactive' THEN 4
                 ELSE 5
             END
-    """).df()
+    """, [min_orders.value]).df()
 
     activity_distribution
     return (activity_distribution,)
@@ -404,7 +404,7 @@ def _(mo):
 
 
 @app.cell
-def _(con, where_clause):
+def _(con, filter_params, where_clause):
     revenue_metrics = con.execute(f"""
         SELECT
             seller_performance_tier,
@@ -418,14 +418,14 @@ def _(con, where_clause):
         AND seller_performance_tier IS NOT NULL
         GROUP BY seller_performance_tier
         ORDER BY seller_performance_tier
-    """).df()
+    """, filter_params).df()
 
     revenue_metrics
     return (revenue_metrics,)
 
 
 @app.cell
-def _(con, where_clause):
+def _(con, filter_params, where_clause):
     # Revenue percentile analysis
     revenue_analysis = con.execute(f"""
         SELECT
@@ -441,7 +441,7 @@ def _(con, where_clause):
         AND revenue_percentile IS NOT NULL
         ORDER BY revenue_percentile DESC
         LIMIT 100
-    """).df()
+    """, filter_params).df()
     return (revenue_analysis,)
 
 
@@ -474,7 +474,7 @@ def _(mo):
 
 @app.cell
 def _(con, min_orders):
-    specialization_data = con.execute(f"""
+    specialization_data = con.execute("""
         SELECT
             product_diversity_type,
             COUNT(DISTINCT seller_id) as seller_count,
@@ -483,7 +483,7 @@ def _(con, min_orders):
             AVG(total_revenue) as avg_revenue,
             AVG(avg_review_score) as avg_review
         FROM marts_seller.mart_seller_scorecard
-        WHERE total_orders >= {min_orders.value}
+        WHERE total_orders >= ?
         AND product_diversity_type IS NOT NULL
         GROUP BY product_diversity_type
         ORDER BY
@@ -493,7 +493,7 @@ def _(con, min_orders):
                 WHEN 'Diverse' THEN 3
                 WHEN 'Generalist' THEN 4
             END
-    """).df()
+    """, [min_orders.value]).df()
 
     specialization_data
     return (specialization_data,)
@@ -574,7 +574,7 @@ def _(mo):
 
 @app.cell
 def _(con, min_orders):
-    geographic_data = con.execute(f"""
+    geographic_data = con.execute("""
         SELECT
             region,
             COUNT(DISTINCT seller_id) as seller_count,
@@ -582,11 +582,11 @@ def _(con, min_orders):
             AVG(unique_customer_states) as avg_states_reached,
             AVG(same_state_order_rate) as avg_same_state_rate
         FROM marts_seller.mart_seller_scorecard
-        WHERE total_orders >= {min_orders.value}
+        WHERE total_orders >= ?
         AND region IS NOT NULL
         GROUP BY region
         ORDER BY total_revenue DESC
-    """).df()
+    """, [min_orders.value]).df()
 
     geographic_data
     return (geographic_data,)
@@ -645,7 +645,7 @@ def _(mo):
 
 @app.cell
 def _(con, min_orders):
-    geo_focus_data = con.execute(f"""
+    geo_focus_data = con.execute("""
         SELECT
             geographic_focus,
             COUNT(DISTINCT seller_id) as seller_count,
@@ -653,11 +653,11 @@ def _(con, min_orders):
             AVG(same_state_order_rate) as avg_same_state_rate,
             AVG(unique_customer_states) as avg_states_reached
         FROM marts_seller.mart_seller_scorecard
-        WHERE total_orders >= {min_orders.value}
+        WHERE total_orders >= ?
         AND geographic_focus IS NOT NULL
         GROUP BY geographic_focus
         ORDER BY avg_revenue DESC
-    """).df()
+    """, [min_orders.value]).df()
 
     geo_focus_data
     return (geo_focus_data,)
@@ -698,7 +698,7 @@ def _(mo):
 
 
 @app.cell
-def _(con, where_clause):
+def _(con, filter_params, where_clause):
     performance_scatter = con.execute(f"""
         SELECT
             seller_id,
@@ -712,7 +712,7 @@ def _(con, where_clause):
         {where_clause}
         AND on_time_delivery_rate IS NOT NULL
         AND avg_review_score IS NOT NULL
-    """).df()
+    """, filter_params).df()
     return (performance_scatter,)
 
 
@@ -0,0 +1,47 @@
+"""
+Shared data-access helpers for the Olist marimo notebooks.
+
+Usage (in a notebook under marimo_notebooks/olist/):
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from olist_utils import connect
+
+    con = connect()   # read-only cursor on the shared warehouse connection
+    con.execute("SELECT ... WHERE order_date >= ?", [start]).df()
+    con.query("SELECT ...", [start])   # Polars frame, no pandas conversion
+
+Widget values are bound as ? parameters, never formatted into the SQL, so a
+query keeps one SQL text and its cached results are keyed on the values.
+"""
+
+from olist_utils.cache import CachedConnection, CachedResult, QueryCache
+from olist_utils.connection import (
+    DEFAULT_DB_NAME,
+    ConnectionManager,
+    DirectConnection,
+    close,
+    connect,
+    get_db_path,
+    load_settings,
+    query_cache,
+)
+from olist_utils.profiling import ProfiledConnection, QueryLog
+from olist_utils.results import fetch, to_pandas
+
+__all__ = [
+    "DEFAULT_DB_NAME",
+    "CachedConnection",
+    "CachedResult",
+    "ConnectionManager",
+    "DirectConnection",
+    "ProfiledConnection",
+    "QueryCache",
+    "QueryLog",
+    "close",
+    "connect",
+    "fetch",
+    "get_db_path",
+    "load_settings",
+    "query_cache",
+    "to_pandas",
+]
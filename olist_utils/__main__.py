@@ -0,0 +1,51 @@
+"""
+Self-check for the notebook data layer.
+
+Usage:
+    python -m olist_utils
+"""
+
+import sys
+
+from olist_utils import close, connect, get_db_path, load_settings
+
+
+def main():
+    """Open the warehouse the way the notebooks do and list its tables."""
+    print("=" * 80)
+    print("OLIST UTILS - Warehouse connection check")
+    print("=" * 80)
+
+    settings = load_settings()
+    print(f"\nDUCKDB_DIR:          {settings['db_dir']}")
+    print(f"DUCKDB_THREADS:      {settings['threads'] or 'default'}")
+    print(f"DUCKDB_MEMORY_LIMIT: {settings['memory_limit'] or 'default'}")
+
+    try:
+        db_path = get_db_path()
+        con = connect()
+    except Exception as e:
+        print(f"\n❌ Failed to connect: {e}")
+        sys.exit(1)
+
+    print(f"\n✓ Connected (read-only) to {db_path}")
+
+    tables = con.execute(
+        """
+        SELECT table_schema, table_name, table_type
+        FROM information_schema.tables
+        ORDER BY table_schema, table_name
+        """
+    ).fetchall()
+    for schema, table, table_type in tables:
+        print(f"  {schema + '.' + table:50} {table_type}")
+
+    close()
+
+    print("\n" + "=" * 80)
+    print(f"✅ SUCCESS - {len(tables)} tables and views available")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,549 @@
+"""
+Replay benchmark for the SQL the notebooks run.
+
+Every con.execute(...) / con.query(...) call in the notebooks under
+marimo_notebooks/olist is extracted from the source (ast) and replayed against
+the warehouse outside marimo, so changes to fct_orders and the marts can be
+measured on the queries analysts actually run.
+
+Queries are built the way the notebook builds them. The cells are walked in
+file order and their plain-Python statements (filter lists, WHERE clauses,
+parameter lists) are run with stand-ins for the widgets. Statements that
+touch the connection, marimo or plotting are skipped. Each query's SQL and
+parameter expressions are then evaluated in that namespace. Widget values
+come from scenarios:
+
+    default    the widgets' own default values
+    filtered   a narrow date range (the last FILTERED_DAYS of the widget's
+               range), the first non-default dropdown option and the
+               slider's maximum
+
+Dropdowns whose options come from query results keep their default unless a
+value is given with --set notebook.widget=value.
+
+Each query is timed cold (first run on a freshly opened database, so
+DuckDB's buffer pool is empty; the OS page cache is not flushed) and warm
+(repeated runs on one connection after a warm-up), --repeat times each, and
+reported as p50/p95. Results can be saved as a JSON baseline, and later runs
+compared against it as a regression gate. Queries are identified by notebook,
+a hash of their normalized SQL and scenario (not by line number), so edits
+elsewhere in a notebook keep matching the baseline.
+
+Usage:
+    python -m olist_utils.benchmark --list
+    python -m olist_utils.benchmark --repeat 5 --save-baseline bench.json
+    python -m olist_utils.benchmark executive_dashboard --baseline bench.json \\
+        --fail-on-regression
+"""
+
+import argparse
+import ast
+import json
+import math
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import duckdb
+
+from olist_utils.cache import normalize_sql, query_hash
+from olist_utils.connection import PROJECT_ROOT, get_db_path, load_settings
+
+NOTEBOOK_DIR = PROJECT_ROOT / "marimo_notebooks" / "olist"
+
+SCENARIOS = ("default", "filtered")
+FILTERED_DAYS = 90
+
+# Statements that mention these names are never run during extraction
+SKIPPED_NAMES = {"con", "connect", "mo", "px", "go", "plt", "sns", "make_subplots"}
+QUERY_METHODS = {"execute", "query"}
+
+DEFAULT_REPEAT = 5
+DEFAULT_TIME_RATIO = 1.5
+DEFAULT_MIN_MS = 5.0
+
+
+@dataclass
+class NotebookQuery:
+    """One query call in a notebook, built for one widget scenario."""
+
+    notebook: str
+    line: int
+    scenario: str
+    sql: str = None
+    params: list = field(default_factory=list)
+    error: str = None
+    # Numbers repeats of the same SQL with other parameters in one notebook
+    occurrence: int = 1
+
+    @property
+    def query_id(self):
+        sql_hash = query_hash(self.sql)[:8] if self.sql else f"line{self.line}"
+        query_id = f"{self.notebook}:{sql_hash}:{self.scenario}"
+        if self.occurrence > 1:
+            query_id += f"#{self.occurrence}"
+        return query_id
+
+
+def _names(node):
+    """Every name a statement reads or binds (including import aliases)."""
+    names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            names.add(child.id)
+        elif isinstance(child, ast.alias):
+            names.add((child.asname or child.name).split(".")[0])
+    return names
+
+
+def _query_calls(node):
+    """con.execute(...) / con.query(...) calls inside a statement."""
+    return [
+        child
+        for child in ast.walk(node)
+        if isinstance(child, ast.Call)
+        and isinstance(child.func, ast.Attribute)
+        and child.func.attr in QUERY_METHODS
+        and isinstance(child.func.value, ast.Name)
+        and child.func.value.id == "con"
+        and child.args
+    ]
+
+
+def _widget_call(statement):
+    """(name, kind, keywords) for `name = mo.ui.<kind>(...)`, else None."""
+    if not (
+        isinstance(statement, ast.Assign)
+        and len(statement.targets) == 1
+        and isinstance(statement.targets[0], ast.Name)
+        and isinstance(statement.value, ast.Call)
+    ):
+        return None
+    func = statement.value.func
+    if (
+        isinstance(func, ast.Attribute)
+        and isinstance(func.value, ast.Attribute)
+        and func.value.attr == "ui"
+        and isinstance(func.value.value, ast.Name)
+        and func.value.value.id == "mo"
+    ):
+        keywords = {kw.arg: kw.value for kw in statement.value.keywords if kw.arg}
+        return statement.targets[0].id, func.attr, keywords
+    return None
+
+
+def _cells(tree):
+    """Bodies of the @app.cell functions, in file order."""
+    cells = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and any(
+            isinstance(d, ast.Attribute)
+            and d.attr == "cell"
+            or isinstance(d, ast.Call)
+            and isinstance(d.func, ast.Attribute)
+            and d.func.attr == "cell"
+            for d in node.decorator_list
+        ):
+            cells.append(node.body)
+    return cells
+
+
+def _evaluate(node, namespace):
+    return eval(compile(ast.Expression(node), "<notebook>", "eval"), namespace)
+
+
+def _as_date(value):
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def widget_value(kind, keywords, namespace, scenario, override=None):
+    """Representative value of a widget for a scenario."""
+
+    def keyword(name, default=None):
+        if name not in keywords:
+            return default
+        try:
+            return _evaluate(keywords[name], namespace)
+        except Exception:
+            return default
+
+    if override is not None:
+        return override
+
+    value = keyword("value")
+    if kind == "date_range":
+        start, stop = keyword("start"), keyword("stop")
+        value = tuple(map(_as_date, value or (start, stop)))
+        if scenario == "filtered" and value[1]:
+            value = (value[1] - timedelta(days=FILTERED_DAYS), value[1])
+    elif scenario == "filtered" and kind in ("dropdown", "radio"):
+        options = keyword("options") or []
+        options = list(options.values() if isinstance(options, dict) else options)
+        value = next((option for option in options if option != value), value)
+    elif scenario == "filtered" and kind in ("slider", "number"):
+        value = keyword("stop", value)
+    return value
+
+
+def extract_queries(notebook, scenario="default", overrides=None):
+    """Build every query of one notebook for one widget scenario."""
+    notebook = Path(notebook)
+    overrides = overrides or {}
+    tree = ast.parse(notebook.read_text(), filename=str(notebook))
+    namespace = {"__builtins__": __builtins__}
+    queries = []
+
+    for cell in _cells(tree):
+        for statement in cell:
+            calls = _query_calls(statement)
+            if calls:
+                for call in calls:
+                    query = NotebookQuery(notebook.stem, call.lineno, scenario)
+                    try:
+                        query.sql = _evaluate(call.args[0], namespace)
+                        if len(call.args) > 1:
+                            query.params = list(_evaluate(call.args[1], namespace))
+                    except Exception as e:
+                        query.error = f"{type(e).__name__}: {e}"
+                    queries.append(query)
+                continue
+
+            widget = _widget_call(statement)
+            if widget:
+                name, kind, keywords = widget
+                namespace[name] = SimpleNamespace(
+                    value=widget_value(
+                        kind, keywords, namespace, scenario, overrides.get(name)
+                    )
+                )
+                continue
+
+            if isinstance(statement, ast.Return) or _names(statement) & SKIPPED_NAMES:
+                continue
+            try:
+                exec(
+                    compile(ast.Module([statement], []), str(notebook), "exec"),
+                    namespace,
+                )
+            except Exception:
+                # Depends on a query result or a skipped statement
+                continue
+
+    return queries
+
+
+def collect_queries(notebooks, scenarios=SCENARIOS, overrides=None):
+    """Extract the queries of every notebook and scenario, deduplicated."""
+    overrides = overrides or {}
+    queries, seen, occurrences = [], set(), {}
+    for notebook in notebooks:
+        for scenario in scenarios:
+            for query in extract_queries(
+                notebook, scenario, overrides.get(Path(notebook).stem)
+            ):
+                key = (
+                    query.notebook,
+                    normalize_sql(query.sql) if query.sql else query.line,
+                    json.dumps(query.params, default=str),
+                )
+                if key in seen:
+                    continue
+                seen.add(key)
+                occurrence = occurrences.get(query.query_id, 0) + 1
+                occurrences[query.query_id] = occurrence
+                query.occurrence = occurrence
+                queries.append(query)
+    return queries
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def _open(db_path, settings):
+    config = {}
+    if settings["threads"]:
+        config["threads"] = int(settings["threads"])
+    if settings["memory_limit"]:
+        config["memory_limit"] = settings["memory_limit"]
+    return duckdb.connect(database=str(db_path), read_only=True, config=config)
+
+
+def _timed_run(cursor, query):
+    started = time.perf_counter()
+    table = cursor.execute(query.sql, query.params).fetch_arrow_table()
+    return (time.perf_counter() - started) * 1000, table.num_rows
+
+
+def benchmark_query(query, db_path, repeat=DEFAULT_REPEAT, settings=None):
+    """
+    Time one query cold and warm; returns a result dict.
+
+    Queries run with cursor.execute(sql, params), as in the notebooks (without
+    the query cache). Cold samples each open the database afresh; warm samples
+    reuse one connection after a warm-up run.
+    """
+    settings = settings or load_settings()
+    cold = []
+    for _ in range(repeat):
+        con = _open(db_path, settings)
+        try:
+            elapsed, rows = _timed_run(con.cursor(), query)
+        finally:
+            con.close()
+        cold.append(elapsed)
+
+    con = _open(db_path, settings)
+    try:
+        cursor = con.cursor()
+        _timed_run(cursor, query)
+        warm = [_timed_run(cursor, query)[0] for _ in range(repeat)]
+    finally:
+        con.close()
+
+    return {
+        "query_id": query.query_id,
+        "notebook": query.notebook,
+        "line": query.line,
+        "scenario": query.scenario,
+        "rows": rows,
+        "cold_p50_ms": percentile(cold, 50),
+        "cold_p95_ms": percentile(cold, 95),
+        "warm_p50_ms": percentile(warm, 50),
+        "warm_p95_ms": percentile(warm, 95),
+    }
+
+
+def compare_to_baseline(
+    results, baseline, time_ratio=DEFAULT_TIME_RATIO, min_ms=DEFAULT_MIN_MS
+):
+    """
+    Flag queries slower than their baseline.
+
+    A query regresses when its cold or warm p50 is more than time_ratio x
+    the baseline p50 and at least min_ms slower. Returns (result, metric,
+    baseline_ms) tuples.
+    """
+    baseline = {result["query_id"]: result for result in baseline}
+    regressions = []
+    for result in results:
+        before = baseline.get(result["query_id"])
+        if before is None:
+            continue
+        for metric in ("cold_p50_ms", "warm_p50_ms"):
+            if (
+                result[metric] > before[metric] * time_ratio
+                and result[metric] - before[metric] >= min_ms
+            ):
+                regressions.append((result, metric, before[metric]))
+    return regressions
+
+
+def find_notebooks(names=None):
+    """Notebook paths to benchmark: all of them, or the given names (no .py)."""
+    available = {path.stem: path for path in sorted(NOTEBOOK_DIR.glob("*.py"))}
+    if not names:
+        return list(available.values())
+    unknown = [name for name in names if name.removesuffix(".py") not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown notebook(s): {', '.join(unknown)} "
+            f"(available: {', '.join(available)})"
+        )
+    return [available[name.removesuffix(".py")] for name in names]
+
+
+def parse_overrides(assignments):
+    """--set notebook.widget=value pairs -> {notebook: {widget: value}}."""
+    overrides = {}
+    for assignment in assignments or []:
+        target, _, value = assignment.partition("=")
+        notebook, _, widget = target.partition(".")
+        if not widget or not value:
+            raise ValueError(f"Expected notebook.widget=value, got {assignment!r}")
+        overrides.setdefault(notebook, {})[widget] = value
+    return overrides
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Replay the notebooks' SQL against the warehouse and time it"
+    )
+    parser.add_argument(
+        "notebooks",
+        nargs="*",
+        help="Notebook names to benchmark (default: all in marimo_notebooks/olist)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Cold and warm runs per query (default: {DEFAULT_REPEAT})",
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=SCENARIOS,
+        default=list(SCENARIOS),
+        help="Widget scenarios to build the queries for (default: all)",
+    )
+    parser.add_argument(
+        "--set",
+        dest="overrides",
+        action="append",
+        metavar="NOTEBOOK.WIDGET=VALUE",
+        help="Widget value for the filtered scenario (repeatable)",
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="Only list the extracted queries, do not run them",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=Path,
+        help="Write the results to this JSON file",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        help="Compare against results saved with --save-baseline",
+    )
+    parser.add_argument(
+        "--time-ratio",
+        type=float,
+        default=DEFAULT_TIME_RATIO,
+        help=f"Flag when p50 > ratio x baseline (default: {DEFAULT_TIME_RATIO})",
+    )
+    parser.add_argument(
+        "--min-ms",
+        type=float,
+        default=DEFAULT_MIN_MS,
+        help=f"Ignore slowdowns smaller than this (default: {DEFAULT_MIN_MS})",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with status 1 when any query regressed",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Extract, replay and report the notebook queries."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("OLIST UTILS - Notebook query benchmark")
+    print("=" * 80)
+
+    try:
+        notebooks = find_notebooks(args.notebooks)
+        overrides = parse_overrides(args.overrides)
+    except ValueError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+
+    queries = collect_queries(notebooks, args.scenarios, overrides)
+    runnable = [query for query in queries if query.error is None]
+    print(
+        f"\n✓ Extracted {len(queries)} queries from {len(notebooks)} notebooks "
+        f"({len(queries) - len(runnable)} could not be built)"
+    )
+    for query in queries:
+        if query.error:
+            print(f"  ⚠️  {query.query_id}: {query.error}")
+
+    if args.list:
+        for query in runnable:
+            print(f"\n-- {query.query_id}  params={query.params}")
+            print(normalize_sql(query.sql))
+        return
+
+    try:
+        db_path = get_db_path()
+    except RuntimeError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+    if not db_path.exists():
+        print(f"\n❌ Warehouse not found: {db_path}")
+        sys.exit(1)
+
+    print(f"\nWarehouse: {db_path} (read-only), {args.repeat} runs per query\n")
+    print(
+        f"  {'query':52} {'rows':>9} {'cold p50':>9} {'cold p95':>9} "
+        f"{'warm p50':>9} {'warm p95':>9}"
+    )
+
+    settings = load_settings()
+    results, failed = [], []
+    for query in runnable:
+        try:
+            result = benchmark_query(query, db_path, args.repeat, settings)
+        except duckdb.Error as e:
+            failed.append(query)
+            print(f"  ❌ {query.query_id}: {e}")
+            continue
+        results.append(result)
+        print(
+            f"  {result['query_id']:52} {result['rows']:>9,} "
+            f"{result['cold_p50_ms']:8.1f}ms {result['cold_p95_ms']:8.1f}ms "
+            f"{result['warm_p50_ms']:8.1f}ms {result['warm_p95_ms']:8.1f}ms"
+        )
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ Saved {len(results)} results to {args.save_baseline}")
+
+    regressions, unmatched = [], False
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(
+            results, baseline, args.time_ratio, args.min_ms
+        )
+        known = {result["query_id"] for result in baseline}
+        missing = [result for result in results if result["query_id"] not in known]
+        unmatched = bool(results) and len(missing) == len(results)
+        print(f"\n✓ Compared against {args.baseline}")
+        if missing:
+            print(
+                f"  ⚠️  {len(missing)} of {len(results)} queries have no baseline "
+                "entry (new or changed SQL) and were not compared"
+            )
+        for result, metric, before in regressions:
+            print(
+                f"  ❌ {result['query_id']:52} {metric} {result[metric]:.1f}ms "
+                f"(baseline {before:.1f}ms)"
+            )
+
+    total_warm = sum(result["warm_p50_ms"] for result in results)
+    print("\n" + "=" * 80)
+    print(f"Sum of warm p50: {total_warm:,.1f}ms over {len(results)} queries")
+    if failed:
+        print(f"❌ FAILED - {len(failed)} queries errored")
+    elif regressions:
+        print(f"⚠️  REGRESSIONS FOUND - {len(regressions)} slower than baseline")
+    elif unmatched:
+        print("⚠️  NOT COMPARED - no query matches the baseline; save a new one")
+    else:
+        print(f"✅ SUCCESS - {len(results)} queries benchmarked")
+    print("=" * 80)
+
+    if failed or (args.fail_on_regression and (regressions or unmatched)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Query result cache for the notebook connection.
+
+Notebook cells re-run their SQL whenever a widget changes, including when a
+user flips back to a date range they have already looked at. Results are
+cached as Arrow tables keyed on:
+
+- the SQL text with whitespace normalized
+- the bound parameters
+- the warehouse version: the database file's (and its WAL's) size and mtime,
+  plus the latest dbt invocation_id logged in core_monitoring.dbt_run_history
+  when there is one, so a new dbt build invalidates every cached result even
+  when it was not logged
+
+There are two tiers: an in-memory LRU shared by every notebook in the process,
+and an optional on-disk tier of Arrow IPC files (memory-mapped on read) under
+OLIST_QUERY_CACHE_DIR/<warehouse version>/, which survives kernel restarts and
+is shared between processes.
+
+Only read queries (SELECT / WITH / FROM / VALUES) are cached; everything else
+goes straight to the cursor. Pass widget values as ? parameters rather than
+formatting them into the SQL, so every value of the widget shares one
+normalized SQL text and the key differs only in its parameters.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from olist_utils.results import fetch
+
+CACHEABLE_PREFIXES = ("select", "with", "from", "values", "(")
+VERSION_CHECK_SECONDS = 5.0
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(sql):
+    """Collapse whitespace so formatting-only differences share a cache key."""
+    return _WHITESPACE.sub(" ", sql).strip().rstrip(";").strip()
+
+
+def is_cacheable(sql):
+    """Whether a statement is a read query whose result can be cached."""
+    return normalize_sql(sql).lower().startswith(CACHEABLE_PREFIXES)
+
+
+def query_hash(sql):
+    """Short stable hash of the normalized SQL text (parameters excluded)."""
+    return hashlib.sha256(normalize_sql(sql).encode()).hexdigest()[:16]
+
+
+def cache_key(sql, params, version):
+    """Stable key for (normalized SQL, parameters, warehouse version)."""
+    payload = json.dumps(
+        [normalize_sql(sql), params, version], default=str, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def warehouse_version(cursor, db_path):
+    """
+    Version stamp of the warehouse.
+
+    Always includes the size and mtime of the database file and its WAL:
+    plain dbt build/run does not call log_run_results.py, so the logged
+    invocation_id alone would not change after an unlogged rebuild. The
+    latest logged invocation_id is appended when the monitoring tables have
+    one.
+    """
+    parts = []
+    for path in (Path(db_path), Path(f"{db_path}.wal")):
+        if path.exists():
+            stat = path.stat()
+            parts.append(f"{stat.st_size}-{stat.st_mtime_ns}")
+    version = "file-" + "-".join(parts)
+
+    try:
+        row = cursor.execute(
+            """
+            SELECT invocation_id
+            FROM core_monitoring.dbt_run_history
+            ORDER BY run_started_at DESC
+            LIMIT 1
+            """
+        ).fetchone()
+        if row and row[0]:
+            version = f"{version}-{row[0]}"
+    except Exception:
+        pass
+
+    return version
+
+
+class QueryCache:
+    """In-memory LRU of Arrow tables with an optional on-disk Arrow IPC tier."""
+
+    def __init__(self, max_entries=256, cache_dir=None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+
+    @property
+    def version(self):
+        """Warehouse version the cached entries belong to."""
+        return self._version
+
+    def set_version(self, version):
+        """Drop every entry cached for an older warehouse version."""
+        with self._lock:
+            if version == self._version:
+                return
+            self._entries.clear()
+            self._version = version
+
+        if self.cache_dir and self.cache_dir.exists():
+            for version_dir in self.cache_dir.iterdir():
+                if version_dir.is_dir() and version_dir.name != _safe_name(version):
+                    shutil.rmtree(version_dir, ignore_errors=True)
+
+    def _disk_path(self, key):
+        return self.cache_dir / _safe_name(self._version) / f"{key}.arrow"
+
+    def get(self, key):
+        """Return the cached Arrow table for key, or None."""
+        with self._lock:
+            table = self._entries.get(key)
+            if table is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return table
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            if path.exists():
+                table = feather.read_table(path, memory_map=True)
+                self._remember(key, table)
+                with self._lock:
+                    self.hits += 1
+                return table
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, table):
+        """Cache an Arrow table in memory (and on disk when configured)."""
+        self._remember(key, table)
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            feather.write_feather(table, tmp_path, compression="uncompressed")
+            tmp_path.replace(path)
+
+    def _remember(self, key, table):
+        with self._lock:
+            self._entries[key] = table
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Empty both tiers."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+        if self.cache_dir and self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def info(self):
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {
+                "version": self._version,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "cache_dir": str(self.cache_dir) if self.cache_dir else None,
+            }
+
+
+def _decimals_to_float(table):
+    """
+    Cast top-level DECIMAL columns to float64.
+
+    DuckDB stores SUM(int) as HUGEINT and SUM(decimal) as DECIMAL, which both
+    reach Arrow as decimal128 and would become object columns of Python
+    Decimals in to_pandas(). DuckDB's own .df() returns float64 for them, so
+    cached and uncached results get the same dtypes.
+    """
+    for i, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            table = table.set_column(
+                i, field.with_type(pa.float64()), table.column(i).cast(pa.float64())
+            )
+    return table
+
+
+def _safe_name(version):
+    """Directory-safe form of a version stamp."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(version))
+
+
+class CachedResult:
+    """Materialized query result with the DuckDB result accessors notebooks use."""
+
+    def __init__(self, table, from_cache=False):
+        self._table = table
+        self.from_cache = from_cache
+
+    def arrow(self):
+        return self._table
+
+    def fetch_arrow_table(self):
+        return self._table
+
+    def df(self):
+        # split_blocks skips consolidating same-typed columns into one 2-D block,
+        # so numeric columns are converted without an extra copy
+        return _decimals_to_float(self._table).to_pandas(split_blocks=True)
+
+    def pl(self):
+        import polars as pl
+
+        return pl.from_arrow(self._table)
+
+    def fetchall(self):
+        return [tuple(row.values()) for row in self._table.to_pylist()]
+
+    def fetchone(self):
+        rows = self._table.slice(0, 1).to_pylist()
+        return tuple(rows[0].values()) if rows else None
+
+
+class CachedConnection:
+    """
+    Cursor wrapper that serves repeated read queries from a QueryCache.
+
+    execute() returns a CachedResult for read queries (so .df(), .arrow(),
+    .pl(), .fetchall() and .fetchone() keep working) and the cursor itself for
+    anything else. Other attributes are forwarded to the cursor.
+    """
+
+    def __init__(self, cursor, cache, db_path):
+        self._cursor = cursor
+        self._cache = cache
+        self._db_path = db_path
+        self._version_checked_at = 0.0
+
+    def _refresh_version(self):
+        now = time.monotonic()
+        if now - self._version_checked_at >= VERSION_CHECK_SECONDS:
+            self._cache.set_version(warehouse_version(self._cursor, self._db_path))
+            self._version_checked_at = now
+
+    def query(self, sql, params=None, result_format=None):
+        """Run a read query and return a Polars frame (see results.py)."""
+        return fetch(self.execute(sql, params), result_format)
+
+    def execute(self, sql, params=None):
+        if not is_cacheable(sql):
+            return self._cursor.execute(sql, params)
+
+        self._refresh_version()
+        key = cache_key(sql, params, self._cache.version)
+        table = self._cache.get(key)
+        if table is not None:
+            return CachedResult(table, from_cache=True)
+
+        table = self._cursor.execute(sql, params).fetch_arrow_table()
+        self._cache.put(key, table)
+        return CachedResult(table)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
@@ -0,0 +1,194 @@
+"""
+Process-wide, read-only DuckDB connection for the Olist notebooks.
+
+Every notebook used to load .env, build the database path from DUCKDB_DIR and
+call duckdb.connect(read_only=True) itself, so each open notebook paid for its
+own connect and its own buffer pool. Here the database is opened once per
+process, lazily on first use, and every caller gets a cursor on that shared
+instance: cursors share the catalog and buffer pool but are safe to use from
+different threads. Each thread reuses its own cursor, so the cells of one
+notebook session share a cursor while concurrent sessions do not.
+
+Read queries are served through a process-wide QueryCache (see cache.py)
+unless connect(cache=False) is used.
+
+Settings come from the repository .env file:
+    DUCKDB_DIR            directory holding the .duckdb files (required)
+    DUCKDB_THREADS        DuckDB worker threads (optional)
+    DUCKDB_MEMORY_LIMIT   e.g. "4GB" (optional)
+    OLIST_QUERY_CACHE     set to 0 to disable the query cache (default: on)
+    OLIST_QUERY_CACHE_SIZE      cached results kept in memory (default: 256)
+    OLIST_QUERY_CACHE_DIR       enables the on-disk Arrow tier (optional)
+    OLIST_RESULT_FORMAT   con.query() result: polars (default), arrow or pandas
+    OLIST_CELL_TIMINGS    JSONL path for per-cell timings (set by export.py)
+    OLIST_QUERY_LOG       JSONL path for per-query profiling (optional)
+    OLIST_QUERY_EXPLAIN   set to 1 to also log EXPLAIN ANALYZE profiles
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import duckdb
+from dotenv import load_dotenv
+
+from olist_utils.cache import CachedConnection, QueryCache
+from olist_utils.profiling import ProfiledConnection, query_log
+from olist_utils.results import fetch
+from olist_utils.timing import install_cell_timer
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ENV_PATH = PROJECT_ROOT / ".env"
+DEFAULT_DB_NAME = "olist_analytical.duckdb"
+
+
+def load_settings():
+    """Read the DuckDB settings from .env (already-set env vars win)."""
+    load_dotenv(ENV_PATH)
+    return {
+        "db_dir": os.getenv("DUCKDB_DIR"),
+        "threads": os.getenv("DUCKDB_THREADS"),
+        "memory_limit": os.getenv("DUCKDB_MEMORY_LIMIT"),
+        "query_cache": os.getenv("OLIST_QUERY_CACHE", "1") not in ("0", "false", "no"),
+        "query_cache_size": int(os.getenv("OLIST_QUERY_CACHE_SIZE", "256")),
+        "query_cache_dir": os.getenv("OLIST_QUERY_CACHE_DIR"),
+    }
+
+
+def get_db_path(db_name=DEFAULT_DB_NAME):
+    """Resolve a database file name against DUCKDB_DIR."""
+    db_dir = load_settings()["db_dir"]
+    if not db_dir:
+        raise RuntimeError(f"DUCKDB_DIR is not set (checked {ENV_PATH})")
+    return Path(db_dir) / db_name
+
+
+class ConnectionManager:
+    """Lazily opened read-only DuckDB databases, one per file, per process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connections = {}
+        self._local = threading.local()
+        self._query_cache = None
+
+    @property
+    def query_cache(self):
+        """Process-wide QueryCache, created on first use from .env settings."""
+        with self._lock:
+            if self._query_cache is None:
+                settings = load_settings()
+                self._query_cache = QueryCache(
+                    max_entries=settings["query_cache_size"],
+                    cache_dir=settings["query_cache_dir"],
+                )
+            return self._query_cache
+
+    def _open(self, db_path, threads=None, memory_limit=None):
+        """Open (once) the shared read-only connection for db_path."""
+        with self._lock:
+            if db_path not in self._connections:
+                settings = load_settings()
+                config = {}
+                threads = threads or settings["threads"]
+                memory_limit = memory_limit or settings["memory_limit"]
+                if threads:
+                    config["threads"] = int(threads)
+                if memory_limit:
+                    config["memory_limit"] = memory_limit
+
+                self._connections[db_path] = duckdb.connect(
+                    database=str(db_path), read_only=True, config=config
+                )
+            return self._connections[db_path]
+
+    def cursor(self, db_name=DEFAULT_DB_NAME, threads=None, memory_limit=None):
+        """
+        Return this thread's cursor on the shared connection for db_name.
+
+        threads/memory_limit override .env, but only when the database is
+        opened; later calls reuse the already-open instance.
+        """
+        db_path = get_db_path(db_name)
+        cursors = self._local.__dict__.setdefault("cursors", {})
+        cursor = cursors.get(db_path)
+        if cursor is None:
+            cursor = self._open(db_path, threads, memory_limit).cursor()
+            cursors[db_path] = cursor
+        return cursor
+
+    def is_open(self, db_name=DEFAULT_DB_NAME):
+        """Whether the database has been opened in this process."""
+        return get_db_path(db_name) in self._connections
+
+    def close(self):
+        """Close every shared connection (and with it all cursors)."""
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+class DirectConnection:
+    """
+    Cursor wrapper used by connect(cache=False): execute() returns the DuckDB
+    cursor as usual and query() adds the Polars/Arrow result path. Other
+    attributes are forwarded to the cursor.
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def query(self, sql, params=None, result_format=None):
+        """Run a read query and return a Polars frame (see results.py)."""
+        return fetch(self.execute(sql, params), result_format)
+
+    def execute(self, sql, params=None):
+        return self._cursor.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+_manager = ConnectionManager()
+
+
+def connect(db_name=DEFAULT_DB_NAME, threads=None, memory_limit=None, cache=None):
+    """
+    Return a read-only cursor on the process-wide connection to db_name.
+
+    Drop-in for duckdb.connect(database=db_path, read_only=True) in notebooks.
+    Pass widget values as ? parameters:
+    con.execute("... WHERE order_date >= ?", [start]). With the query cache on
+    (cache=None follows OLIST_QUERY_CACHE), repeated read queries are answered
+    from the cache.
+    """
+    # Per-cell timings for headless exports (only when OLIST_CELL_TIMINGS is set)
+    install_cell_timer()
+
+    cursor = _manager.cursor(db_name, threads=threads, memory_limit=memory_limit)
+    if cache is None:
+        cache = load_settings()["query_cache"]
+    if cache:
+        connection = CachedConnection(
+            cursor, _manager.query_cache, get_db_path(db_name)
+        )
+    else:
+        connection = DirectConnection(cursor)
+
+    # Per-query profiling (only when OLIST_QUERY_LOG is set)
+    log = query_log()
+    if log is not None:
+        return ProfiledConnection(connection, log)
+    return connection
+
+
+def query_cache():
+    """The process-wide QueryCache (e.g. query_cache().info() or .clear())."""
+    return _manager.query_cache
+
+
+def close():
+    """Close the process-wide connections."""
+    _manager.close()
@@ -0,0 +1,237 @@
+"""
+Batch HTML export of the Olist notebooks.
+
+Renders every notebook in marimo_notebooks/olist (or the ones named on the
+command line) to marimo_notebooks/olist/__marimo__/<notebook>.html, running
+one `marimo export html` process per notebook, several at a time, so a
+refresh takes about as long as the slowest notebook instead of the sum.
+
+All exports read the same warehouse file read-only and share one on-disk
+query cache (OLIST_QUERY_CACHE_DIR), so a query already answered for one
+notebook is read back as Arrow by the others. DuckDB threads are split
+between the concurrent exports. Per-cell timings are written to
+__marimo__/timings/<notebook>.jsonl (see timing.py).
+
+Usage:
+    python -m olist_utils.export
+    python -m olist_utils.export executive_dashboard revenue_financial_analysis
+    python -m olist_utils.export --workers 4 --cache-dir /tmp/olist_cache
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from olist_utils.connection import PROJECT_ROOT, get_db_path, load_settings
+from olist_utils.timing import read_cell_timings
+
+NOTEBOOK_DIR = PROJECT_ROOT / "marimo_notebooks" / "olist"
+EXPORT_DIR = NOTEBOOK_DIR / "__marimo__"
+
+
+def find_notebooks(names=None, notebook_dir=NOTEBOOK_DIR):
+    """Notebook paths to export: all of them, or the given names (no .py)."""
+    available = {path.stem: path for path in sorted(notebook_dir.glob("*.py"))}
+    if not names:
+        return list(available.values())
+
+    unknown = [name for name in names if name.removesuffix(".py") not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown notebook(s): {', '.join(unknown)} "
+            f"(available: {', '.join(available)})"
+        )
+    return [available[name.removesuffix(".py")] for name in names]
+
+
+def export_notebook(notebook, out_dir, env, include_code=True):
+    """Run `marimo export html` for one notebook; returns a result dict."""
+    html_path = out_dir / f"{notebook.stem}.html"
+    timings_path = out_dir / "timings" / f"{notebook.stem}.jsonl"
+    timings_path.unlink(missing_ok=True)
+
+    command = ["marimo", "export", "html", str(notebook), "-o", str(html_path)]
+    if not include_code:
+        command.append("--no-include-code")
+
+    notebook_env = dict(
+        env,
+        OLIST_CELL_TIMINGS=str(timings_path),
+        OLIST_EXPORT_NOTEBOOK=notebook.stem,
+    )
+
+    started = time.perf_counter()
+    completed = subprocess.run(
+        command, env=notebook_env, capture_output=True, text=True, cwd=NOTEBOOK_DIR
+    )
+    elapsed = time.perf_counter() - started
+
+    return {
+        "notebook": notebook.stem,
+        "html_path": html_path,
+        "ok": completed.returncode == 0,
+        "elapsed_seconds": elapsed,
+        "stderr": completed.stderr.strip(),
+        "cell_timings": read_cell_timings(timings_path),
+    }
+
+
+def export_notebooks(
+    notebooks, out_dir=EXPORT_DIR, workers=None, cache_dir=None, include_code=True
+):
+    """
+    Export notebooks concurrently; returns the per-notebook results.
+
+    Each export is its own `marimo export` process, so the pool only needs
+    threads to wait on them. Without a cache_dir (argument or
+    OLIST_QUERY_CACHE_DIR) a temporary shared cache is used for this batch.
+
+    Paths are resolved here because marimo runs with cwd=NOTEBOOK_DIR.
+    """
+    settings = load_settings()
+    out_dir = Path(out_dir).resolve()
+    workers = max(1, min(workers or os.cpu_count() or 1, len(notebooks)))
+    (out_dir / "timings").mkdir(parents=True, exist_ok=True)
+
+    cache_dir = cache_dir or settings["query_cache_dir"]
+    temporary_cache = cache_dir is None
+    if temporary_cache:
+        cache_dir = tempfile.mkdtemp(prefix="olist_export_cache_")
+    cache_dir = Path(cache_dir).resolve()
+
+    env = dict(os.environ, OLIST_QUERY_CACHE="1", OLIST_QUERY_CACHE_DIR=str(cache_dir))
+    if not settings["threads"]:
+        # Split the cores between the concurrent exports instead of
+        # letting every DuckDB instance use all of them
+        env["DUCKDB_THREADS"] = str(max(1, (os.cpu_count() or 1) // workers))
+
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(export_notebook, nb, out_dir, env, include_code): nb
+                for nb in notebooks
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                status = "✓" if result["ok"] else "❌"
+                print(
+                    f"  {status} {result['notebook']:40} "
+                    f"{result['elapsed_seconds']:8.2f}s"
+                )
+                results.append(result)
+    finally:
+        if temporary_cache:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    return sorted(results, key=lambda r: r["notebook"])
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Export the Olist marimo notebooks to HTML concurrently"
+    )
+    parser.add_argument(
+        "notebooks",
+        nargs="*",
+        help="Notebook names to export (default: all in marimo_notebooks/olist)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Concurrent exports (default: CPU count, at most one per notebook)",
+    )
+    parser.add_argument(
+        "--out-dir",
+        default=str(EXPORT_DIR),
+        help="HTML output directory (default: marimo_notebooks/olist/__marimo__)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Shared on-disk query cache (default: OLIST_QUERY_CACHE_DIR or a "
+        "temporary directory for this batch)",
+    )
+    parser.add_argument(
+        "--no-include-code",
+        action="store_true",
+        help="Leave the notebook code out of the HTML",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """Export the notebooks and print per-notebook and slowest-cell timings."""
+    args = parse_args()
+
+    print("=" * 80)
+    print("OLIST UTILS - Batch notebook export")
+    print("=" * 80)
+
+    if shutil.which("marimo") is None:
+        print("\n❌ marimo is not installed (pip install -r requirements.txt)")
+        sys.exit(1)
+
+    try:
+        notebooks = find_notebooks(args.notebooks)
+        db_path = get_db_path()
+    except (ValueError, RuntimeError) as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+
+    if not db_path.exists():
+        print(f"\n❌ Warehouse not found: {db_path}")
+        sys.exit(1)
+
+    out_dir = Path(args.out_dir).resolve()
+    print(f"\nWarehouse:  {db_path} (read-only)")
+    print(f"Notebooks:  {len(notebooks)}")
+    print(f"Output:     {out_dir}\n")
+
+    started = time.perf_counter()
+    results = export_notebooks(
+        notebooks,
+        out_dir=out_dir,
+        workers=args.workers,
+        cache_dir=args.cache_dir,
+        include_code=not args.no_include_code,
+    )
+    wall_clock = time.perf_counter() - started
+    sum_of_exports = sum(r["elapsed_seconds"] for r in results)
+
+    cells = [cell for r in results for cell in r["cell_timings"]]
+    if cells:
+        print("\nSlowest cells:")
+        for cell in sorted(cells, key=lambda c: -c["elapsed_seconds"])[:10]:
+            print(
+                f"  {cell['notebook']:40} cell {cell['cell_id']:8} "
+                f"{cell['elapsed_seconds']:8.2f}s"
+            )
+
+    failed = [r for r in results if not r["ok"]]
+    for result in failed:
+        print(f"\n❌ {result['notebook']} failed:\n{result['stderr'][-2000:]}")
+
+    print("\n" + "=" * 80)
+    print(
+        f"Batch wall clock: {wall_clock:.2f}s "
+        f"(sum of notebook exports: {sum_of_exports:.2f}s)"
+    )
+    if failed:
+        print(f"❌ FAILED - {len(failed)} of {len(results)} notebooks did not export")
+        print("=" * 80)
+        sys.exit(1)
+    print(f"✅ SUCCESS - {len(results)} notebooks exported")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
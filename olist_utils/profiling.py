@@ -0,0 +1,143 @@
+"""
+Per-query instrumentation for the notebook connection.
+
+When OLIST_QUERY_LOG points to a JSONL file, connect() wraps the connection
+in a ProfiledConnection that records, for every read query:
+
+- the notebook file and marimo cell it was issued from (found by walking the
+  stack for the cell's __marimo__cell_<cell_id>_ code object)
+- wall time, rows and Arrow bytes returned, and whether the query cache
+  answered it
+- optionally (OLIST_QUERY_EXPLAIN=1) the EXPLAIN ANALYZE profile, collected
+  by running cache misses a second time
+
+The warehouse is opened read-only by notebooks, so records are appended to
+the JSONL file; dbt/olist_dw_dbt/monitoring/log_notebook_queries.py loads
+them into core_monitoring.notebook_query_history.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from olist_utils.cache import CachedResult, is_cacheable, normalize_sql, query_hash
+from olist_utils.results import fetch
+
+MAX_SQL_LENGTH = 4000
+
+_CELL_FILENAME = re.compile(r"__marimo__cell_(?P<cell_id>[^_]+)_")
+_SESSION_ID = uuid.uuid4().hex
+
+
+def current_cell():
+    """Return (notebook, cell_id) of the marimo cell on the call stack."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        match = _CELL_FILENAME.search(frame.f_code.co_filename)
+        if match:
+            notebook = frame.f_globals.get("__file__")
+            notebook = os.path.basename(notebook) if notebook else None
+            return notebook, match.group("cell_id")
+        frame = frame.f_back
+    return os.getenv("OLIST_EXPORT_NOTEBOOK"), None
+
+
+class QueryLog:
+    """Append-only JSONL log of profiled queries."""
+
+    def __init__(self, path, explain=False):
+        self.path = path
+        self.explain = explain
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, default=str)
+        with self._lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+
+_query_log = None
+_query_log_lock = threading.Lock()
+
+
+def query_log():
+    """Process-wide QueryLog from OLIST_QUERY_LOG, or None when disabled."""
+    global _query_log
+    path = os.getenv("OLIST_QUERY_LOG")
+    if not path:
+        return None
+    with _query_log_lock:
+        if _query_log is None or _query_log.path != path:
+            explain = os.getenv("OLIST_QUERY_EXPLAIN", "0") in ("1", "true", "yes")
+            _query_log = QueryLog(path, explain=explain)
+        return _query_log
+
+
+class ProfiledConnection:
+    """
+    Connection wrapper that times every read query and logs it to a QueryLog.
+
+    Read queries are materialized as Arrow to count rows and bytes, so
+    execute() returns a CachedResult for them (the same accessors as a DuckDB
+    result). Everything else is passed through untouched.
+    """
+
+    def __init__(self, connection, log):
+        self._connection = connection
+        self._log = log
+
+    def query(self, sql, params=None, result_format=None):
+        """Run a read query and return a Polars frame (see results.py)."""
+        return fetch(self.execute(sql, params), result_format)
+
+    def execute(self, sql, params=None):
+        if not is_cacheable(sql):
+            return self._connection.execute(sql, params)
+
+        notebook, cell_id = current_cell()
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        result = self._connection.execute(sql, params)
+        if not isinstance(result, CachedResult):
+            result = CachedResult(result.fetch_arrow_table())
+        wall_seconds = time.perf_counter() - started
+
+        table = result.arrow()
+        explain = None
+        if self._log.explain and not result.from_cache:
+            explain = self._explain_analyze(sql, params)
+
+        self._log.write(
+            {
+                "query_id": uuid.uuid4().hex,
+                "session_id": _SESSION_ID,
+                "notebook": notebook,
+                "cell_id": cell_id,
+                "query_hash": query_hash(sql),
+                "sql_text": normalize_sql(sql)[:MAX_SQL_LENGTH],
+                "param_count": len(params or []),
+                "started_at": started_at.isoformat(),
+                "wall_seconds": round(wall_seconds, 6),
+                "rows_returned": table.num_rows,
+                "bytes_returned": table.nbytes,
+                "cache_hit": result.from_cache,
+                "explain_analyze": explain,
+            }
+        )
+        return result
+
+    def _explain_analyze(self, sql, params):
+        try:
+            rows = self._connection.execute(f"EXPLAIN ANALYZE {sql}", params).fetchall()
+        except Exception as e:
+            return f"EXPLAIN ANALYZE failed: {e}"
+        return "\n".join(str(row[-1]) for row in rows)
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
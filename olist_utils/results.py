@@ -0,0 +1,54 @@
+"""
+Result formats for notebook queries.
+
+con.execute(...).df() converts every column of a result to pandas, copying
+it. con.query(sql, params) instead returns a Polars DataFrame built straight
+from the Arrow result (zero-copy for numeric and string columns), or the Arrow
+table itself with result_format="arrow". Convert to pandas with to_pandas()
+only where a plotting or pandas-only call needs it, ideally after filtering
+or aggregating down to the rows that are actually drawn.
+
+The default format comes from OLIST_RESULT_FORMAT in .env: polars (default),
+arrow or pandas.
+"""
+
+import os
+
+RESULT_FORMATS = ("polars", "arrow", "pandas")
+
+
+def default_result_format():
+    """Result format used by con.query() when none is given."""
+    result_format = os.getenv("OLIST_RESULT_FORMAT", "polars").lower()
+    if result_format not in RESULT_FORMATS:
+        raise ValueError(
+            f"OLIST_RESULT_FORMAT must be one of {', '.join(RESULT_FORMATS)}, "
+            f"got {result_format!r}"
+        )
+    return result_format
+
+
+def fetch(result, result_format=None):
+    """
+    Materialize a DuckDB result (or CachedResult) in the requested format.
+
+    Both expose fetch_arrow_table(), so every format goes through Arrow once.
+    """
+    result_format = result_format or default_result_format()
+    if result_format == "pandas":
+        return result.df()
+
+    table = result.fetch_arrow_table()
+    if result_format == "arrow":
+        return table
+
+    import polars as pl
+
+    return pl.from_arrow(table)
+
+
+def to_pandas(frame):
+    """Convert a Polars frame or Arrow table to pandas (pandas passes through)."""
+    if hasattr(frame, "to_pandas"):
+        return frame.to_pandas()
+    return frame
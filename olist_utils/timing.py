@@ -0,0 +1,108 @@
+"""
+Per-cell execution timings for headless notebook runs.
+
+marimo compiles every cell with a file name of the form
+.../__marimo__cell_<cell_id>_.py and runs it with exec()/eval(), both of
+which raise the "exec" audit event with the code object. An audit hook
+therefore sees each cell start without profiling every function call: a
+cell's time runs from its first exec until the next cell starts (or the
+process exits), which includes rendering its output.
+
+Enabled by setting OLIST_CELL_TIMINGS to a JSONL path. connect() installs
+the hook, so timings cover the cells after the notebook's connection cell
+(the cells before it only import modules and render markdown). Used by the
+batch exporter (python -m olist_utils.export).
+"""
+
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+_CELL_FILENAME = re.compile(r"__marimo__cell_(?P<cell_id>[^_]+)_")
+
+_installed = False
+_lock = threading.Lock()
+
+
+class CellTimer:
+    """Audit hook that writes one JSONL record per executed marimo cell."""
+
+    def __init__(self, path, notebook=None):
+        self.path = path
+        self.notebook = notebook or os.getenv("OLIST_EXPORT_NOTEBOOK")
+        self._current = None
+        self._started = None
+        self._started_at = None
+        self._position = 0
+
+    def __call__(self, event, args):
+        if event != "exec" or not args:
+            return
+        filename = getattr(args[0], "co_filename", "")
+        match = _CELL_FILENAME.search(filename)
+        if not match:
+            return
+
+        cell_id = match.group("cell_id")
+        # A cell runs exec(body) and then eval(last expression)
+        if cell_id == self._current:
+            return
+        self._finish_current()
+        self._current = cell_id
+        self._started = time.perf_counter()
+        self._started_at = datetime.now(timezone.utc)
+
+    def _finish_current(self):
+        # Written as each cell finishes, so a killed kernel keeps what ran
+        if self._current is None:
+            return
+        self._position += 1
+        record = {
+            "notebook": self.notebook,
+            "cell_id": self._current,
+            "position": self._position,
+            "started_at": self._started_at.isoformat(),
+            "elapsed_seconds": round(time.perf_counter() - self._started, 6),
+        }
+        self._current = None
+        # Runs inside an audit hook: an exception here would fail the cell
+        try:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(
+                f"⚠️  Could not write cell timing to {self.path}: {e}", file=sys.stderr
+            )
+
+    def flush(self):
+        """Record the cell still running (called at exit)."""
+        self._finish_current()
+
+
+def install_cell_timer(path=None):
+    """Install the per-cell timer once per process (no-op without a path)."""
+    global _installed
+    path = path or os.getenv("OLIST_CELL_TIMINGS")
+    if not path:
+        return None
+    with _lock:
+        if _installed:
+            return None
+        timer = CellTimer(path)
+        sys.addaudithook(timer)
+        atexit.register(timer.flush)
+        _installed = True
+    return timer
+
+
+def read_cell_timings(path):
+    """Load the records written by CellTimer (empty list if none)."""
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,37 @@
+"""Tests for the notebook query cache (olist_utils/cache.py)."""
+
+import duckdb
+import pandas as pd
+
+from olist_utils.cache import CachedConnection, QueryCache
+
+AGGREGATE_SQL = """
+    SELECT
+        x % 2 AS bucket,
+        SUM(x) AS int_total,
+        SUM(x::DECIMAL(10, 2)) AS decimal_total,
+        ANY_VALUE(x::DECIMAL(18, 3)) AS decimal_value,
+        COUNT(*) AS row_count
+    FROM range(10) t(x)
+    GROUP BY bucket
+    ORDER BY bucket
+"""
+
+
+def test_cached_df_dtypes_match_duckdb(tmp_path):
+    db_path = tmp_path / "warehouse.duckdb"
+    con = duckdb.connect(str(db_path))
+    try:
+        expected = con.execute(AGGREGATE_SQL).df()
+        cached = CachedConnection(con.cursor(), QueryCache(), db_path)
+
+        first = cached.execute(AGGREGATE_SQL)
+        second = cached.execute(AGGREGATE_SQL)
+        assert not first.from_cache and second.from_cache
+
+        for result in (first, second):
+            frame = result.df()
+            pd.testing.assert_series_equal(frame.dtypes, expected.dtypes)
+            pd.testing.assert_frame_equal(frame, expected)
+    finally:
+        con.close()
@@ -0,0 +1,83 @@
+"""Tests for the dbt critical-path analysis (monitoring/critical_path.py)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(
+    0, str(Path(__file__).resolve().parents[1] / "dbt" / "olist_dw_dbt" / "monitoring")
+)
+
+from critical_path import analyze_run  # noqa: E402
+
+
+def result(unique_id, start, end):
+    """A run_results entry that ran from second `start` to second `end`."""
+    return {
+        "unique_id": unique_id,
+        "status": "success",
+        "thread_id": "Thread-1",
+        "timing": [
+            {
+                "started_at": f"2024-01-01T00:00:{start:02d}Z",
+                "completed_at": f"2024-01-01T00:00:{end:02d}Z",
+            }
+        ],
+    }
+
+
+def model(name, *parents, materialized="table"):
+    """A manifest index entry for a model depending on `parents`."""
+    return {
+        "resource_type": "model",
+        "name": name,
+        "config": {"materialized": materialized},
+        "depends_on": {"nodes": [f"model.olist.{p}" for p in parents]},
+    }
+
+
+def test_dependencies_through_ephemeral_models():
+    # stg_orders -> int_orders_enriched (ephemeral, never executed) -> fct_orders
+    manifest = {
+        "nodes": {
+            "model.olist.stg_orders": model("stg_orders"),
+            "model.olist.stg_customers": model("stg_customers"),
+            "model.olist.int_orders_enriched": model(
+                "int_orders_enriched",
+                "stg_orders",
+                "stg_customers",
+                materialized="ephemeral",
+            ),
+            "model.olist.fct_orders": model("fct_orders", "int_orders_enriched"),
+            "model.olist.mart_orders": model("mart_orders", "fct_orders"),
+        }
+    }
+    run_results = {
+        "metadata": {"invocation_id": "abc"},
+        "args": {"threads": 2},
+        "results": [
+            result("model.olist.stg_orders", 0, 10),
+            result("model.olist.stg_customers", 0, 2),
+            result("model.olist.fct_orders", 10, 15),
+            result("model.olist.mart_orders", 15, 18),
+        ],
+    }
+
+    node_schedule, run = analyze_run(run_results, manifest)
+    rows = {row["unique_id"]: row for row in node_schedule}
+
+    assert run["critical_path_seconds"] == 18
+    assert [
+        unique_id
+        for unique_id, row in sorted(
+            rows.items(), key=lambda item: item[1]["critical_path_position"] or 0
+        )
+        if row["on_critical_path"]
+    ] == [
+        "model.olist.stg_orders",
+        "model.olist.fct_orders",
+        "model.olist.mart_orders",
+    ]
+    assert rows["model.olist.fct_orders"]["slack_seconds"] == 0
+    assert rows["model.olist.stg_customers"]["slack_seconds"] == 8
+    # fct_orders waited for stg_orders, not for a free thread
+    assert rows["model.olist.fct_orders"]["queue_wait_seconds"] == 0